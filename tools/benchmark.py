@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+Generates synthetic repositories and measures every analysis path for regressions between versions.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).parent
+DEFAULT_WORKDIR = Path(os.environ.get("TMPDIR", "/tmp")) / "toolkit-bench"
+SIZES = {"1k": 1000, "10k": 10000, "100k": 100000, "1m": 1000000}
+SHAPES = ("mixed", "wide", "deep")
+MARKER = ".bench-repo.json"
+REGRESSION_THRESHOLD = 0.20
+
+SOURCES = {
+    ".py": 'import os\n\nDATABASE_URL = os.environ.get("DATABASE_URL_{n}")\n\n\n'
+           'def handler_{n}(event):\n    return os.getenv("FEATURE_{n}", "off")\n',
+    ".ts": 'export const port{n} = process.env.PORT_{n} ?? "3000";\n'
+           'export function route{n}(): string {{\n  return process.env.API_KEY_{n} || "";\n}}\n',
+    ".go": 'package pkg\n\nimport "os"\n\nfunc Config{n}() string {{\n'
+           '\treturn os.Getenv("SERVICE_{n}")\n}}\n',
+    ".md": "# Module {n}\n\nNotes about module {n}.\n",
+    ".json": '{{"name": "module-{n}", "version": "1.0.{n}"}}\n',
+    ".yml": "name: job-{n}\nenv:\n  TOKEN: ${{{{ secrets.TOKEN_{n} }}}}\n",
+}
+EXTENSIONS = list(SOURCES)
+
+
+def _layout(count, shape):
+    """Yield relative directories, each receiving an equal share of files."""
+    if shape == "wide":
+        per_dir = 200
+        for index in range(max(1, count // per_dir)):
+            yield f"src/pkg{index}", per_dir
+    elif shape == "deep":
+        per_dir = 10
+        for index in range(max(1, count // per_dir)):
+            chain = "/".join(f"d{(index >> bit) & 3}" for bit in range(0, 20, 2))
+            yield f"src/{chain}/leaf{index}", per_dir
+    else:
+        per_dir = 40
+        for index in range(max(1, count // per_dir)):
+            yield f"packages/p{index % 50}/src/mod{index}", per_dir
+
+
+def generate_repo(path, count, shape):
+    """Create a deterministic synthetic repository of about `count` files."""
+    path = Path(path)
+    marker = path / MARKER
+    if marker.exists():
+        return json.loads(marker.read_text())
+    if path.exists():
+        shutil.rmtree(path)
+    path.mkdir(parents=True)
+    start = time.perf_counter()
+    files = 0
+    for directory, per_dir in _layout(count, shape):
+        target = path / directory
+        target.mkdir(parents=True, exist_ok=True)
+        for index in range(per_dir):
+            extension = EXTENSIONS[(files + index) % len(EXTENSIONS)]
+            (target / f"file{index}{extension}").write_text(
+                SOURCES[extension].format(n=files + index))
+        files += per_dir
+
+    # Manifests, ignored dependency and build trees, and a few large artifacts.
+    (path / "package.json").write_text('{"devDependencies": {"jest": "29"}}\n')
+    (path / "pyproject.toml").write_text('[project]\nname = "bench"\ndependencies = ["fastapi"]\n')
+    (path / ".gitignore").write_text("# Dependencies\nnode_modules/\n\n# Build\n/build/\n*.o\n"
+                                     "\n# Environment\n.env\n\n# Unused\n*.never\n")
+    for index in range(max(1, count // 100)):
+        module = path / "node_modules" / f"dep{index % 20}"
+        module.mkdir(parents=True, exist_ok=True)
+        (module / f"index{index}.js").write_text("module.exports = process.env.DEP;\n")
+    (path / "build").mkdir(exist_ok=True)
+    for index in range(3):
+        (path / f"artifact{index}.bin").write_bytes(b"\0" * (2 * 1024 * 1024))
+    meta = {"files": files, "shape": shape, "seconds": time.perf_counter() - start}
+    marker.write_text(json.dumps(meta))
+    return meta
+
+
+def _synthetic_diff(files):
+    for index in range(files):
+        yield f"diff --git a/src/mod{index % 50}/f{index}.py b/src/mod{index % 50}/f{index}.py\n".encode()
+        yield b"@@ -1,10 +1,12 @@ def handler():\n"
+        for line in range(10):
+            yield b"-    return old_value\n" if line % 3 == 0 else b"+    return compute(value)\n"
+
+
+# case -> function(repo_path, repo_meta) returning the number of items processed.
+def _case_template_render(repo, meta):
+    from template_renderer import load_template, clear_cache, TEMPLATES_DIR
+    clear_cache()
+    renders = 0
+    for path in sorted(TEMPLATES_DIR.glob("*_template.md")):
+        template = load_template(path)
+        values = {key: key.lower() for key in template.placeholders}
+        for _ in range(1000):
+            template.render(values)
+            renders += 1
+    return renders
+
+
+def _case_tree_walk(repo, meta):
+    from project_index import iter_project_files
+    return sum(1 for _ in iter_project_files(repo))
+
+
+def _case_tree_summary(repo, meta):
+    from tree_summary import TreeSummary
+    summary = TreeSummary(repo)
+    summary.render()
+    return summary.entries
+
+
+def _case_index_cold(repo, meta):
+    from project_index import ProjectIndex, CACHE_DIR_NAME
+    shutil.rmtree(Path(repo) / CACHE_DIR_NAME, ignore_errors=True)
+    with ProjectIndex(repo) as index:
+        return index.update().files
+
+
+def _case_index_warm(repo, meta):
+    from project_index import ProjectIndex
+    with ProjectIndex(repo) as index:
+        return index.update().files
+
+
+def _case_env_scan(repo, meta):
+    from env_scanner import collect, scan_project
+    counts = {"files": 0}
+    collect(scan_project(repo, counts=counts))
+    return counts["files"]
+
+
+def _case_gitignore_eval(repo, meta):
+    from gitignore_rules import coverage_report
+    text = (Path(repo) / ".gitignore").read_text()
+    return coverage_report(repo, text)["entries"]
+
+
+def _case_stack_detect(repo, meta):
+    from stack_detect import detect_stack
+    return detect_stack(repo).files_visited
+
+
+def _case_commit_diff(repo, meta):
+    from diff_analyzer import analyze_diff
+    summary = analyze_diff(_synthetic_diff(max(1, meta["files"] // 10)))
+    return summary.added + summary.removed
+
+
+CASES = {
+    "template_render": _case_template_render,
+    "tree_walk": _case_tree_walk,
+    "tree_summary": _case_tree_summary,
+    "index_cold": _case_index_cold,
+    "index_warm": _case_index_warm,
+    "env_scan": _case_env_scan,
+    "gitignore_eval": _case_gitignore_eval,
+    "stack_detect": _case_stack_detect,
+    "commit_diff": _case_commit_diff,
+}
+
+
+def run_case(name, repo):
+    """Run one case in this process and return its measurements."""
+    import resource
+
+    sys.path.insert(0, str(TOOLS_DIR))
+    meta = json.loads((Path(repo) / MARKER).read_text())
+    start = time.perf_counter()
+    items = CASES[name](repo, meta)
+    seconds = time.perf_counter() - start
+    usage = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    peak_mb = usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+    return {"items": items, "seconds": seconds, "peak_rss_mb": round(peak_mb, 1)}
+
+
+def measure(name, repo):
+    """Run a case in a fresh interpreter so peak RSS belongs to that case alone."""
+    completed = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--run-case", name, str(repo)],
+        capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"{name} failed: {completed.stderr.strip()}")
+    return json.loads(completed.stdout)
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Return lines describing per-case changes and the list of regressions."""
+    previous = {(entry["case"], entry["repo"]): entry for entry in baseline["results"]}
+    lines = []
+    regressions = []
+    for entry in results["results"]:
+        old = previous.get((entry["case"], entry["repo"]))
+        if old is None or not old["seconds"]:
+            continue
+        change = entry["seconds"] / old["seconds"] - 1
+        mark = ""
+        if change > threshold:
+            mark = "  ❌ regression"
+            regressions.append(entry)
+        elif change < -threshold:
+            mark = "  ✅ faster"
+        lines.append(f"{entry['repo']:<12} {entry['case']:<16} {old['seconds'] * 1e3:>9.1f}ms → "
+                     f"{entry['seconds'] * 1e3:>9.1f}ms {change:+7.1%}{mark}")
+    return lines, regressions
+
+
+def compare_startup(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Return lines for per-command import times and the commands whose import grew.
+
+    Growth is measured on each command's ratio to the reference import, so a
+    baseline recorded on a faster or slower machine still applies. Older
+    baselines without ratios are shown but not gated: raw milliseconds vary
+    too much between runs.
+    """
+    previous = baseline.get("startup_ms", {})
+    previous_ratios = baseline.get("startup_ratio", {})
+    ratios = results.get("startup_ratio", {})
+    grown = []
+    lines = []
+    for name, cost in results.get("startup_ms", {}).items():
+        old = previous.get(name)
+        before = f"{old:>7.1f}ms → " if old else " " * 12
+        mark = ""
+        if name in ratios and previous_ratios.get(name):
+            change = ratios[name] / previous_ratios[name] - 1
+            if change > threshold:
+                mark = f"  ❌ regression ({change:+.0%})"
+                grown.append(name)
+        lines.append(f"{'import':<12} {name:<16} {before}{cost:>7.1f}ms{mark}")
+    return lines, grown
+
+
+def toolkit_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=TOOLS_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the toolkit on synthetic repositories.")
+    parser.add_argument("--sizes", default="1k",
+                        help=f"comma-separated repository sizes from {', '.join(SIZES)}")
+    parser.add_argument("--shapes", default="mixed",
+                        help=f"comma-separated tree shapes from {', '.join(SHAPES)}")
+    parser.add_argument("--cases", default=",".join(CASES),
+                        help="comma-separated cases to run (default: all)")
+    parser.add_argument("--workdir", default=str(DEFAULT_WORKDIR),
+                        help="where synthetic repositories are generated and reused")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="run each case N times and keep the fastest (reduces noise)")
+    parser.add_argument("--output", default="bench_results.json", help="results file to write")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="compare against a previous results file and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="relative slowdown that counts as a regression")
+    parser.add_argument("--startup-runs", type=int, default=3,
+                        help="runs per command for the dispatcher import-time check (0 skips it)")
+    parser.add_argument("--run-case", nargs=2, metavar=("CASE", "REPO"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_case:
+        print(json.dumps(run_case(*args.run_case)))
+        return 0
+
+    sizes = args.sizes.split(",")
+    shapes = args.shapes.split(",")
+    cases = args.cases.split(",")
+    unknown = ([s for s in sizes if s not in SIZES] + [s for s in shapes if s not in SHAPES]
+               + [c for c in cases if c not in CASES])
+    if unknown:
+        print(f"❌ Error: Unknown size, shape or case: {', '.join(unknown)}")
+        return 1
+
+    print("📊 Toolkit Benchmark")
+    print("=" * 50)
+    results = {
+        "toolkit_revision": toolkit_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": [],
+    }
+    for size in sizes:
+        for shape in shapes:
+            repo_name = f"{size}-{shape}"
+            repo = Path(args.workdir) / repo_name
+            meta = generate_repo(repo, SIZES[size], shape)
+            print(f"\n{repo_name}: {meta['files']} files at {repo}")
+            print(f"  {'case':<16} {'time':>10} {'items/s':>12} {'peak RSS':>10}")
+            for case in cases:
+                measured = min((measure(case, repo) for _ in range(args.repeat)),
+                               key=lambda run: run["seconds"])
+                rate = measured["items"] / measured["seconds"] if measured["seconds"] else 0.0
+                entry = {"repo": repo_name, "case": case, "files": meta["files"],
+                         "items_per_sec": round(rate, 1), **measured}
+                results["results"].append(entry)
+                print(f"  {case:<16} {measured['seconds'] * 1e3:>8.1f}ms {rate:>12,.0f} "
+                      f"{measured['peak_rss_mb']:>8.1f}MB")
+
+    if args.startup_runs:
+        from toolkit import STARTUP_BUDGET_FACTOR, import_times, over_budget
+
+        times = import_times(args.startup_runs)
+        results["startup_ms"] = {name: cost for name, (cost, _ratio) in times.items()}
+        results["startup_ratio"] = {name: ratio for name, (_cost, ratio) in times.items()}
+        over = over_budget(times)
+        print(f"\nCommand import time (best of {args.startup_runs}, budget "
+              f"{STARTUP_BUDGET_FACTOR:g}x the reference import): slowest "
+              f"{max(results['startup_ms'].values()):.1f}ms"
+              + (f", over budget: {', '.join(over)}" if over else ""))
+
+    Path(args.output).write_text(json.dumps(results, indent=2))
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        lines, regressions = compare(results, baseline, args.threshold)
+        print(f"\nComparison with {args.compare} (threshold {args.threshold:.0%}):")
+        startup_lines, grown = compare_startup(results, baseline, args.threshold)
+        for line in lines + startup_lines:
+            print("  " + line)
+        if regressions or grown:
+            print(f"\n❌ {len(regressions) + len(grown)} regression(s)")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
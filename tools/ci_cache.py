@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+CI Dependency Cache Planner
+Detects lockfiles per ecosystem, emits keyed cache steps and estimates hit rates from git history.
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+from collections import namedtuple
+from pathlib import Path
+
+from project_index import iter_project_files
+from tracing import span
+
+DEFAULT_HISTORY = 200
+
+# name -> (lockfile globs, manifest globs used when no lockfile exists,
+#          cached paths, build output paths relative to each workspace)
+Ecosystem = namedtuple("Ecosystem", "label lockfiles manifests paths outputs")
+
+ECOSYSTEMS = {
+    "pip": Ecosystem("pip", ("requirements*.txt", "Pipfile.lock", "constraints*.txt"),
+                     ("pyproject.toml", "setup.py", "setup.cfg"), ("~/.cache/pip",), ()),
+    "poetry": Ecosystem("Poetry", ("poetry.lock",), (), ("~/.cache/pypoetry",), ()),
+    "uv": Ecosystem("uv", ("uv.lock",), (), ("~/.cache/uv",), ()),
+    "npm": Ecosystem("npm", ("package-lock.json", "npm-shrinkwrap.json"), (), ("~/.npm",), ()),
+    "pnpm": Ecosystem("pnpm", ("pnpm-lock.yaml",), (), ("~/.local/share/pnpm/store",), ()),
+    "yarn": Ecosystem("Yarn", ("yarn.lock",), (), ("~/.cache/yarn", ".yarn/cache"), ()),
+    "cargo": Ecosystem("Cargo", ("Cargo.lock",), ("Cargo.toml",),
+                       ("~/.cargo/registry/index", "~/.cargo/registry/cache", "~/.cargo/git/db"),
+                       ("target",)),
+    "go": Ecosystem("Go", ("go.sum",), ("go.mod",), ("~/go/pkg/mod", "~/.cache/go-build"), ()),
+    "gradle": Ecosystem("Gradle", ("gradle.lockfile", "gradle-wrapper.properties"),
+                        ("build.gradle", "build.gradle.kts", "settings.gradle*"),
+                        ("~/.gradle/caches", "~/.gradle/wrapper"), ()),
+    "maven": Ecosystem("Maven", (), ("pom.xml",), ("~/.m2/repository",), ()),
+}
+# Framework build caches worth keeping between runs: marker file glob -> path in its directory.
+BUILD_CACHES = {
+    "next.config.*": ".next/cache",
+    "nx.json": ".nx/cache",
+    "turbo.json": ".turbo",
+}
+
+CachePlan = namedtuple("CachePlan", "ecosystem files keyed_on paths")
+
+
+def detect(root):
+    """Return [CachePlan] for every ecosystem found anywhere in the tree (nested workspaces too)."""
+    found = {name: {"lockfiles": [], "manifests": []} for name in (*ECOSYSTEMS, "build")}
+    outputs = set()
+    with span("cache.detect", "walk"):
+        for relative, _stat in iter_project_files(root, gitignore=True):
+            directory, _, name = relative.rpartition("/")
+            for key, ecosystem in ECOSYSTEMS.items():
+                if any(fnmatch.fnmatchcase(name, pattern) for pattern in ecosystem.lockfiles):
+                    found[key]["lockfiles"].append(relative)
+                elif any(fnmatch.fnmatchcase(name, pattern) for pattern in ecosystem.manifests):
+                    found[key]["manifests"].append(relative)
+                else:
+                    continue
+                outputs.update((key, os.path.join(directory, output) if directory else output)
+                               for output in ecosystem.outputs)
+            for marker, cache in BUILD_CACHES.items():
+                if fnmatch.fnmatchcase(name, marker):
+                    outputs.add(("build", f"{directory}/{cache}" if directory else cache))
+                    found["build"]["manifests"].append(relative)
+
+    if found["poetry"]["lockfiles"] or found["uv"]["lockfiles"]:
+        found["pip"]["manifests"] = []  # pyproject.toml belongs to the locked tool
+    plans = []
+    for key, ecosystem in ECOSYSTEMS.items():
+        files = found[key]["lockfiles"] or found[key]["manifests"]
+        if not files:
+            continue
+        keyed_on = "lockfiles" if found[key]["lockfiles"] else "manifests"
+        paths = list(ecosystem.paths) + sorted(path for owner, path in outputs if owner == key)
+        plans.append(CachePlan(key, sorted(files), keyed_on, paths))
+    build = sorted(path for owner, path in outputs if owner == "build")
+    if build:
+        # Framework caches follow the JavaScript lockfiles, else their config files.
+        js = [path for plan in plans if plan.ecosystem in ("npm", "pnpm", "yarn")
+              for path in plan.files]
+        files = sorted(js) or sorted(found["build"]["manifests"])
+        plans.append(CachePlan("build", files, "lockfiles" if js else "manifests", build))
+    return plans
+
+
+def content_hash(root, files):
+    """Stable short hash of the files' paths and contents (what the cache key tracks)."""
+    import hashlib  # deferred: listing the plan without hashing should start fast
+
+    digest = hashlib.sha256()
+    for relative in sorted(files):
+        digest.update(relative.encode() + b"\0")
+        try:
+            with open(os.path.join(root, relative), "rb") as handle:
+                for chunk in iter(lambda: handle.read(1 << 20), b""):
+                    digest.update(chunk)
+        except OSError:
+            continue
+    return digest.hexdigest()[:16]
+
+
+def repository_prefix(root):
+    """Path of root inside its git repository ("app/" in a monorepo), or "" at the top."""
+    import subprocess  # deferred: only git queries need it, and it is slow to import
+
+    try:
+        return subprocess.run(["git", "rev-parse", "--show-prefix"], cwd=root,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def cache_step(plan, prefix=""):
+    """One actions/cache step with an exact key and a per-ecosystem restore-key fallback.
+
+    Workflows run from the repository root, so project paths get prefix.
+    """
+    label = ECOSYSTEMS[plan.ecosystem].label if plan.ecosystem in ECOSYSTEMS else "build outputs"
+    files = ", ".join(f"'{prefix}{path}'" for path in plan.files)
+    key_prefix = f"${{{{ runner.os }}}}-{plan.ecosystem}-"
+    lines = [f"- name: Cache {label}",
+             "  uses: actions/cache@v4",
+             "  with:",
+             "    path: |"]
+    lines += [f"      {path}" if path.startswith(("~", "/")) else f"      {prefix}{path}"
+              for path in plan.paths]
+    lines += [f"    key: {key_prefix}${{{{ hashFiles({files}) }}}}",
+              "    restore-keys: |",
+              f"      {key_prefix}"]
+    return "\n".join(lines)
+
+
+def history_hit_rates(root, plans, commits=DEFAULT_HISTORY):
+    """Estimate exact-key hit rates from how often each ecosystem's keyed files changed.
+
+    Every commit that changes the keyed files produces one cold run (a
+    restore-key partial hit); all other commits hit the exact key. Uses two
+    git processes however many commits and files are involved; --relative
+    keeps the logged paths project-relative when the project is a
+    subdirectory of its repository. Returns
+    ({ecosystem: (changes, hit_rate)}, commits examined) or (None, 0)
+    outside a git repository.
+    """
+    import subprocess
+
+    try:
+        window = subprocess.run(["git", "rev-list", "-n", str(commits), "HEAD"], cwd=root,
+                                capture_output=True, text=True, check=True).stdout.split()
+    except (OSError, subprocess.CalledProcessError):
+        return None, 0
+    if not window:
+        return None, 0
+    pathspecs = sorted({path for plan in plans for path in plan.files})
+    revision = f"{window[-1]}^..HEAD" if len(window) == commits else "HEAD"
+    try:
+        log = subprocess.run(["git", "log", "--relative", "--format=%x1e%H", "--name-only",
+                              revision, "--", *pathspecs], cwd=root, capture_output=True, text=True,
+                             check=True).stdout
+    except subprocess.CalledProcessError:
+        # The oldest commit of the window is a root commit: it has no parent.
+        log = subprocess.run(["git", "log", "--relative", "--format=%x1e%H", "--name-only",
+                              "HEAD", "--", *pathspecs], cwd=root, capture_output=True, text=True).stdout
+    inside = set(window)
+    changed = {plan.ecosystem: 0 for plan in plans}
+    for record in log.split("\x1e")[1:]:
+        commit, *names = record.split()
+        if commit not in inside:
+            continue
+        names = set(names)
+        for plan in plans:
+            if names & set(plan.files):
+                changed[plan.ecosystem] += 1
+    rates = {ecosystem: (count, 1 - count / len(window)) for ecosystem, count in changed.items()}
+    return rates, len(window)
+
+
+def format_report(root, plans, rates, examined):
+    lines = []
+    for plan in plans:
+        label = ECOSYSTEMS[plan.ecosystem].label if plan.ecosystem in ECOSYSTEMS else "Build outputs"
+        lines.append(f"  {label}: {len(plan.files)} {plan.keyed_on}, "
+                     f"key hash {content_hash(root, plan.files)}")
+        for path in plan.files[:5]:
+            lines.append(f"      {path}")
+        if len(plan.files) > 5:
+            lines.append(f"      ... and {len(plan.files) - 5} more")
+        if plan.keyed_on != "lockfiles":
+            lines.append("      ⚠️  no lockfile: the key follows the manifests and may go stale")
+        if rates:
+            changes, rate = rates[plan.ecosystem]
+            lines.append(f"      Estimated exact-key hit rate {rate:.0%} "
+                         f"({changes} changes in the last {examined} commits; "
+                         "misses still restore the previous cache)")
+    if rates is None:
+        lines.append("\n  Not a git repository: hit rates could not be estimated")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plan dependency cache steps for CI.")
+    parser.add_argument("project", nargs="?", default=".", help="project directory")
+    parser.add_argument("--history", type=int, default=DEFAULT_HISTORY,
+                        help="recent commits used to estimate hit rates")
+    parser.add_argument("--json", action="store_true", help="print plans and estimates as JSON")
+    parser.add_argument("--values", metavar="FILE",
+                        help="write CACHE_STEPS for CI_template.md to FILE as JSON")
+    args = parser.parse_args(argv)
+
+    if not Path(args.project).is_dir():
+        print(f"❌ Error: Project directory not found at {args.project}")
+        return 1
+
+    plans = detect(args.project)
+    prefix = repository_prefix(args.project)
+    steps = "\n".join(cache_step(plan, prefix) for plan in plans)
+    rates, examined = history_hit_rates(args.project, plans, args.history) if plans else (None, 0)
+    if args.values:
+        Path(args.values).write_text(json.dumps({"CACHE_STEPS": steps}, indent=2),
+                                     encoding="utf-8")
+    if args.json:
+        print(json.dumps({"plans": [plan._asdict() for plan in plans],
+                          "hit_rates": rates, "commits": examined}, indent=2))
+        return 0
+
+    print("🗄️  CI Dependency Caches")
+    print("=" * 50)
+    if not plans:
+        print("  No dependency manifests or lockfiles found")
+        return 0
+    print(format_report(args.project, plans, rates, examined))
+    print("\nWorkflow steps (add before installing dependencies):\n")
+    print(steps)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,524 @@
+#!/usr/bin/env python3
+"""
+Command Catalog
+Extracts the project's commands from package.json, Makefiles, pyproject.toml, justfiles, tox, nox and Cargo aliases.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+from project_index import ProjectIndex, cache_dir
+from tracing import span
+
+CACHE_FILE_NAME = "commands.sqlite"
+PARSER_VERSION = "3"
+PARALLEL_THRESHOLD = 64
+BATCH_SIZE = 16
+
+Command = namedtuple("Command", "name run category workspace source description")
+
+# CLAUDE_template.md slot -> category, in template order.
+TEMPLATE_SLOTS = {
+    "INSTALL_CMD": "install",
+    "DEV_CMD": "dev",
+    "TEST_CMD": "test",
+    "TYPECHECK_CMD": "typecheck",
+    "LINT_CMD": "lint",
+    "FORMAT_CMD": "format",
+    "BUILD_CMD": "build",
+}
+
+# Checked in order against the command name, then what it runs, then its description
+# (for scripts, only the programs they run).
+CATEGORY_KEYWORDS = [
+    ("typecheck", ("typecheck", "type-check", "types", "mypy", "pyright", "tsc")),
+    ("format", ("format", "fmt", "prettier", "black")),
+    ("lint", ("lint", "clippy", "flake8", "ruff", "eslint", "pylint")),
+    ("test", ("test", "spec", "pytest", "jest", "vitest", "coverage", "e2e")),
+    ("build", ("build", "compile", "bundle", "dist", "package")),
+    ("dev", ("dev", "start", "serve", "watch")),
+    ("install", ("install", "setup", "bootstrap", "deps", "sync")),
+]
+
+JS_RUNNERS = (("pnpm-lock.yaml", "pnpm"), ("yarn.lock", "yarn"), ("bun.lockb", "bun"),
+              ("package-lock.json", "npm"))
+PYTHON_INSTALLERS = (("poetry.lock", "poetry install"), ("uv.lock", "uv sync"),
+                     ("pdm.lock", "pdm install"))
+# Words that only launch a script's real program: "npx eslint ." runs eslint.
+SCRIPT_LAUNCHERS = frozenset({"npm", "pnpm", "yarn", "bun", "npx", "bunx", "run", "exec", "dlx",
+                              "cross-env", "env", "poetry", "uv", "pdm", "python", "python3"})
+
+
+def categorize(name, run="", description=""):
+    """The TEMPLATE_SLOTS category of a command, or "other".
+
+    Script arguments name paths and subcommands rather than the task, so a
+    script is categorized by its programs only (see _programs):
+
+    >>> categorize("clean", "npm run clean", _programs("rm -rf dist"))
+    'other'
+    >>> categorize("storybook", "npm run storybook", _programs("storybook dev -p 6006"))
+    'other'
+    >>> categorize("check", "npm run check", _programs("cross-env CI=1 npx eslint ."))
+    'lint'
+    """
+    for text in (name.lower(), run.lower(), description.lower()):
+        words = set(re.split(r"[^a-z0-9-]+", text)) | set(re.split(r"[^a-z0-9]+", text))
+        for category, keywords in CATEGORY_KEYWORDS:
+            if any(keyword in words or text.startswith(keyword) for keyword in keywords):
+                return category
+    return "other"
+
+
+def _programs(script):
+    """The programs a shell script runs, without launchers, flags or arguments."""
+    programs = []
+    for part in re.split(r"&&|\|\||[;|]", script):
+        for word in part.split():
+            if word not in SCRIPT_LAUNCHERS and not word.startswith("-") and "=" not in word:
+                programs.append(word)
+                break
+    return " ".join(programs)
+
+
+def _table(data, *keys):
+    """data[key][key]... when every level is a table (dict), else an empty dict."""
+    for key in keys:
+        data = data.get(key) if isinstance(data, dict) else None
+    return data if isinstance(data, dict) else {}
+
+
+def _command(name, run, workspace, source, description="", script=None):
+    """A Command; when script is given, its programs stand in for the description."""
+    hint = description if script is None else _programs(script)
+    return Command(name, run, categorize(name, run, hint), workspace, source,
+                   description.strip())
+
+
+def parse_package_json(path, workspace, source, runner):
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    if not isinstance(data, dict):
+        raise ValueError("top level is not a JSON object")
+    commands = [_command("install", "npm ci" if runner == "npm" else f"{runner} install",
+                         workspace, source, "install dependencies")]
+    scripts = _table(data, "scripts")
+    for name, body in scripts.items():
+        hooked = name[3:] if name.startswith("pre") else name[4:] if name.startswith("post") else None
+        if hooked in scripts:
+            continue  # lifecycle hooks run as part of their main script
+        run = f"{runner} test" if name == "test" else f"{runner} run {name}"
+        commands.append(_command(name, run, workspace, source, str(body), script=str(body)))
+    return commands
+
+
+# Targets of single- and double-colon rules; `:=`, `::=` and `:::=` are assignments.
+MAKE_TARGET = re.compile(r"^([A-Za-z0-9][A-Za-z0-9_./-]*(?:\s+[A-Za-z0-9][A-Za-z0-9_./-]*)*)"
+                         r"\s*:(?!:{0,2}=)[^#\n]*(?:##\s*(.*))?$")
+
+
+def parse_makefile(path, workspace, source, _context):
+    commands = []
+    seen = set()
+    comment = ""
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        for line in handle:
+            if line.startswith("#"):
+                comment = line.lstrip("#").strip()
+                continue
+            match = MAKE_TARGET.match(line) if not line.startswith("\t") else None
+            if match:
+                for target in match.group(1).split():
+                    if "%" in target or "/" in target or "." in target or target in seen:
+                        continue
+                    seen.add(target)
+                    commands.append(_command(target, f"make {target}", workspace, source,
+                                             match.group(2) or comment))
+            comment = ""
+    return commands
+
+
+JUST_RECIPE = re.compile(r"^@?([A-Za-z_][A-Za-z0-9_-]*)(?:\s+[^:]*)?:(?!=)")
+JUST_KEYWORDS = frozenset({"set", "alias", "export", "import", "mod"})
+
+
+def parse_justfile(path, workspace, source, _context):
+    commands = []
+    comment = ""
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        for line in handle:
+            if line.startswith("#"):
+                comment = line.lstrip("#").strip()
+                continue
+            match = JUST_RECIPE.match(line)
+            if match and match.group(1) not in JUST_KEYWORDS:
+                commands.append(_command(match.group(1), f"just {match.group(1)}", workspace,
+                                         source, comment))
+            comment = ""
+    return commands
+
+
+# [tool.X] sections that mean the tool is part of the workflow: (section, name, run, category).
+PYPROJECT_TOOLS = [
+    ("pytest", "pytest", "pytest", "test"),
+    ("ruff", "ruff", "ruff check .", "lint"),
+    ("ruff", "ruff-format", "ruff format .", "format"),
+    ("mypy", "mypy", "mypy .", "typecheck"),
+    ("pyright", "pyright", "pyright", "typecheck"),
+    ("black", "black", "black .", "format"),
+    ("coverage", "coverage", "coverage run -m pytest", "test"),
+]
+
+
+def parse_pyproject(path, workspace, source, installer):
+    import tomllib
+
+    with open(path, "rb") as handle:
+        data = tomllib.load(handle)
+    tool = _table(data, "tool")
+    commands = [_command("install", installer, workspace, source, "install the project")]
+    scripts = dict(_table(data, "project", "scripts"))
+    scripts.update(_table(tool, "poetry", "scripts"))
+    for name, target in scripts.items():
+        commands.append(Command(name, name, "other", workspace, source, f"entry point {target}"))
+    for name, body in _table(tool, "pdm", "scripts").items():
+        if not name.startswith("_"):
+            commands.append(_command(name, f"pdm run {name}", workspace, source, _describe(body),
+                                     _script(body)))
+    for name, body in _table(tool, "poe", "tasks").items():
+        commands.append(_command(name, f"poe {name}", workspace, source, _describe(body),
+                                 _script(body)))
+    for name, body in _table(tool, "taskipy", "tasks").items():
+        commands.append(_command(name, f"task {name}", workspace, source, _describe(body),
+                                 _script(body)))
+    for env, config in _table(tool, "hatch", "envs").items():
+        prefix = "" if env == "default" else f"{env}:"
+        for name, body in _table(config, "scripts").items():
+            commands.append(_command(name, f"hatch run {prefix}{name}", workspace, source,
+                                     _describe(body), _script(body)))
+    configured = {command.run for command in commands}
+    for section, name, run, category in PYPROJECT_TOOLS:
+        if section in tool and run not in configured:
+            commands.append(Command(name, run, category, workspace, source,
+                                    f"configured in [tool.{section}]"))
+    return commands
+
+
+def _describe(body):
+    if isinstance(body, dict) and body.get("help"):
+        return str(body["help"])
+    return _script(body)
+
+
+def _script(body):
+    """The command a pyproject task runs, as one shell-like string."""
+    if isinstance(body, dict):
+        body = body.get("cmd") or body.get("shell") or body.get("call") or ""
+    if isinstance(body, list):
+        body = " && ".join(str(part) for part in body)
+    return str(body)
+
+
+def parse_tox_ini(path, workspace, source, _context):
+    import configparser
+
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    try:
+        parser.read(path, encoding="utf-8")
+    except configparser.Error as error:  # not a ValueError, so _parse_batch would miss it
+        raise ValueError(str(error).splitlines()[0]) from error
+    names = []
+    if parser.has_option("tox", "envlist"):
+        for part in re.split(r"[,\s]+", parser.get("tox", "envlist")):
+            if part and "{" not in part:
+                names.append(part)
+    names.extend(section.split(":", 1)[1] for section in parser.sections()
+                 if section.startswith("testenv:"))
+    commands = []
+    for name in dict.fromkeys(names):
+        description = parser.get(f"testenv:{name}", "description", fallback="")
+        command = _command(name, f"tox -e {name}", workspace, source, description)
+        if command.category == "other":
+            command = command._replace(category="test")  # plain envs such as py311 run the tests
+        commands.append(command)
+    return commands
+
+
+def parse_noxfile(path, workspace, source, _context):
+    import ast
+
+    with open(path, encoding="utf-8") as handle:
+        tree = ast.parse(handle.read(), filename=path)
+    commands = []
+    for node in tree.body:
+        if not isinstance(node, ast.FunctionDef):
+            continue
+        for decorator in node.decorator_list:
+            call = decorator.func if isinstance(decorator, ast.Call) else decorator
+            target = call.attr if isinstance(call, ast.Attribute) else getattr(call, "id", "")
+            if target != "session":
+                continue
+            name = node.name
+            if isinstance(decorator, ast.Call):
+                for keyword in decorator.keywords:
+                    if keyword.arg == "name" and isinstance(keyword.value, ast.Constant):
+                        name = keyword.value.value
+            docstring = (ast.get_docstring(node) or "").split("\n")[0]
+            commands.append(_command(name, f"nox -s {name}", workspace, source, docstring))
+            break
+    return commands
+
+
+def parse_cargo_config(path, workspace, source, _context):
+    import tomllib
+
+    with open(path, "rb") as handle:
+        aliases = _table(tomllib.load(handle), "alias")
+    commands = []
+    for name, body in aliases.items():
+        script = " ".join(map(str, body)) if isinstance(body, list) else str(body)
+        commands.append(_command(name, f"cargo {name}", workspace, source, script, script))
+    return commands
+
+
+def parse_cargo_toml(path, workspace, source, _context):
+    import tomllib
+
+    with open(path, "rb") as handle:
+        data = tomllib.load(handle)
+    flag = " --workspace" if "workspace" in data else ""
+    return [_command("build", f"cargo build{flag}", workspace, source),
+            _command("test", f"cargo test{flag}", workspace, source),
+            _command("clippy", f"cargo clippy{flag}", workspace, source),
+            _command("fmt", "cargo fmt --all", workspace, source)]
+
+
+# file name -> parser(path, workspace, relative manifest, context)
+PARSERS = {
+    "package.json": parse_package_json,
+    "Makefile": parse_makefile,
+    "makefile": parse_makefile,
+    "GNUmakefile": parse_makefile,
+    "pyproject.toml": parse_pyproject,
+    "justfile": parse_justfile,
+    "Justfile": parse_justfile,
+    ".justfile": parse_justfile,
+    "tox.ini": parse_tox_ini,
+    "noxfile.py": parse_noxfile,
+    "config.toml": parse_cargo_config,
+    "config": parse_cargo_config,
+    "Cargo.toml": parse_cargo_toml,
+}
+
+
+def _parser_for(relative):
+    directory, _, name = relative.rpartition("/")
+    if name in ("config", "config.toml"):
+        # Only Cargo's own configuration has aliases.
+        return parse_cargo_config if directory.rpartition("/")[2] == ".cargo" else None
+    return PARSERS.get(name)
+
+
+def _workspace(relative):
+    directory = relative.rpartition("/")[0]
+    if directory.rpartition("/")[2] == ".cargo":
+        directory = directory.rpartition("/")[0]
+    return directory
+
+
+def _context(relative, present):
+    """What a manifest's commands depend on besides its own content: the lockfiles beside it."""
+    name = relative.rpartition("/")[2]
+    directory = relative.rpartition("/")[0]
+    prefix = f"{directory}/" if directory else ""
+    if name == "package.json":
+        # Workspace packages share the lockfile of the monorepo root.
+        while True:
+            for lockfile, runner in JS_RUNNERS:
+                if f"{prefix}{lockfile}" in present:
+                    return runner
+            if not directory:
+                return "npm"
+            directory = directory.rpartition("/")[0]
+            prefix = f"{directory}/" if directory else ""
+    if name == "pyproject.toml":
+        for lockfile, installer in PYTHON_INSTALLERS:
+            if f"{prefix}{lockfile}" in present:
+                return installer
+        return "pip install -e ."
+    return ""
+
+
+def _parse_batch(root, batch):
+    results = []
+    with span("commands.parse_batch", "scan", manifests=len(batch)):
+        for relative, key, context in batch:
+            try:
+                commands = _parser_for(relative)(os.path.join(root, relative),
+                                                 _workspace(relative), relative, context)
+            except (OSError, ValueError, SyntaxError, UnicodeDecodeError, AttributeError,
+                    TypeError) as error:  # unreadable, or not shaped like this kind of manifest
+                print(f"⚠️  Skipping {relative}: {error}", file=sys.stderr)
+                commands = []
+            results.append((relative, key, commands))
+    return results
+
+
+class CommandCatalog:
+    """Commands per manifest in <project>/.toolkit/commands.sqlite, keyed by manifest hash.
+
+    A manifest is parsed again only when its content hash, the lockfiles that
+    pick its runner, or the parser version change.
+    """
+
+    def __init__(self, root):
+        import sqlite3
+
+        self.root = Path(root).resolve()
+        self.conn = sqlite3.connect(cache_dir(self.root) / CACHE_FILE_NAME, timeout=30)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS manifests (
+                path TEXT PRIMARY KEY, key TEXT NOT NULL, commands TEXT NOT NULL)""")
+        self.parsed = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def update(self, workers=None):
+        """Bring the cache up to date with the project and return every Command."""
+        with ProjectIndex(self.root) as index:
+            index.update()
+            rows = [(path, file_hash) for path, _size, file_hash, _language, _kind
+                    in index.files()]
+        present = {path for path, _hash in rows}
+        manifests = {}
+        for path, file_hash in rows:
+            if _parser_for(path) is not None:
+                context = _context(path, present)
+                manifests[path] = (f"{PARSER_VERSION}:{file_hash}:{context}", context)
+        cached = {path: (key, commands) for path, key, commands
+                  in self.conn.execute("SELECT path, key, commands FROM manifests")}
+        pending = [(path, key, context) for path, (key, context) in manifests.items()
+                   if cached.get(path, (None,))[0] != key]
+        self.parsed = len(pending)
+
+        catalog = {path: [Command(*fields) for fields in json.loads(cached[path][1])]
+                   for path in manifests if path in cached and cached[path][0] == manifests[path][0]}
+        with self.conn:
+            for relative, key, commands in _parse_all(str(self.root), pending, workers):
+                catalog[relative] = commands
+                self.conn.execute("INSERT OR REPLACE INTO manifests VALUES (?, ?, ?)",
+                                  (relative, key, json.dumps(commands)))
+            self.conn.executemany("DELETE FROM manifests WHERE path = ?",
+                                  ((path,) for path in cached if path not in manifests))
+        return [command for path in sorted(catalog, key=lambda path: (path.count("/"), path))
+                for command in catalog[path]]
+
+
+def _parse_all(root, pending, workers):
+    """Yield parse results for pending manifests, in a process pool for large workspace sets."""
+    workers = workers or os.cpu_count() or 1
+    batches = [pending[index:index + BATCH_SIZE] for index in range(0, len(pending), BATCH_SIZE)]
+    if workers == 1 or len(pending) < PARALLEL_THRESHOLD:
+        for batch in batches:
+            yield from _parse_batch(root, batch)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for results in pool.map(_parse_batch, [root] * len(batches), batches):
+            yield from results
+
+
+def build_catalog(root=".", workers=None):
+    """Return [Command] for the whole project, root workspace first."""
+    with CommandCatalog(root) as catalog:
+        return catalog.update(workers)
+
+
+def template_values(commands):
+    """CLAUDE_template.md command slots, preferring the shallowest workspace for each."""
+    values = {}
+    for slot, category in TEMPLATE_SLOTS.items():
+        matches = [command for command in commands if command.category == category]
+        if not matches:
+            values[slot] = "# None detected"
+            continue
+        depth = matches[0].workspace.count("/") + bool(matches[0].workspace)
+        chosen = [command for command in matches
+                  if command.workspace.count("/") + bool(command.workspace) == depth]
+        values[slot] = "\n".join(dict.fromkeys(_in_workspace(command) for command in chosen[:3]))
+    return values
+
+
+def _in_workspace(command):
+    return f"cd {command.workspace} && {command.run}" if command.workspace else command.run
+
+
+def format_catalog(commands, limit=60):
+    lines = []
+    workspace = None
+    for command in commands[:limit]:
+        if command.workspace != workspace:
+            workspace = command.workspace
+            lines.append(f"  {workspace or '.'}/")
+        detail = f"  # {command.description[:50]}" if command.description else ""
+        lines.append(f"    {command.category:<9} {command.run:<34} "
+                     f"[{command.source.rpartition('/')[2]}]{detail}")
+    if len(commands) > limit:
+        lines.append(f"  ... and {len(commands) - limit} more")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the commands a project defines.")
+    parser.add_argument("project", nargs="?", default=".", help="project directory")
+    parser.add_argument("--category", choices=sorted({category for category, _ in
+                                                      CATEGORY_KEYWORDS} | {"other"}),
+                        help="only commands of this category")
+    parser.add_argument("--workers", type=int, help="parser processes (default: CPU count)")
+    parser.add_argument("--json", action="store_true", help="print the catalog as JSON")
+    parser.add_argument("--values", metavar="FILE",
+                        help="write CLAUDE_template.md command values for template_renderer.py")
+    args = parser.parse_args(argv)
+
+    if not Path(args.project).is_dir():
+        print(f"❌ Error: Project directory not found at {args.project}")
+        return 1
+
+    with CommandCatalog(args.project) as catalog:
+        commands = catalog.update(args.workers)
+        parsed = catalog.parsed
+    if args.values:
+        Path(args.values).write_text(json.dumps(template_values(commands), indent=2),
+                                     encoding="utf-8")
+        print(f"✅ Wrote command values to {args.values}", file=sys.stderr)
+    if args.category:
+        commands = [command for command in commands if command.category == args.category]
+    if args.json:
+        print(json.dumps([command._asdict() for command in commands], indent=2))
+        return 0
+
+    print("🧰 Command Catalog")
+    print("=" * 50)
+    workspaces = len({command.workspace for command in commands})
+    print(f"  {len(commands)} commands in {workspaces} workspaces "
+          f"({parsed} manifests parsed, the rest from cache)")
+    print(format_catalog(commands))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
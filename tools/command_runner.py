@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Concurrent Command Runner
+Runs independent external commands on asyncio with a concurrency limit, timeouts and a per-run cache.
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import Counter, namedtuple
+from pathlib import Path
+
+from tracing import span
+
+DEFAULT_LIMIT = 8
+DEFAULT_TIMEOUT = 10.0
+READ_CHUNK = 1 << 16
+
+# returncode is None when the command timed out; 127 when it could not be started.
+CommandResult = namedtuple("CommandResult", "argv returncode stdout stderr seconds timed_out cached")
+
+# (marker file at the project root, label, version command). Only markers present are queried.
+TOOLCHAINS = [
+    ("package.json", "Node.js", ["node", "--version"]),
+    ("package.json", "npm", ["npm", "--version"]),
+    ("pnpm-lock.yaml", "pnpm", ["pnpm", "--version"]),
+    ("yarn.lock", "Yarn", ["yarn", "--version"]),
+    ("pyproject.toml", "Python", ["python3", "--version"]),
+    ("requirements.txt", "Python", ["python3", "--version"]),
+    ("setup.py", "Python", ["python3", "--version"]),
+    ("poetry.lock", "Poetry", ["poetry", "--version"]),
+    ("uv.lock", "uv", ["uv", "--version"]),
+    ("Cargo.toml", "Rust", ["rustc", "--version"]),
+    ("go.mod", "Go", ["go", "version"]),
+    ("Gemfile", "Ruby", ["ruby", "--version"]),
+    ("pom.xml", "Maven", ["mvn", "--version"]),
+]
+
+README_GIT_COMMANDS = {
+    "remote": ["git", "remote", "get-url", "origin"],
+    "tag": ["git", "describe", "--tags", "--abbrev=0"],
+    "last_commit": ["git", "log", "-1", "--format=%cs"],
+    "commits": ["git", "rev-list", "--count", "HEAD"],
+    "contributors": ["git", "shortlog", "-sn", "--no-merges", "HEAD"],
+}
+COMMIT_GIT_COMMANDS = {
+    "branch": ["git", "rev-parse", "--abbrev-ref", "HEAD"],
+    "status": ["git", "status", "--porcelain=v1", "--untracked-files=normal"],
+    "subjects": ["git", "log", "-n", "20", "--format=%s"],
+    "upstream": ["git", "rev-list", "--left-right", "--count", "@{upstream}...HEAD"],
+}
+
+
+async def _pump(stream, chunks, on_line):
+    """Read a pipe to the end, passing complete lines to on_line as they arrive."""
+    carry = b""
+    while True:
+        chunk = await stream.read(READ_CHUNK)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if on_line is not None:
+            *lines, carry = (carry + chunk).split(b"\n")
+            for line in lines:
+                on_line(line.decode("utf-8", "replace"))
+    if on_line is not None and carry:
+        on_line(carry.decode("utf-8", "replace"))
+
+
+class CommandRunner:
+    """Launches commands concurrently, at most `limit` at a time.
+
+    Results are cached per (argv, cwd) for the life of the runner, so tools
+    that ask for the same git or package metadata twice in one run spawn it
+    once. Identical commands in flight at the same time are shared too.
+    Timed-out results are not cached.
+    """
+
+    def __init__(self, cwd=".", limit=DEFAULT_LIMIT, timeout=DEFAULT_TIMEOUT):
+        self.cwd = os.fspath(cwd)
+        self.limit = limit
+        self.timeout = timeout
+        self.spawns = 0
+        self.timed_out = []
+        self._results = {}
+        self._in_flight = {}
+        self._semaphore = None
+        self._loop = None
+
+    async def run(self, argv, cwd=None, timeout=None, on_line=None):
+        """Run one command and return its CommandResult (on_line streams stdout lines)."""
+        import asyncio  # deferred: importing it costs more than the dispatcher's startup budget
+
+        cwd = os.path.realpath(cwd or self.cwd)
+        key = (tuple(argv), cwd)
+        cached = self._results.get(key)
+        if cached is not None:
+            return cached._replace(cached=True)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._execute(list(argv), cwd, timeout or self.timeout,
+                                                       on_line))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _task: self._in_flight.pop(key, None))
+        result = await task
+        if result.timed_out:
+            if argv not in self.timed_out:
+                self.timed_out.append(list(argv))
+        else:
+            self._results[key] = result
+        return result
+
+    async def _execute(self, argv, cwd, timeout, on_line):
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Semaphores belong to one event loop; each asyncio.run gets its own.
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.limit)
+        async with self._semaphore:
+            start = time.perf_counter()
+            with span(" ".join(argv[:2]), "subprocess", cwd=cwd):
+                self.spawns += 1
+                try:
+                    process = await asyncio.create_subprocess_exec(
+                        *argv, cwd=cwd, stdin=asyncio.subprocess.DEVNULL,
+                        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+                except OSError as error:
+                    return CommandResult(argv, 127, "", str(error),
+                                         time.perf_counter() - start, False, False)
+                stdout, stderr = [], []
+                timed_out = False
+                try:
+                    await asyncio.wait_for(asyncio.gather(
+                        _pump(process.stdout, stdout, on_line),
+                        _pump(process.stderr, stderr, None),
+                        process.wait()), timeout)
+                except asyncio.TimeoutError:
+                    timed_out = True
+                    process.kill()
+                    await process.wait()
+        return CommandResult(argv, None if timed_out else process.returncode,
+                             b"".join(stdout).decode("utf-8", "replace"),
+                             b"".join(stderr).decode("utf-8", "replace"),
+                             time.perf_counter() - start, timed_out, False)
+
+    async def gather(self, commands, timeout=None):
+        """Run {name: argv} concurrently and return {name: CommandResult}."""
+        import asyncio
+
+        names = list(commands)
+        results = await asyncio.gather(*(self.run(commands[name], timeout=timeout)
+                                         for name in names))
+        return dict(zip(names, results))
+
+    def run_all(self, commands, timeout=None):
+        """Blocking form of gather() for synchronous tools."""
+        import asyncio
+
+        return asyncio.run(self.gather(commands, timeout))
+
+    def start_all(self, commands, timeout=None):
+        """Start run_all on a background thread; returns a Future of {name: CommandResult}.
+
+        Lets a tool overlap the commands with work of its own, such as
+        streaming a diff.
+        """
+        from concurrent.futures import Future
+        import threading
+
+        future = Future()
+
+        def target():
+            try:
+                future.set_result(self.run_all(commands, timeout))
+            except BaseException as error:  # handed to whoever calls future.result()
+                future.set_exception(error)
+
+        threading.Thread(target=target, name="command-runner", daemon=True).start()
+        return future
+
+
+def output(result):
+    """Stripped stdout of a successful command, else None."""
+    if result is None or result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def toolchain_commands(root):
+    """{label: version argv} for the toolchains whose marker files exist at root."""
+    commands = {}
+    for marker, label, argv in TOOLCHAINS:
+        if label not in commands and os.path.exists(os.path.join(root, marker)):
+            commands[label] = argv
+    return commands
+
+
+def readme_commands(root):
+    commands = {f"git:{name}": argv for name, argv in README_GIT_COMMANDS.items()}
+    commands.update({f"tool:{label}": argv for label, argv in toolchain_commands(root).items()})
+    if os.path.exists(os.path.join(root, "package.json")):
+        commands["npm:pkg"] = ["npm", "pkg", "get", "name", "version", "scripts", "--json"]
+    return commands
+
+
+def readme_metadata(root=".", runner=None):
+    """Repository, toolchain and package facts for a README, gathered concurrently.
+
+    Returns (facts, stats) where facts maps a label to text and stats is
+    (commands, wall seconds, serial seconds).
+    """
+    runner = runner or CommandRunner(root)
+    start = time.perf_counter()
+    results = runner.run_all(readme_commands(root))
+    wall = time.perf_counter() - start
+    facts = {}
+    remote = output(results["git:remote"])
+    if remote:
+        facts["Repository"] = remote
+    facts["Latest tag"] = output(results["git:tag"]) or "none"
+    commits = output(results["git:commits"])
+    if commits:
+        contributors = len((output(results["git:contributors"]) or "").splitlines())
+        facts["History"] = (f"{commits} commits by {contributors} contributors, "
+                            f"last on {output(results['git:last_commit'])}")
+    versions = []
+    for name, result in results.items():
+        if name.startswith("tool:"):
+            text = output(result)
+            label = name[5:]
+            if not text:
+                versions.append(f"{label} (not installed)")
+                continue
+            version = text.splitlines()[0]
+            # "Python 3.11.7" and "go version go1.22" already name the tool.
+            versions.append(version if version.lower().startswith(label.lower())
+                            else f"{label} {version}")
+    if versions:
+        facts["Toolchain"] = ", ".join(versions)
+    package = output(results.get("npm:pkg"))
+    if package:
+        try:
+            data = json.loads(package)
+            facts["npm package"] = f"{data.get('name', '?')} {data.get('version', '')}".strip()
+            facts["npm scripts"] = ", ".join(data.get("scripts") or {}) or "none"
+        except (ValueError, AttributeError):
+            pass
+    serial = sum(result.seconds for result in results.values())
+    return facts, (len(results), wall, serial)
+
+
+def commit_metadata(results):
+    """Branch, working tree and commit style facts from COMMIT_GIT_COMMANDS results."""
+    facts = {}
+    branch = output(results["branch"])
+    if branch:
+        ahead_behind = output(results["upstream"])
+        facts["Branch"] = branch
+        if ahead_behind:
+            behind, ahead = ahead_behind.split()
+            facts["Branch"] += f" ({ahead} ahead, {behind} behind upstream)"
+    if results["status"].returncode == 0:
+        staged = unstaged = untracked = 0
+        # Not stripped: the first column of a porcelain line may be a space.
+        for line in results["status"].stdout.splitlines():
+            if line.startswith("??"):
+                untracked += 1
+                continue
+            staged += line[:1] not in (" ", "?")
+            unstaged += line[1:2] not in (" ", "?")
+        facts["Working tree"] = f"{staged} staged, {unstaged} unstaged, {untracked} untracked"
+    subjects = (output(results["subjects"]) or "").splitlines()
+    if subjects:
+        conventional = [subject for subject in subjects
+                        if ":" in subject and subject.split(":", 1)[0].rstrip("!").split("(")[0]
+                        in ("feat", "fix", "docs", "style", "refactor", "perf", "test", "build",
+                            "ci", "chore", "revert")]
+        scopes = Counter(subject.split("(", 1)[1].split(")", 1)[0] for subject in conventional
+                         if "(" in subject.split(":", 1)[0])
+        style = f"conventional commits in {len(conventional)} of the last {len(subjects)}"
+        if scopes:
+            style += "; common scopes: " + ", ".join(scope for scope, _n in scopes.most_common(5))
+        facts["Commit style"] = style
+    return facts
+
+
+def format_facts(facts, stats=None):
+    lines = [f"  {label}: {value}" for label, value in facts.items()]
+    if stats:
+        count, wall, serial = stats
+        lines.append(f"  Gathered with {count} commands in {wall * 1e3:.0f}ms "
+                     f"({serial * 1e3:.0f}ms if run one after another)")
+    return "\n".join(lines) or "  Nothing found"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gather project metadata with concurrent commands.")
+    parser.add_argument("project", nargs="?", default=".", help="project directory")
+    parser.add_argument("--commit", action="store_true",
+                        help="gather commit-message metadata instead of README metadata")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT,
+                        help="commands running at the same time")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="seconds before a command is killed")
+    args = parser.parse_args(argv)
+
+    if not Path(args.project).is_dir():
+        print(f"❌ Error: Project directory not found at {args.project}")
+        return 1
+
+    runner = CommandRunner(args.project, args.limit, args.timeout)
+    print("⚡ Concurrent Command Runner")
+    print("=" * 50)
+    if args.commit:
+        start = time.perf_counter()
+        results = runner.run_all(COMMIT_GIT_COMMANDS)
+        stats = (len(results), time.perf_counter() - start,
+                 sum(result.seconds for result in results.values()))
+        print(format_facts(commit_metadata(results), stats))
+    else:
+        print(format_facts(*readme_metadata(args.project, runner)))
+    if runner.timed_out:
+        print(f"  ⚠️  Timed out after {args.timeout:.0f}s: "
+              + ", ".join(" ".join(argv) for argv in runner.timed_out))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
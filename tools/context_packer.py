@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Context Budget Packer
+Ranks project files by relevance to a tool and selects the best set that fits a token budget.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+
+from project_index import ProjectIndex, cache_dir
+
+BYTES_PER_TOKEN = 4
+FILE_HEADER_TOKENS = 12
+# Tiny files still cost attention; density never treats a file as cheaper than this.
+MIN_DENSITY_TOKENS = 200
+MAX_FILE_BYTES = 256 * 1024
+CACHED_RANKING_SIZE = 10000
+# Keyword rankings kept per tool, most recently used first; older ones are deleted.
+MAX_KEYWORD_RANKINGS = 8
+DEFAULT_BUDGET = 50000
+
+ENTRY_POINTS = r"(?:^|/)(?:main|index|app|cli|server|__main__|manage|lib)\.[a-z]+$|(?:^|/)cmd/"
+EXCLUDE = re.compile(r"\.min\.|(?:^|/)(?:generated|__generated__)/|\.lock$|-lock\.|\.map$|"
+                     r"(?:^|/)go\.sum$|\.(?:png|jpe?g|gif|ico|svg|pdf|zip|gz|woff2?|ttf|mp4|so|"
+                     r"dll|exe|bin|pyc|class|jar)$", re.IGNORECASE)
+
+# tool -> (weight per index kind, [(path regex, bonus), ...])
+PROFILES = {
+    "readme": ({"manifest": 10, "doc": 6, "source": 3, "config": 2, "test": 1}, [
+        (ENTRY_POINTS, 8), (r"(?:^|/)examples?/", 5),
+        (r"(?:^|/)(?:README|CHANGELOG)[^/]*$", 4), (r"(?:^|/)docs?/", 2),
+    ]),
+    "claude_md": ({"manifest": 10, "config": 5, "source": 4, "test": 3, "doc": 3}, [
+        (ENTRY_POINTS, 6), (r"(?:^|/)(?:Makefile|justfile|noxfile\.py|tox\.ini)$", 6),
+        (r"(?:^|/)\.(?:eslintrc|prettierrc|editorconfig|flake8|pylintrc)|ruff\.toml$", 6),
+        (r"(?:^|/)CONTRIBUTING[^/]*$", 4), (r"^\.github/workflows/", 4),
+    ]),
+    "feature": ({"source": 6, "test": 4, "manifest": 4, "doc": 1, "config": 1}, [
+        (ENTRY_POINTS, 3),
+    ]),
+    "ci": ({"manifest": 10, "test": 6, "config": 4, "source": 1, "doc": 0}, [
+        (r"^\.github/workflows/|^\.gitlab-ci\.yml$", 10),
+        (r"(?:^|/)(?:Makefile|justfile|noxfile\.py|tox\.ini)$", 8),
+        (r"(?:^|/)Dockerfile[^/]*$|docker-compose", 6),
+        (r"(?:^|/)(?:conftest\.py|pytest\.ini|jest\.config\.[a-z]+|vitest\.config\.[a-z]+)$", 6),
+    ]),
+    "structure": ({"manifest": 8, "config": 3, "doc": 2, "source": 1, "test": 1}, [
+        (ENTRY_POINTS, 4), (r"(?:^|/)__init__\.py$", 2),
+    ]),
+    "contributing": ({"doc": 6, "manifest": 6, "config": 5, "test": 2, "source": 0}, [
+        (r"(?:^|/)(?:CONTRIBUTING|CODE_OF_CONDUCT)[^/]*$", 10),
+        (r"(?:^|/)\.pre-commit-config\.yaml$", 6), (r"^\.github/", 4),
+    ]),
+}
+
+_COMPILED = {}
+
+
+def _profile(tool):
+    if tool not in _COMPILED:
+        kinds, bonuses = PROFILES[tool]
+        _COMPILED[tool] = (kinds, [(re.compile(pattern), bonus) for pattern, bonus in bonuses])
+    return _COMPILED[tool]
+
+
+def estimate_tokens(size):
+    """Approximate token cost of a file from its size, without reading it."""
+    return size // BYTES_PER_TOKEN + FILE_HEADER_TOKENS
+
+
+def rank_files(rows, tool, keywords=()):
+    """Rank (path, size, hash, language, kind) rows for a tool.
+
+    Returns [(path, tokens, score), ...] best first, ordered by relevance per
+    token so that the greedy fill approximates the best set for the budget.
+    """
+    kinds, bonuses = _profile(tool)
+    keywords = [keyword.lower() for keyword in keywords]
+    scored = []
+    for path, size, _hash, _language, kind in rows:
+        if size > MAX_FILE_BYTES or EXCLUDE.search(path):
+            continue
+        score = kinds.get(kind, 0)
+        for regex, bonus in bonuses:
+            if regex.search(path):
+                score += bonus
+        if keywords:
+            lowered = path.lower()
+            score += 10 * sum(keyword in lowered for keyword in keywords)
+        score -= 0.5 * path.count("/")
+        if score <= 0:
+            continue
+        tokens = estimate_tokens(size)
+        scored.append((score / max(tokens, MIN_DENSITY_TOKENS), path, tokens, score))
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [(path, tokens, score) for _density, path, tokens, score in scored]
+
+
+def select(ranked, budget):
+    """Greedily take ranked files that still fit; returns (selection, total_tokens)."""
+    chosen = []
+    total = 0
+    for path, tokens, score in ranked:
+        if total + tokens <= budget:
+            chosen.append((path, tokens, score))
+            total += tokens
+            if budget - total < FILE_HEADER_TOKENS:
+                break
+    return chosen, total
+
+
+def _ranking_fingerprint(tool):
+    """Hash of everything rank_files() reads besides the index, so edited weights miss the cache."""
+    rules = (PROFILES[tool], EXCLUDE.pattern, MAX_FILE_BYTES, MIN_DENSITY_TOKENS,
+             BYTES_PER_TOKEN, FILE_HEADER_TOKENS, CACHED_RANKING_SIZE)
+    return hashlib.sha1(json.dumps(rules, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _prune_rankings(directory, tool):
+    """Delete all but the MAX_KEYWORD_RANKINGS most recently used keyword rankings of tool."""
+    rankings = []
+    for path in directory.glob(f"context-{tool}-*.json"):
+        try:
+            rankings.append((path.stat().st_mtime, path))
+        except OSError:
+            continue
+    rankings.sort(reverse=True)
+    for _mtime, path in rankings[MAX_KEYWORD_RANKINGS:]:
+        path.unlink(missing_ok=True)
+
+
+def ranked_for_project(root, tool, keywords=()):
+    """Return the ranking for a project, reusing the cached one while the index is unchanged.
+
+    The cached ranking is also discarded when the tool's profile changes.
+    """
+    key = tool
+    if keywords:
+        key += "-" + hashlib.sha1(" ".join(sorted(keywords)).encode()).hexdigest()[:10]
+    directory = cache_dir(root)
+    cache_file = directory / f"context-{key}.json"
+    fingerprint = _ranking_fingerprint(tool)
+    with ProjectIndex(root) as index:
+        index.update()
+        generation = index.generation()
+        try:
+            cached = json.loads(cache_file.read_text(encoding="utf-8"))
+            if cached["generation"] == generation and cached["profile"] == fingerprint:
+                cache_file.touch()
+                return [tuple(item) for item in cached["ranked"]]
+        except (OSError, ValueError, KeyError):
+            pass
+        ranked = rank_files(index.files(), tool, keywords)[:CACHED_RANKING_SIZE]
+    cache_file.write_text(json.dumps({"generation": generation, "profile": fingerprint,
+                                      "ranked": ranked}), encoding="utf-8")
+    if keywords:
+        _prune_rankings(directory, tool)
+    return ranked
+
+
+def pack(root, selection):
+    """Concatenate the selected files into one Markdown context document."""
+    parts = []
+    for path, _tokens, _score in selection:
+        try:
+            text = (Path(root) / path).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        parts.append(f"### {path}\n```\n{text.rstrip()}\n```\n")
+    return "\n".join(parts)
+
+
+def format_selection(selection, total, budget):
+    lines = [f"  {tokens:>7} tokens  {path}" for path, tokens, _score in selection]
+    lines.append(f"  {total:>7} of {budget} tokens in {len(selection)} files")
+    return "\n".join(lines)
+
+
+def run_benchmark(count, tool, budget):
+    """Time ranking and selection over a synthetic file list of `count` rows."""
+    kinds = ["source"] * 6 + ["test"] * 2 + ["doc", "config"]
+    extensions = [".py", ".ts", ".go", ".md", ".json"]
+    rows = [(f"pkg{i % 500}/mod{i % 37}/file{i}{extensions[i % 5]}", 200 + (i * 7919) % 40000,
+             "", None, kinds[i % 10]) for i in range(count)]
+    rows[::997] = [(f"pkg{i}/package.json", 900, "", None, "manifest")
+                   for i in range(len(rows[::997]))]
+
+    start = time.perf_counter()
+    ranked = rank_files(rows, tool)
+    rank_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(10):
+        selection, total = select(ranked, budget)
+    select_seconds = (time.perf_counter() - start) / 10
+
+    print(f"📊 Benchmark: {count} files, tool={tool}, budget={budget}")
+    print(f"   Rank (cold, no cache) : {rank_seconds * 1e3:.1f} ms "
+          f"({count / rank_seconds:,.0f} files/s)")
+    print(f"   Select from ranking   : {select_seconds * 1e3:.2f} ms "
+          f"({len(selection)} files, {total} tokens)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Select the project files worth a token budget.")
+    parser.add_argument("project", nargs="?", default=".", help="project directory")
+    parser.add_argument("--tool", choices=sorted(PROFILES), default="readme",
+                        help="relevance profile to rank files for")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET, help="token budget")
+    parser.add_argument("--keywords", nargs="*", default=[],
+                        help="boost files whose path mentions these words")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write the packed file contents to FILE")
+    parser.add_argument("--benchmark", type=int, metavar="N",
+                        help="benchmark ranking and selection on N synthetic files")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        run_benchmark(args.benchmark, args.tool, args.budget)
+        return 0
+    if not Path(args.project).is_dir():
+        print(f"❌ Error: Project directory not found at {args.project}")
+        return 1
+
+    ranked = ranked_for_project(args.project, args.tool, args.keywords)
+    selection, total = select(ranked, args.budget)
+    if args.output:
+        Path(args.output).write_text(pack(args.project, selection), encoding="utf-8")
+    print(f"📦 Context for {args.tool} ({args.budget} token budget)")
+    print("=" * 50)
+    print(format_selection(selection, total, args.budget))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
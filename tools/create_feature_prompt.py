@@ -4,6 +4,7 @@ Feature Prompt Builder
 Provides instructions for Claude AI to generate detailed feature implementation prompts.
 """
 
+import argparse
 from pathlib import Path
 
 FEATURE_PROMPT = """
@@ -35,6 +36,8 @@ Ask the user for:
 
 Make sure to:
 - Reference specific files and patterns from the codebase
+  (`symbol_index.py --define NAME`, `--uses NAME` and `--related KEYWORD...`
+  answer "where is X defined/used" without re-reading the tree)
 - Include detailed technical specifications
 - Provide clear acceptance criteria
 - Define testing requirements
@@ -43,7 +46,16 @@ Make sure to:
 The goal is a prompt that another AI can use to implement the feature correctly.
 """
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Feature Prompt Builder")
+    parser.add_argument("--analyze", metavar="DIR", nargs="?", const=".",
+                        help="include the cached project analysis for DIR (default: cwd)")
+    parser.add_argument("--context", metavar="TOKENS", type=int,
+                        help="list the most relevant files that fit in TOKENS")
+    parser.add_argument("--symbols", metavar="KEYWORD", nargs="+",
+                        help="list the files and definitions most related to the keywords")
+    args = parser.parse_args(argv)
+
     template_path = Path(__file__).parent.parent / "templates" / "FEATURE_PROMPT_template.md"
     
     if not template_path.exists():
@@ -55,6 +67,21 @@ def main():
     print("\nTo generate a feature implementation prompt, provide this to Claude:\n")
     print(FEATURE_PROMPT)
     print("\nTemplate location:", template_path)
+    if args.analyze:
+        from project_index import analyze_project
+        print("\nProject analysis (incremental index):")
+        print(analyze_project(args.analyze))
+    if args.context:
+        from context_packer import format_selection, ranked_for_project, select
+        selection, total = select(ranked_for_project(args.analyze or ".", "feature"), args.context)
+        print(f"\nRead these files first ({args.context} token budget):")
+        print(format_selection(selection, total, args.context))
+    if args.symbols:
+        from symbol_index import SymbolIndex, format_related
+        with SymbolIndex(args.analyze or ".") as index:
+            index.update()
+            print(f"\nFiles related to {' '.join(args.symbols)} (symbol index):")
+            print(format_related(index.related(args.symbols)))
     print("\n" + "=" * 50)
     print("This tool helps create detailed prompts for feature implementation.")
     
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Analysis Daemon Client
+Asks a running toolkit_daemon.py for warm results; callers fall back to local work when it is absent.
+"""
+
+import json
+import os
+
+ENV_VAR = "TOOLKIT_DAEMON"  # "0" makes every tool work locally
+SOCKET_NAME = "daemon.sock"
+TIMEOUT_SECONDS = 30.0
+# sockaddr_un.sun_path holds 108 bytes on Linux, including the terminating NUL.
+MAX_SOCKET_PATH = 100
+
+# Set inside the daemon itself so that its own calls never loop back to it.
+DISABLED = False
+
+
+def socket_path(root):
+    """Socket of the daemon serving root: in its .toolkit/, or in the temp dir for deep paths."""
+    root = os.path.realpath(root)
+    path = os.path.join(root, ".toolkit", SOCKET_NAME)
+    if len(os.fsencode(path)) <= MAX_SOCKET_PATH:
+        return path
+    import hashlib
+    import tempfile
+
+    digest = hashlib.sha1(os.fsencode(root)).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f"toolkit-{os.getuid()}-{digest}.sock")
+
+
+def request(root, op, **args):
+    """Return the daemon's result for op, or None when no daemon serves root.
+
+    Any failure (no socket, a stale socket, a timeout or an error reply)
+    also returns None, so callers simply compute the result themselves.
+    """
+    if DISABLED or os.environ.get(ENV_VAR) == "0":
+        return None
+    path = socket_path(root)
+    if not os.path.exists(path):
+        return None
+    import socket  # deferred: most calls stop at the missing socket above
+
+    payload = json.dumps({"op": op, "root": os.path.realpath(root), "args": args}).encode()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(TIMEOUT_SECONDS)
+            client.connect(path)
+            client.sendall(payload + b"\n")
+            chunks = []
+            while not chunks or not chunks[-1].endswith(b"\n"):
+                chunk = client.recv(1 << 16)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        reply = json.loads(b"".join(chunks))
+    except (OSError, ValueError):
+        return None
+    return reply.get("result") if reply.get("ok") else None
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Staged Diff Analyzer
+Streams `git diff --staged` and classifies each file into commit types and scopes with bounded memory.
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+from tracing import span
+
+# Longest diff line kept in memory; the remainder of longer lines is drained.
+LINE_LIMIT = 4096
+# Files with more changed lines than this are summarized, not sampled.
+OVERSIZED_LINES = 2000
+SAMPLE_LINES = 5
+MAX_FILE_DETAILS = 200
+MAX_CONTEXTS = 3
+
+HUNK_HEADER = re.compile(rb"^@@ -\d+(?:,\d+)? \+\d+(?:,\d+)? @@ ?(.*)")
+DIFF_HEADER = re.compile(rb"^diff --git a/(.*) b/(.*)$")
+FIX_WORDS = re.compile(r"\b(?:fix(?:es|ed)?|bug|error|except|raise|throw|catch|null|None|"
+                       r"invalid|retry|timeout|guard)\b", re.IGNORECASE)
+
+DOC_SUFFIXES = (".md", ".rst", ".txt", ".adoc")
+LOCKFILES = frozenset({
+    "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock", "Pipfile.lock",
+    "Cargo.lock", "go.sum", "composer.lock", "Gemfile.lock", "uv.lock",
+})
+CHORE_NAMES = frozenset({
+    ".gitignore", ".gitattributes", ".editorconfig", "package.json", "pyproject.toml",
+    "setup.cfg", "setup.py", "requirements.txt", "Cargo.toml", "go.mod", "Makefile",
+    "Dockerfile", "tox.ini", ".pre-commit-config.yaml",
+}) | LOCKFILES
+VENDOR_DIRS = ("vendor/", "node_modules/", "third_party/", "external/")
+SCOPE_ROOTS = frozenset({"src", "lib", "app", "pkg", "internal", "cmd", "packages",
+                         "apps", "services", "tests", "test"})
+
+
+class FileChange:
+    """Counters and a few samples for one file of the diff."""
+
+    __slots__ = ("path", "old_path", "status", "added", "removed", "hunks", "binary",
+                 "oversized", "contexts", "samples", "fix_signals")
+
+    def __init__(self, path, old_path):
+        self.path = path
+        self.old_path = old_path
+        self.status = "M" if path == old_path else "R"
+        self.added = self.removed = self.hunks = self.fix_signals = 0
+        self.binary = self.oversized = False
+        self.contexts = []
+        self.samples = []
+
+    @property
+    def changed(self):
+        return self.added + self.removed
+
+    @property
+    def kind(self):
+        return classify_file(self)
+
+    @property
+    def scope(self):
+        return scope_for(self.path)
+
+
+def classify_file(change):
+    """Return the conventional-commit type a single file change suggests."""
+    path = change.path
+    lowered = path.lower()
+    name = path.rsplit("/", 1)[-1]
+    if name in CHORE_NAMES or lowered.startswith(VENDOR_DIRS) or lowered.startswith(".github/"):
+        return "chore"
+    if (lowered.startswith(("docs/", "doc/")) or lowered.endswith(DOC_SUFFIXES)
+            or name.upper().startswith(("README", "LICENSE", "CHANGELOG", "CONTRIBUTING"))):
+        return "docs"
+    if (lowered.startswith(("tests/", "test/")) or "/tests/" in lowered or "/test/" in lowered
+            or "__tests__" in lowered or name.startswith("test_")
+            or re.search(r"[._-](?:test|spec)\.[a-z]+$", name)):
+        return "test"
+    if change.status == "A":
+        return "feat"
+    if change.status in ("D", "R"):
+        return "refactor"
+    if change.fix_signals and change.added <= max(20, change.removed * 3):
+        return "fix"
+    if change.removed > change.added * 2:
+        return "refactor"
+    return "feat"
+
+
+def scope_for(path):
+    """Derive a scope from the first meaningful directory (or the file stem at the root)."""
+    parts = path.split("/")
+    for index, part in enumerate(parts[:-1]):
+        if part not in SCOPE_ROOTS:
+            return part
+        # packages/<name>/... and similar: the package is the scope.
+        if part in ("packages", "apps", "services") and index + 2 < len(parts):
+            return parts[index + 1]
+    return Path(parts[-1]).stem.lstrip(".") or None
+
+
+def read_lines(stream, limit=LINE_LIMIT):
+    """Yield lines of at most `limit` bytes; the tail of longer lines is discarded."""
+    while True:
+        line = stream.readline(limit)
+        if not line:
+            return
+        if not line.endswith(b"\n"):
+            while True:
+                rest = stream.readline(limit)
+                if not rest or rest.endswith(b"\n"):
+                    break
+        yield line
+
+
+def iter_file_changes(lines):
+    """Parse a unified diff line stream, yielding each FileChange once it is complete.
+
+    File headers ("--- a/...", "+++ b/...", mode lines) only occur between
+    "diff --git" and the first "@@"; inside a hunk every "+" or "-" line is
+    content, even one that reads like a header (an SQL "-- comment").
+    """
+    current = None
+    in_hunk = False
+    for line in lines:
+        if line.startswith(b"diff --git "):
+            if current is not None:
+                yield current
+            match = DIFF_HEADER.match(line.rstrip(b"\n"))
+            if match:
+                old, new = (part.decode("utf-8", "replace") for part in match.groups())
+            else:
+                old = new = line[11:].decode("utf-8", "replace").strip()
+            current = FileChange(new, old)
+            in_hunk = False
+        elif current is None:
+            continue
+        elif line.startswith(b"@@"):
+            in_hunk = True
+            current.hunks += 1
+            match = HUNK_HEADER.match(line)
+            context = match.group(1).strip() if match else b""
+            if context and len(current.contexts) < MAX_CONTEXTS:
+                current.contexts.append(context.decode("utf-8", "replace")[:80])
+        elif in_hunk:
+            if line.startswith(b"+"):
+                current.added += 1
+                _sample(current, line)
+            elif line.startswith(b"-"):
+                current.removed += 1
+                _sample(current, line)
+        elif line.startswith(b"new file mode"):
+            current.status = "A"
+        elif line.startswith(b"deleted file mode"):
+            current.status = "D"
+        elif line.startswith(b"Binary files") or line.startswith(b"GIT binary patch"):
+            current.binary = True
+    if current is not None:
+        yield current
+
+
+def _sample(change, line):
+    if change.oversized:
+        return
+    if change.changed > OVERSIZED_LINES:
+        change.oversized = True
+        change.samples = []
+        return
+    text = line[1:].decode("utf-8", "replace").strip()
+    if FIX_WORDS.search(text):
+        change.fix_signals += 1
+    if text and len(change.samples) < SAMPLE_LINES:
+        change.samples.append(line[:1].decode() + " " + text[:120])
+
+
+def stream_staged_diff(repo="."):
+    """Yield the raw lines of `git diff --staged` straight from the git pipe.
+
+    stderr goes to a temporary file, so git never blocks on a full stderr
+    pipe while stdout is being read.
+    """
+    import tempfile
+
+    with tempfile.TemporaryFile() as errors:
+        process = subprocess.Popen(
+            ["git", "diff", "--staged", "--no-color", "--no-ext-diff", "-M"],
+            cwd=repo, stdout=subprocess.PIPE, stderr=errors,
+        )
+        try:
+            with span("git.diff", "git", repo=str(repo)):
+                yield from read_lines(process.stdout)
+        finally:
+            process.stdout.close()
+            if process.wait() != 0:
+                errors.seek(0)
+                raise RuntimeError(errors.read().decode("utf-8", "replace").strip()
+                                   or "git diff failed")
+
+
+class DiffSummary:
+    """Aggregates FileChanges; only the first MAX_FILE_DETAILS keep per-file detail."""
+
+    def __init__(self, max_details=MAX_FILE_DETAILS):
+        self.max_details = max_details
+        self.files = 0
+        self.added = self.removed = 0
+        self.binary = self.oversized = 0
+        self.type_weight = Counter()
+        self.scope_weight = Counter()
+        self.status_paths = {"A": [], "M": [], "D": [], "R": []}
+        self.status_counts = Counter()
+        self.details = []
+
+    def feed(self, change):
+        kind = change.kind
+        weight = max(change.changed, 1)
+        self.files += 1
+        self.added += change.added
+        self.removed += change.removed
+        self.binary += change.binary
+        self.oversized += change.oversized
+        self.type_weight[kind] += weight
+        scope = change.scope
+        if scope:
+            self.scope_weight[scope] += weight
+        self.status_counts[change.status] += 1
+        paths = self.status_paths[change.status]
+        label = (f"{change.old_path} → {change.path}" if change.status == "R" else change.path)
+        if len(paths) < self.max_details:
+            paths.append(label)
+        if len(self.details) < self.max_details:
+            self.details.append({
+                "path": change.path, "status": change.status, "type": kind, "scope": scope,
+                "added": change.added, "removed": change.removed, "hunks": change.hunks,
+                "binary": change.binary, "oversized": change.oversized,
+                "contexts": change.contexts, "samples": change.samples,
+            })
+
+    def commit_type(self):
+        # Source changes decide the type even when docs or tests come along;
+        # a commit of only docs, tests or chores takes that type.
+        source = {kind: weight for kind, weight in self.type_weight.items()
+                  if kind in ("feat", "fix", "refactor")}
+        if source:
+            return max(source, key=source.get)
+        if self.type_weight:
+            return self.type_weight.most_common(1)[0][0]
+        return "chore"
+
+    def scope(self):
+        if not self.scope_weight:
+            return None
+        scope, weight = self.scope_weight.most_common(1)[0]
+        return scope if weight >= 0.6 * sum(self.scope_weight.values()) else None
+
+    def _items(self, status):
+        paths = self.status_paths[status]
+        lines = [f"- {path}" for path in paths]
+        hidden = self.status_counts[status] - len(paths)
+        if hidden > 0:
+            lines.append(f"- ... and {hidden} more files")
+        return "\n".join(lines) or "- None"
+
+    def template_values(self):
+        """Values for COMMIT_template.md; prose fields are left for the author."""
+        return {
+            "COMMIT_TYPE": self.commit_type(),
+            "SCOPE": self.scope() or "",
+            "ADDED_ITEMS": self._items("A"),
+            "MODIFIED_ITEMS": "\n".join(filter(None, [self._items("M"), self._items("R")
+                                                      if self.status_counts["R"] else ""])),
+            "REMOVED_ITEMS": self._items("D"),
+        }
+
+    def to_dict(self):
+        return {
+            "files": self.files,
+            "added_lines": self.added,
+            "removed_lines": self.removed,
+            "binary_files": self.binary,
+            "oversized_files": self.oversized,
+            "type_weights": dict(self.type_weight),
+            "scope_weights": dict(self.scope_weight.most_common(10)),
+            "suggested_type": self.commit_type(),
+            "suggested_scope": self.scope(),
+            "template_values": self.template_values(),
+            "files_detail": self.details,
+        }
+
+
+def analyze_diff(lines):
+    summary = DiffSummary()
+    for change in iter_file_changes(lines):
+        summary.feed(change)
+    return summary
+
+
+def analyze_staged(repo="."):
+    """Stream and summarize the staged changes of repo."""
+    return analyze_diff(stream_staged_diff(repo))
+
+
+def format_summary(summary, limit=15):
+    scope = summary.scope()
+    header = summary.commit_type() + (f"({scope})" if scope else "")
+    lines = [f"Suggested type/scope: {header}",
+             f"Files: {summary.files} (+{summary.added} -{summary.removed}), "
+             f"{summary.binary} binary, {summary.oversized} oversized"]
+    for detail in summary.details[:limit]:
+        flags = "".join([" [binary]" if detail["binary"] else "",
+                         " [oversized]" if detail["oversized"] else ""])
+        lines.append(f"  {detail['status']} {detail['type']:<8} {detail['path']} "
+                     f"(+{detail['added']} -{detail['removed']}){flags}")
+        for context in detail["contexts"]:
+            lines.append(f"      in {context}")
+    if summary.files > limit:
+        lines.append(f"  ... and {summary.files - limit} more files")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize staged changes for a commit message.")
+    parser.add_argument("repo", nargs="?", default=".", help="git repository")
+    parser.add_argument("--input", metavar="FILE",
+                        help="read a diff from FILE ('-' for stdin) instead of git")
+    parser.add_argument("--json", action="store_true", help="print the full analysis as JSON")
+    parser.add_argument("--values", metavar="FILE",
+                        help="write COMMIT_template.md values for template_renderer.py")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.input == "-":
+            summary = analyze_diff(read_lines(sys.stdin.buffer))
+        elif args.input:
+            with open(args.input, "rb") as handle:
+                summary = analyze_diff(read_lines(handle))
+        else:
+            summary = analyze_staged(args.repo)
+    except (OSError, RuntimeError) as error:
+        print(f"❌ Error: {error}")
+        return 1
+
+    if args.values:
+        Path(args.values).write_text(json.dumps(summary.template_values(), indent=2),
+                                     encoding="utf-8")
+    if args.json:
+        print(json.dumps(summary.to_dict(), indent=2))
+    else:
+        print("📝 Staged Changes")
+        print("=" * 50)
+        print(format_summary(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
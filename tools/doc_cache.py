@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Generated Document Cache
+Stores generated README/CLAUDE/CONTRIBUTING documents keyed by per-section input fingerprints, with LRU eviction.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import time
+import zlib
+from collections import namedtuple
+from pathlib import Path
+
+from project_index import ProjectIndex, cache_dir
+from tracing import span
+
+CACHE_FILE_NAME = "docs.sqlite"
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+# tool -> (module holding the prompt, prompt name, template, output file)
+DOCUMENTS = {
+    "readme": ("setup_readme", "README_PROMPT", "README", "README.md"),
+    "claude_md": ("setup_claude_md", "CLAUDE_PROMPT", "CLAUDE", "CLAUDE.md"),
+    "contributing": ("setup_contributing", "CONTRIBUTING_PROMPT", "CONTRIBUTING",
+                     "CONTRIBUTING.md"),
+}
+
+# Section heading pattern -> input groups its content is derived from. Every
+# matching rule contributes; headings matching none depend on the docs only.
+SECTION_INPUTS = [
+    (r"install|prerequisite|dependenc|getting started|setup", {"manifest", "config"}),
+    (r"test", {"test", "manifest"}),
+    (r"structure|layout|architecture", {"structure", "manifest"}),
+    (r"usage|api|feature|overview|example|demo|pattern|error|performance|standard|style",
+     {"source", "doc", "manifest"}),
+    (r"config|environment", {"config", "env"}),
+    (r"develop|workflow|build|deploy|release|troubleshoot", {"manifest", "config", "ci"}),
+    (r"licen", {"license"}),
+    (r"contribut|pull request|commit|conduct|review|recognition", {"contributing", "ci"}),
+    (r"security|monitor|logging", {"config", "manifest"}),
+]
+TITLE_INPUTS = {"manifest", "doc"}
+DEFAULT_INPUTS = {"doc"}
+TITLE = "(title)"
+
+Lookup = namedtuple("Lookup", "status document changed sections")
+
+
+def split_sections(text):
+    """Return [(heading, body)] split at level-2 headings outside code fences.
+
+    The text before the first heading is returned under TITLE.
+    """
+    sections = [(TITLE, [])]
+    fenced = False
+    for line in text.splitlines(keepends=True):
+        if line.lstrip().startswith("```"):
+            fenced = not fenced
+        if not fenced and line.startswith("## "):
+            sections.append((normalize_heading(line[3:]), []))
+        sections[-1][1].append(line)
+    return [(heading, "".join(lines)) for heading, lines in sections]
+
+
+def normalize_heading(heading):
+    """'## 🔧 Installation' and '## Installation' name the same section."""
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s&/-]", "", heading)).strip().lower()
+
+
+def _digest(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8") if isinstance(part, str) else part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def input_groups(path, kind):
+    """The input groups a project file belongs to: its index kind plus special roles."""
+    groups = {kind}
+    name = path.rpartition("/")[2]
+    upper = name.upper()
+    if upper.startswith(("LICENSE", "COPYING")):
+        groups.add("license")
+    if name.startswith(".env"):
+        groups.add("env")
+    if upper.startswith(("CONTRIBUTING", "CODE_OF_CONDUCT")) or path.startswith(".github/"):
+        groups.add("contributing")
+    if path.startswith((".github/workflows/", ".gitlab-ci")) or name in ("Makefile", "justfile"):
+        groups.add("ci")
+    return groups
+
+
+def group_hashes(root, exclude=()):
+    """{group: hash} over the project index. "structure" hashes the directory set only."""
+    digests = {}
+    directories = set()
+    with ProjectIndex(root) as index:
+        index.update()
+        for path, _size, file_hash, _language, kind in index.files():
+            if path in exclude:
+                continue
+            directories.add(path.rpartition("/")[0])
+            for group in input_groups(path, kind):
+                digests.setdefault(group, hashlib.sha256()).update(
+                    f"{path}\0{file_hash}\n".encode("utf-8"))
+    hashes = {group: digest.hexdigest() for group, digest in digests.items()}
+    hashes["structure"] = _digest("\n".join(sorted(directories)))
+    return hashes
+
+
+def section_inputs(heading):
+    if heading == TITLE:
+        return TITLE_INPUTS
+    groups = set()
+    for pattern, inputs in SECTION_INPUTS:
+        if re.search(pattern, heading):
+            groups |= inputs
+    return groups or DEFAULT_INPUTS
+
+
+def fingerprints(root, tool):
+    """{section heading: fingerprint} for the document tool would generate for root.
+
+    A section's fingerprint covers its template text, the prompt, and the
+    hashes of the input groups it is derived from.
+    """
+    import importlib
+    from template_renderer import resolve_template
+
+    module, prompt_name, template, output = DOCUMENTS[tool]
+    prompt = getattr(importlib.import_module(module), prompt_name)
+    template_text = resolve_template(template).read_text(encoding="utf-8")
+    with span("docs.fingerprint", "index", tool=tool):
+        groups = group_hashes(root, exclude={output})
+    prompt_hash = _digest(prompt)
+    sections = {}
+    for heading, body in split_sections(template_text):
+        inputs = sorted(section_inputs(heading))
+        sections[heading] = _digest(body, prompt_hash,
+                                    *(f"{group}={groups.get(group, '')}" for group in inputs))
+    return sections
+
+
+def document_key(tool, sections):
+    return _digest(tool, *(f"{heading}={value}" for heading, value in sorted(sections.items())))
+
+
+class DocumentCache:
+    """Content-addressed documents in <project>/.toolkit/docs.sqlite, evicted least recently used."""
+
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES):
+        import sqlite3
+
+        self.max_bytes = max_bytes
+        self.path = cache_dir(root) / CACHE_FILE_NAME
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY, size INTEGER NOT NULL, content BLOB NOT NULL);
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY, tool TEXT NOT NULL, digest TEXT NOT NULL,
+                sections TEXT NOT NULL, last_used REAL NOT NULL);
+            CREATE INDEX IF NOT EXISTS entries_tool ON entries (tool, last_used);
+        """)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def _document(self, digest):
+        row = self.conn.execute("SELECT content FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+    def lookup(self, tool, sections):
+        """Return a Lookup: "hit" with the document, "partial" with the sections to redo, or "miss"."""
+        key = document_key(tool, sections)
+        row = self.conn.execute("SELECT digest FROM entries WHERE key = ?", (key,)).fetchone()
+        if row:
+            with self.conn:
+                self.conn.execute("UPDATE entries SET last_used = ? WHERE key = ?",
+                                  (time.time(), key))
+            return Lookup("hit", self._document(row[0]), [], sections)
+        row = self.conn.execute(
+            "SELECT digest, sections FROM entries WHERE tool = ? ORDER BY last_used DESC LIMIT 1",
+            (tool,)).fetchone()
+        if row is None:
+            return Lookup("miss", None, list(sections), sections)
+        previous = json.loads(row[1])
+        changed = [heading for heading, value in sections.items() if previous.get(heading) != value]
+        return Lookup("partial", self._document(row[0]), changed, sections)
+
+    def store(self, tool, sections, document):
+        """Record document as the output for these section fingerprints, then evict."""
+        data = document.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        with self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO blobs VALUES (?, ?, ?)",
+                              (digest, len(data), zlib.compress(data)))
+            self.conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                              (document_key(tool, sections), tool, digest,
+                               json.dumps(sections), time.time()))
+            self._evict()
+        return digest
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(LENGTH(content)), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, digest in self.conn.execute(
+                "SELECT key, digest FROM entries ORDER BY last_used").fetchall():
+            self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            if not self.conn.execute("SELECT 1 FROM entries WHERE digest = ?", (digest,)).fetchone():
+                row = self.conn.execute("SELECT LENGTH(content) FROM blobs WHERE digest = ?",
+                                        (digest,)).fetchone()
+                self.conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+                total -= row[0] if row else 0
+            if total <= self.max_bytes:
+                return
+
+    def stats(self):
+        entries = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        blobs, stored, size = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(content)), 0), COALESCE(SUM(size), 0) "
+            "FROM blobs").fetchone()
+        return {"entries": entries, "documents": blobs, "stored_bytes": stored,
+                "document_bytes": size, "max_bytes": self.max_bytes}
+
+
+def report_cached(tool, root="."):
+    """Print what the cache offers for tool in root; True when there is nothing to generate.
+
+    On a hit the cached document is written to the project if it is missing
+    there. On a partial match the sections whose inputs changed are listed;
+    the stale cached copy is never written.
+    """
+    output = Path(root) / DOCUMENTS[tool][3]
+    start = time.perf_counter()
+    sections = fingerprints(root, tool)
+    with DocumentCache(root) as cache:
+        found = cache.lookup(tool, sections)
+    elapsed = (time.perf_counter() - start) * 1e3
+    if found.status == "hit":
+        if not output.exists():
+            output.write_text(found.document, encoding="utf-8")
+            print(f"♻️  Inputs unchanged: restored {output} from the cache in {elapsed:.0f}ms")
+        elif output.read_text(encoding="utf-8") == found.document:
+            print(f"♻️  Inputs unchanged: {output} is current (checked in {elapsed:.0f}ms)")
+        else:
+            print(f"♻️  Inputs unchanged, but {output} was edited after it was cached; kept as is")
+        return True
+    if found.status == "partial":
+        if not output.exists():
+            # The cached copy is stale in the changed sections; never pass it off as current.
+            print(f"♻️  {output} is missing and the cached copy is out of date; generate it in "
+                  f"full. {len(found.changed)} of {len(sections)} sections have changed inputs:")
+        else:
+            print(f"♻️  Only {len(found.changed)} of {len(sections)} sections have changed inputs. "
+                  f"Keep the rest of {output} and regenerate only:")
+        for heading in found.changed:
+            print(f"   - {heading}")
+    else:
+        print(f"♻️  No cached {output.name} yet; after generating it run: "
+              f"doc_cache.py store {tool} {root}")
+    print()
+    return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cache generated documents by their inputs.")
+    parser.add_argument("action", choices=("check", "store", "stats"))
+    parser.add_argument("tool", nargs="?", default="readme",
+                        help=f"one of {', '.join(DOCUMENTS)} (not needed for stats)")
+    parser.add_argument("project", nargs="?", default=".", help="project directory")
+    parser.add_argument("--file", help="document to store (default: the tool's output file)")
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES,
+                        help="evict least recently used documents above this size")
+    args = parser.parse_args(argv)
+    if args.action == "stats" and args.tool not in DOCUMENTS:
+        args.project = args.tool
+    elif args.tool not in DOCUMENTS:
+        parser.error(f"unknown tool {args.tool!r}; choose from {', '.join(DOCUMENTS)}")
+
+    if not Path(args.project).is_dir():
+        print(f"❌ Error: Project directory not found at {args.project}")
+        return 1
+
+    print("♻️  Generated Document Cache")
+    print("=" * 50)
+    if args.action == "stats":
+        with DocumentCache(args.project, args.max_bytes) as cache:
+            stats = cache.stats()
+        print(f"  {stats['entries']} entries, {stats['documents']} documents, "
+              f"{stats['stored_bytes'] / 1024:.1f} KiB stored "
+              f"({stats['document_bytes'] / 1024:.1f} KiB uncompressed, "
+              f"limit {stats['max_bytes'] / 1024:.0f} KiB)")
+        return 0
+    sections = fingerprints(args.project, args.tool)
+    if args.action == "store":
+        path = Path(args.file or Path(args.project) / DOCUMENTS[args.tool][3])
+        if not path.is_file():
+            print(f"❌ Error: Document not found at {path}")
+            return 1
+        with DocumentCache(args.project, args.max_bytes) as cache:
+            digest = cache.store(args.tool, sections, path.read_text(encoding="utf-8"))
+        print(f"✅ Stored {path} ({digest[:12]}) for {len(sections)} section fingerprints")
+        return 0
+    with DocumentCache(args.project, args.max_bytes) as cache:
+        found = cache.lookup(args.tool, sections)
+    print(f"  Status: {found.status}")
+    if found.status == "partial":
+        print(f"  Changed sections: {', '.join(found.changed) or 'none'}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
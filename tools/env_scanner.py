@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Environment Variable Scanner
+Finds environment variable references across a project with a process pool of per-language scanners.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+from project_index import iter_project_files
+from tracing import span
+
+EnvReference = namedtuple("EnvReference", "name path line language")
+
+NAME = r"([A-Za-z_][A-Za-z0-9_]*)"
+UPPER_NAME = r"([A-Z_][A-Z0-9_]*)"
+
+# language -> (substrings that must appear for the file to be worth a regex pass, patterns)
+LANGUAGE_PATTERNS = {
+    "python": (("environ", "getenv"), [
+        re.compile(r"\benviron(?:\.get|\.setdefault|\.pop)?\s*[\[(]\s*[rbu]?['\"]" + NAME + "['\"]"),
+        re.compile(r"\bgetenv(?:b)?\s*\(\s*[rbu]?['\"]" + NAME + "['\"]"),
+    ]),
+    "javascript": (("env",), [
+        re.compile(r"\b(?:process|import\.meta|Deno)\.env\.(?!get\b)" + NAME),
+        re.compile(r"\b(?:process|import\.meta)\.env\[\s*['\"`]" + NAME + "['\"`]\s*\]"),
+        re.compile(r"\bDeno\.env\.get\(\s*['\"`]" + NAME + "['\"`]"),
+    ]),
+    "go": (("Getenv", "LookupEnv"), [
+        re.compile(r"\bos\.(?:Getenv|LookupEnv)\(\s*\"" + NAME + "\""),
+    ]),
+    "rust": (("env",), [
+        re.compile(r"\benv::var(?:_os)?\(\s*\"" + NAME + "\""),
+        re.compile(r"\b(?:option_)?env!\(\s*\"" + NAME + "\""),
+    ]),
+    "shell": (("$",), [
+        re.compile(r"\$\{?" + UPPER_NAME),
+    ]),
+    "dockerfile": (("ENV", "ARG", "$"), [
+        re.compile(r"^\s*(?:ENV|ARG)\s+" + UPPER_NAME, re.MULTILINE),
+        re.compile(r"\$\{?" + UPPER_NAME),
+    ]),
+    "yaml": (("$", "env", "secrets", "="), [
+        re.compile(r"\$\{\{?\s*(?:env\.|secrets\.)?" + UPPER_NAME),
+        re.compile(r"\$\{" + UPPER_NAME),
+        re.compile(r"\b(?:env|secrets)\.([A-Z_][A-Z0-9_]*)"),
+        re.compile(r"^\s*-\s*" + UPPER_NAME + "=", re.MULTILINE),
+    ]),
+    "dotenv": (("=",), [
+        re.compile(r"^\s*(?:export\s+)?" + UPPER_NAME + r"\s*=", re.MULTILINE),
+    ]),
+}
+
+EXTENSION_LANGUAGES = {
+    ".py": "python",
+    ".js": "javascript", ".mjs": "javascript", ".cjs": "javascript", ".jsx": "javascript",
+    ".ts": "javascript", ".tsx": "javascript", ".vue": "javascript", ".svelte": "javascript",
+    ".go": "go", ".rs": "rust",
+    ".sh": "shell", ".bash": "shell", ".zsh": "shell",
+    ".yml": "yaml", ".yaml": "yaml",
+    ".dockerfile": "dockerfile",
+}
+
+# Variables every shell or CI runner provides; they are not project configuration.
+BUILTIN_VARIABLES = frozenset({
+    "HOME", "PATH", "PWD", "OLDPWD", "USER", "SHELL", "IFS", "RANDOM", "LANG", "TERM",
+    "HOSTNAME", "UID", "EUID", "PPID", "SECONDS", "LINENO", "BASH_SOURCE", "OPTARG",
+    "OPTIND", "TMPDIR", "PS1", "GITHUB_TOKEN", "GITHUB_WORKSPACE", "GITHUB_SHA",
+    "GITHUB_REF", "RUNNER_OS", "CI",
+})
+
+# ENV_template.md slot -> name fragments, checked in order; APP_CONFIG_VARS is the fallback.
+CATEGORY_KEYWORDS = [
+    ("DATABASE_VARS", ("DATABASE", "DB_", "_DB", "POSTGRES", "MYSQL", "REDIS", "MONGO", "SQL")),
+    ("AUTH_VARS", ("SECRET", "JWT", "AUTH", "PASSWORD", "SESSION", "OAUTH", "COOKIE")),
+    ("API_KEYS", ("API_KEY", "APIKEY", "_KEY", "TOKEN", "API_URL", "ENDPOINT")),
+    ("FEATURE_FLAGS", ("FEATURE", "ENABLE", "DISABLE", "FLAG")),
+    ("LOGGING_VARS", ("LOG", "SENTRY", "DATADOG", "OTEL", "METRIC", "TRACE")),
+    ("DEBUG_VARS", ("DEBUG", "DEV_", "VERBOSE")),
+    ("PERFORMANCE_VARS", ("CACHE", "WORKER", "POOL", "TIMEOUT", "CONCURRENCY", "THREAD")),
+    ("INTEGRATION_VARS", ("STRIPE", "SLACK", "GITHUB", "AWS", "GCP", "AZURE", "SMTP",
+                          "MAIL", "TWILIO", "S3_")),
+    ("DEPLOYMENT_VARS", ("HOST", "PORT", "REGION", "DEPLOY", "NODE_ENV", "ENVIRONMENT",
+                         "STAGE")),
+]
+
+MAX_FILE_BYTES = 2 * 1024 * 1024
+BATCH_SIZE = 256
+MAX_LOCATIONS = 20
+
+
+def language_for(relative_path):
+    name = relative_path.rsplit("/", 1)[-1]
+    if name == "Dockerfile" or name.startswith("Dockerfile."):
+        return "dockerfile"
+    if name.startswith(".env"):
+        return "dotenv"
+    return EXTENSION_LANGUAGES.get(os.path.splitext(name)[1].lower())
+
+
+def scan_file(path, relative, language):
+    """Return the EnvReferences in one file (empty for binary or oversized files)."""
+    try:
+        if os.path.getsize(path) > MAX_FILE_BYTES:
+            return []
+        with open(path, "rb") as handle:
+            data = handle.read()
+    except OSError:
+        return []
+    if b"\0" in data[:8192]:
+        return []
+    text = data.decode("utf-8", errors="replace")
+    required, patterns = LANGUAGE_PATTERNS[language]
+    if not any(fragment in text for fragment in required):
+        return []
+
+    found = []
+    for pattern in patterns:
+        for match in pattern.finditer(text):
+            name = match.group(1)
+            if name in BUILTIN_VARIABLES:
+                continue
+            found.append((match.start(), name))
+    found.sort()
+
+    references = []
+    line = 1
+    position = 0
+    seen = set()
+    for offset, name in found:
+        line += text.count("\n", position, offset)
+        position = offset
+        if (name, line) not in seen:
+            seen.add((name, line))
+            references.append(EnvReference(name, relative, line, language))
+    return references
+
+
+def _scan_batch(root, batch):
+    references = []
+    with span("env.scan_batch", "scan", files=len(batch)):
+        for relative, language in batch:
+            references.extend(scan_file(os.path.join(root, relative), relative, language))
+    return references
+
+
+def _batches(root, counts):
+    batch = []
+    for relative, _stat in iter_project_files(root, gitignore=True):
+        language = language_for(relative)
+        if language is None:
+            continue
+        if counts is not None:
+            counts["files"] = counts.get("files", 0) + 1
+        batch.append((relative, language))
+        if len(batch) == BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def scan_project(root=".", workers=None, counts=None):
+    """Stream EnvReferences for a project, scanning file batches in a process pool.
+
+    At most a few batches per worker are in flight, so memory stays bounded
+    by the batch size rather than by the size of the repository. If counts
+    is a dict, counts["files"] is the number of files handed to the scanner.
+    """
+    root = os.fspath(root)
+    workers = workers or os.cpu_count() or 1
+    batches = _batches(root, counts)
+    if workers == 1:
+        for batch in batches:
+            yield from _scan_batch(root, batch)
+        return
+
+    # Imported here: the process pool machinery costs more to import than a
+    # single-worker scan of a small project takes.
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+        exhausted = False
+        while True:
+            while not exhausted and len(in_flight) < workers * 2:
+                batch = next(batches, None)
+                if batch is None:
+                    exhausted = True
+                else:
+                    in_flight.add(pool.submit(_scan_batch, root, batch))
+            if not in_flight:
+                break
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def collect(references, max_locations=MAX_LOCATIONS):
+    """Deduplicate a reference stream into {name: {"count", "locations"}}.
+
+    Only the first max_locations locations are kept per variable.
+    """
+    variables = {}
+    for reference in references:
+        entry = variables.get(reference.name)
+        if entry is None:
+            entry = variables[reference.name] = {"count": 0, "locations": []}
+        entry["count"] += 1
+        if len(entry["locations"]) < max_locations:
+            entry["locations"].append(f"{reference.path}:{reference.line}")
+    return dict(sorted(variables.items()))
+
+
+def categorize(name):
+    """Return the ENV_template.md slot a variable name belongs to."""
+    upper = name.upper()
+    for slot, keywords in CATEGORY_KEYWORDS:
+        if any(keyword in upper for keyword in keywords):
+            return slot
+    return "APP_CONFIG_VARS"
+
+
+def template_values(variables):
+    """Build ENV_template.md placeholder values from collected variables."""
+    slots = {slot: [] for slot, _keywords in CATEGORY_KEYWORDS}
+    slots["APP_CONFIG_VARS"] = []
+    for name, entry in variables.items():
+        where = ", ".join(entry["locations"][:3])
+        if entry["count"] > 3:
+            where += f" (+{entry['count'] - 3} more)"
+        slots[categorize(name)].append(f"# Used in {where}\n{name}=")
+    return {slot: "\n".join(lines) if lines else "# None detected"
+            for slot, lines in slots.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scan a project for environment variables.")
+    parser.add_argument("project", nargs="?", default=".", help="project directory")
+    parser.add_argument("--workers", type=int, default=None, help="scanner processes")
+    parser.add_argument("--json", action="store_true", help="print variables as JSON")
+    parser.add_argument("--values", metavar="FILE",
+                        help="write ENV_template.md values for template_renderer.py")
+    args = parser.parse_args(argv)
+
+    if not Path(args.project).is_dir():
+        print(f"❌ Error: Project directory not found at {args.project}")
+        return 1
+
+    variables = collect(scan_project(args.project, args.workers))
+    if args.values:
+        Path(args.values).write_text(json.dumps(template_values(variables), indent=2),
+                                     encoding="utf-8")
+        print(f"✅ Wrote template values for {len(variables)} variables to {args.values}",
+              file=sys.stderr)
+    if args.json:
+        print(json.dumps(variables, indent=2))
+        return 0
+
+    print(f"🔐 Found {len(variables)} environment variables")
+    print("=" * 50)
+    for name, entry in variables.items():
+        print(f"{name:<32} {entry['count']:>4}x  {', '.join(entry['locations'][:3])}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -4,6 +4,7 @@ Git Commit Message Generator
 Provides instructions for Claude AI to generate semantic commit messages.
 """
 
+import argparse
 from pathlib import Path
 
 COMMIT_PROMPT = """
@@ -42,7 +43,12 @@ Make sure to:
 Output the complete commit message ready for use with git commit -m
 """
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Git Commit Message Generator")
+    parser.add_argument("--analyze", metavar="REPO", nargs="?", const=".",
+                        help="append a streamed summary of the staged changes in REPO")
+    args = parser.parse_args(argv)
+
     template_path = Path(__file__).parent.parent / "templates" / "COMMIT_template.md"
     
     if not template_path.exists():
@@ -54,6 +60,19 @@ def main():
     print("\nTo generate a commit message, provide this prompt to Claude:\n")
     print(COMMIT_PROMPT)
     print("\nTemplate location:", template_path)
+    if args.analyze:
+        from command_runner import COMMIT_GIT_COMMANDS, CommandRunner, commit_metadata, format_facts
+        from diff_analyzer import analyze_staged, format_summary
+        # Branch, status and history queries run while the diff streams.
+        metadata = CommandRunner(args.analyze).start_all(COMMIT_GIT_COMMANDS)
+        print("\nStaged changes (streamed from git diff --staged):")
+        try:
+            print(format_summary(analyze_staged(args.analyze)))
+        except (OSError, RuntimeError) as error:
+            print(f"❌ Error: {error}")
+            return 1
+        print("\nRepository state (git queries run concurrently):")
+        print(format_facts(commit_metadata(metadata.result())))
     print("\n" + "=" * 50)
     print("This tool helps create semantic commit messages from git changes.")
     
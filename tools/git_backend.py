@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Git Plumbing Backend
+Writes a whole series of commits with one git fast-import stream instead of add/commit per step.
+"""
+
+import argparse
+import os
+import stat as stat_module
+import subprocess
+import time
+from collections import namedtuple
+from pathlib import Path
+
+from tracing import span
+
+# files maps a repository path to its bytes, or to None to delete it.
+Commit = namedtuple("Commit", "message files")
+CommitResult = namedtuple("CommitResult", "branch commits head spawns seconds")
+
+# Setup step -> files it owns. Everything else new in the tree belongs to "structure".
+STEP_FILES = {
+    "license": ("LICENSE", "LICENSE.md", "LICENSE.txt", "COPYING"),
+    "gitignore": (".gitignore",),
+    "env": (".env.example", ".env.template"),
+    "readme": ("README.md", "README.rst", "README"),
+    "claude_md": ("CLAUDE.md",),
+    "final": ("CONTRIBUTING.md", "CODE_OF_CONDUCT.md", ".pre-commit-config.yaml",
+              ".editorconfig", ".github/workflows"),
+}
+DEFAULT_BRANCH = "main"
+EXECUTABLE_BITS = stat_module.S_IXUSR | stat_module.S_IXGRP | stat_module.S_IXOTH
+
+
+class GitError(RuntimeError):
+    """A git plumbing command failed."""
+
+
+class GitRunner:
+    """Runs git in one repository and counts process launches."""
+
+    def __init__(self, repo):
+        self.repo = os.fspath(repo)
+        self.spawns = 0
+
+    def run(self, *args, input=None, check=True):
+        self.spawns += 1
+        with span(f"git {args[0]}", "git"):
+            completed = subprocess.run(["git", *args], cwd=self.repo, input=input,
+                                       capture_output=True)
+        if check and completed.returncode != 0:
+            message = completed.stderr.decode("utf-8", "replace").strip()
+            raise GitError(f"git {args[0]} failed: {message}")
+        return completed
+
+
+def _data(payload):
+    return b"data %d\n%s\n" % (len(payload), payload)
+
+
+def fast_import_stream(commits, branch, parent, author, committer):
+    """Yield the fast-import command stream for commits on top of parent (or a root commit)."""
+    ref = f"refs/heads/{branch}".encode()
+    for mark, commit in enumerate(commits, 1):
+        yield b"commit %s\nmark :%d\n" % (ref, mark)
+        yield b"author %s\ncommitter %s\n" % (author, committer)
+        yield _data(commit.message.encode("utf-8"))
+        if mark == 1 and parent:
+            yield b"from %s\n" % parent.encode()
+        for path in sorted(commit.files):
+            content = commit.files[path]
+            quoted = _quote_path(path)
+            if content is None:
+                yield b"D %s\n" % quoted
+                continue
+            mode = b"100644"
+            if isinstance(content, tuple):
+                mode, content = content
+            yield b"M %s inline %s\n" % (mode, quoted)
+            yield _data(content)
+        yield b"\n"
+    yield b"done\n"
+
+
+def _quote_path(path):
+    encoded = path.encode("utf-8")
+    if encoded.startswith(b'"') or any(byte in encoded for byte in b"\n\\"):
+        encoded = b'"' + encoded.replace(b"\\", b"\\\\").replace(b'"', b'\\"').replace(
+            b"\n", b"\\n") + b'"'
+    return encoded
+
+
+def write_history(repo, commits, branch=None, reset_index=True):
+    """Append commits to a branch with a constant number of git processes.
+
+    Commit paths are relative to repo, which may be a subdirectory of an
+    existing repository; a new repository is initialized only when repo is
+    not inside one. Commits with no file changes are dropped. With
+    reset_index=True and the branch checked out, the index entries of the
+    committed paths are refreshed to the new tip without touching the
+    working tree or anything else already staged, as if each step had been
+    added and committed. Returns a CommitResult.
+    """
+    start = time.perf_counter()
+    commits = [commit for commit in commits if commit.files]
+    git = GitRunner(repo)
+    if commits:
+        # Resolved first: a missing identity must fail before anything is created.
+        idents = git.run("var", "GIT_AUTHOR_IDENT").stdout.strip(), \
+            git.run("var", "GIT_COMMITTER_IDENT").stdout.strip()
+    inside = git.run("rev-parse", "--show-prefix", check=False)
+    if inside.returncode == 0:
+        prefix = inside.stdout.decode("utf-8", "replace").strip()
+    elif commits:
+        git.run("init", "-q", "-b", branch or DEFAULT_BRANCH)
+        prefix = ""
+    else:
+        return CommitResult(branch or DEFAULT_BRANCH, 0, None, git.spawns,
+                            time.perf_counter() - start)
+    head = git.run("symbolic-ref", "--short", "-q", "HEAD", check=False).stdout.strip()
+    checked_out = head.decode() or DEFAULT_BRANCH
+    branch = branch or checked_out
+    parent = git.run("rev-parse", "--verify", "-q", f"refs/heads/{branch}^{{commit}}",
+                     check=False).stdout.decode().strip()
+    if not commits:
+        return CommitResult(branch, 0, parent or None, git.spawns,
+                            time.perf_counter() - start)
+
+    rooted = [Commit(commit.message, {prefix + path: content
+                                      for path, content in commit.files.items()})
+              for commit in commits]
+    stream = b"".join(fast_import_stream(rooted, branch, parent, *idents))
+    git.run("fast-import", "--quiet", "--done", input=stream)
+    head = git.run("rev-parse", f"refs/heads/{branch}").stdout.decode().strip()
+    if reset_index and branch == checked_out:
+        paths = sorted({path for commit in commits for path in commit.files})
+        pathspecs = b"".join(b":(literal)" + path.encode("utf-8") + b"\0" for path in paths)
+        git.run("reset", "-q", head, "--pathspec-from-file=-", "--pathspec-file-nul",
+                input=pathspecs)
+    return CommitResult(branch, len(commits), head, git.spawns, time.perf_counter() - start)
+
+
+def read_worktree_file(root, relative):
+    """Return fast-import content for a file: bytes, or (mode, bytes) for executables and links."""
+    path = os.path.join(root, relative)
+    if os.path.islink(path):
+        return b"120000", os.fsencode(os.readlink(path))
+    with open(path, "rb") as handle:
+        content = handle.read()
+    if os.stat(path).st_mode & EXECUTABLE_BITS:
+        return b"100755", content
+    return content
+
+
+def owner_step(relative):
+    for step, owned in STEP_FILES.items():
+        for name in owned:
+            if relative == name or relative.startswith(name + "/"):
+                return step
+    return "structure"
+
+
+def setup_commits(root, steps, tracked=None):
+    """Group the untracked, non-ignored files of root into one Commit per setup step.
+
+    steps is start_project's STEPS list; steps without a commit message
+    contribute their files to the final commit.
+    """
+    from project_index import CACHE_DIR_NAME, iter_project_files
+
+    grouped = {}
+    with span("worktree.read", "io", root=str(root)):
+        for relative, _stat in iter_project_files(root, prune={".git", CACHE_DIR_NAME},
+                                                  gitignore=True, symlinks=True):
+            if tracked is not None and relative in tracked:
+                continue
+            grouped.setdefault(owner_step(relative), {})[relative] = \
+                read_worktree_file(root, relative)
+    commits = []
+    for step in steps:
+        files = grouped.pop(step.name, {})
+        if step.commit_message is None:
+            grouped.setdefault("final", {}).update(files)
+            continue
+        if files:
+            commits.append(Commit(step.commit_message, files))
+    return commits
+
+
+def commit_setup(root, steps):
+    """Record the setup steps' files as the semantic commit series in one fast-import."""
+    from gitignore_rules import tracked_files
+
+    return write_history(root, setup_commits(root, steps, tracked_files(root)))
+
+
+def run_benchmark(commits, files_per_commit):
+    """Compare porcelain add/commit per step with a single fast-import stream."""
+    import tempfile
+
+    series = [Commit(f"chore: step {number}",
+                     {f"step{number}/file{index}.txt": b"content %d %d\n" % (number, index)
+                      for index in range(files_per_commit)})
+              for number in range(commits)]
+    with tempfile.TemporaryDirectory() as workdir:
+        porcelain = Path(workdir) / "porcelain"
+        porcelain.mkdir()
+        git = GitRunner(porcelain)
+        start = time.perf_counter()
+        git.run("init", "-q", "-b", DEFAULT_BRANCH)
+        for commit in series:
+            for path, content in commit.files.items():
+                (porcelain / path).parent.mkdir(parents=True, exist_ok=True)
+                (porcelain / path).write_bytes(content)
+            git.run("add", "-A")
+            git.run("commit", "-q", "-m", commit.message)
+        porcelain_seconds = time.perf_counter() - start
+
+        plumbing = Path(workdir) / "plumbing"
+        plumbing.mkdir()
+        result = write_history(plumbing, series, reset_index=False)
+
+    print(f"📊 Benchmark: {commits} commits x {files_per_commit} files")
+    print(f"   add/commit per step : {porcelain_seconds * 1e3:8.1f} ms, {git.spawns} git processes")
+    print(f"   fast-import stream  : {result.seconds * 1e3:8.1f} ms, {result.spawns} git processes")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Commit a project's setup files as a semantic history in one git stream.")
+    parser.add_argument("project", nargs="?", default=".", help="project directory")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="show the commits that would be written")
+    parser.add_argument("--benchmark", type=int, metavar="N",
+                        help="compare against add/commit for N commits of 20 files")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        run_benchmark(args.benchmark, 20)
+        return 0
+    if not Path(args.project).is_dir():
+        print(f"❌ Error: Project directory not found at {args.project}")
+        return 1
+
+    from start_project import STEPS
+
+    print("🌳 Git Plumbing Backend")
+    print("=" * 50)
+    if args.dry_run:
+        from gitignore_rules import tracked_files
+        for commit in setup_commits(args.project, STEPS, tracked_files(args.project)):
+            print(f"{commit.message} ({len(commit.files)} files)")
+        return 0
+    try:
+        result = commit_setup(args.project, STEPS)
+    except GitError as error:
+        print(f"❌ Error: {error}")
+        return 1
+    if not result.commits:
+        print("Nothing to commit: no new files outside .gitignore")
+        return 0
+    print(f"✅ Wrote {result.commits} commits on {result.branch} ({result.head[:12]}) "
+          f"with {result.spawns} git processes in {result.seconds * 1e3:.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
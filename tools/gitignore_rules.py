@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Gitignore Rules
+Compiles .gitignore patterns with git's negation and anchoring semantics and reports their coverage.
+"""
+
+import argparse
+import os
+import re
+import time
+from itertools import groupby
+from pathlib import Path
+
+from tracing import span, traced
+
+GLOB_CHARS = frozenset("*?[\\")
+LARGE_ARTIFACT_BYTES = 1024 * 1024
+
+
+class Rule:
+    """One .gitignore pattern compiled to a regular expression.
+
+    Patterns without a slash (other than a trailing one) match against the
+    basename only; `regex` is then a basename regex and `literal` holds the
+    name when the pattern has no glob characters at all.
+    """
+
+    __slots__ = ("pattern", "negated", "dir_only", "basename", "literal",
+                 "regex", "line", "section", "index")
+
+    def __init__(self, pattern, negated, dir_only, basename, literal, regex,
+                 line, section, index):
+        self.pattern = pattern
+        self.negated = negated
+        self.dir_only = dir_only
+        self.basename = basename
+        self.literal = literal
+        self.regex = regex
+        self.line = line
+        self.section = section
+        self.index = index
+
+    def matches(self, path, is_dir):
+        if self.dir_only and not is_dir:
+            return False
+        subject = path.rsplit("/", 1)[-1] if self.basename else path
+        return self.regex.match(subject) is not None
+
+
+def _translate(glob):
+    """Translate the glob part of a pattern (no leading/trailing slash) to regex."""
+    parts = []
+    i = 0
+    length = len(glob)
+    while i < length:
+        char = glob[i]
+        if glob.startswith("**/", i) and (i == 0 or glob[i - 1] == "/"):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("/**", i) and i + 3 == length:
+            parts.append("/.*")
+            i += 3
+        elif glob.startswith("**", i) and i + 2 == length and (i == 0 or glob[i - 1] == "/"):
+            parts.append(".*")
+            i += 2
+        elif char == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif char == "?":
+            parts.append("[^/]")
+            i += 1
+        elif char == "[":
+            start = i + 1
+            negated = glob[start:start + 1] in ("!", "^")
+            if negated:
+                start += 1
+            # A "]" right after the opening bracket is a member, not the end.
+            end = glob.find("]", start + 1 if glob.startswith("]", start) else start)
+            if end == -1:
+                parts.append(re.escape(char))
+                i += 1
+            else:
+                body = glob[start:end].replace("\\", "\\\\").replace("[", "\\[")
+                body = body.replace("]", "\\]").replace("^", "\\^")
+                parts.append(("[^" if negated else "[") + body + "]")
+                i = end + 1
+        elif char == "\\" and i + 1 < length:
+            parts.append(re.escape(glob[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(char))
+            i += 1
+    return "".join(parts)
+
+
+def pattern_to_regex(pattern):
+    """Return (regex_source, dir_only, basename) for a pattern without its '!' prefix.
+
+    Basename patterns are translated to match the final path component only,
+    which is equivalent to git's "match at any depth" and much cheaper.
+    """
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    # A slash anywhere but the end anchors the pattern to the .gitignore's directory.
+    basename = "/" not in pattern
+    pattern = pattern.lstrip("/")
+    return _translate(pattern) + "$", dir_only, basename
+
+
+def parse_rules(text):
+    """Parse .gitignore text into a list of Rules (comments and blanks dropped).
+
+    A comment that starts a paragraph names the section its following rules
+    belong to, which is how the generated files group their patterns.
+    """
+    rules = []
+    section = "(top)"
+    previous_blank = True
+    for line_number, raw in enumerate(text.splitlines(), 1):
+        # Trailing spaces are ignored unless escaped.
+        line = raw.rstrip(" ")
+        if raw.endswith("\\ ") and not line.endswith("\\\\"):
+            line += " "
+        if not line:
+            previous_blank = True
+            continue
+        if line.startswith("#"):
+            if previous_blank:
+                section = line.lstrip("#").strip() or section
+            previous_blank = False
+            continue
+        previous_blank = False
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith(("\\!", "\\#")):
+            line = line[1:]
+        if not line or line == "/":
+            continue
+        source, dir_only, basename = pattern_to_regex(line)
+        try:
+            regex = re.compile(source)
+        except re.error:
+            # Not a glob git can use either; match the pattern text literally.
+            regex = re.compile(re.escape(line.rstrip("/").lstrip("/")) + "$")
+        name = line.rstrip("/")
+        literal = name if basename and not GLOB_CHARS & set(name) else None
+        rules.append(Rule(raw.strip(), negated, dir_only, basename, literal,
+                          regex, line_number, section, len(rules)))
+    return rules
+
+
+def _combine(rules):
+    """Join rules into one alternation; group N (1-based) is rules[N - 1]."""
+    if not rules:
+        return None
+    return re.compile("|".join(f"({rule.regex.pattern})" for rule in rules))
+
+
+class _Group:
+    """A run of consecutive rules with the same sign, split by match strategy."""
+
+    def __init__(self, rules):
+        self.negated = rules[0].negated
+        # Reverse so that the first alternative to match is the *last* rule,
+        # which is the one git would report as deciding.
+        ordered = rules[::-1]
+        self.lookups = {}
+        for is_dir in (False, True):
+            candidates = [rule for rule in ordered if is_dir or not rule.dir_only]
+            literals = {}
+            for rule in reversed(candidates):
+                if rule.literal is not None:
+                    literals[rule.literal] = rule
+            names = [rule for rule in candidates if rule.basename and rule.literal is None]
+            paths = [rule for rule in candidates if not rule.basename]
+            self.lookups[is_dir] = (literals, _combine(names), names, _combine(paths), paths)
+
+    def match(self, path, name, is_dir):
+        literals, name_regex, names, path_regex, paths = self.lookups[is_dir]
+        best = literals.get(name)
+        if name_regex is not None:
+            found = name_regex.match(name)
+            if found:
+                rule = names[found.lastindex - 1]
+                if best is None or rule.index > best.index:
+                    best = rule
+        if path_regex is not None:
+            found = path_regex.match(path)
+            if found:
+                rule = paths[found.lastindex - 1]
+                if best is None or rule.index > best.index:
+                    best = rule
+        return best
+
+
+class CompiledRules:
+    """All rules of one .gitignore compiled into a few regexes and a literal-name table."""
+
+    def __init__(self, rules):
+        self.rules = rules
+        groups = [_Group(list(run)) for _sign, run in groupby(rules, key=lambda r: r.negated)]
+        self.groups = groups[::-1]
+
+    @classmethod
+    def from_text(cls, text):
+        return cls(parse_rules(text))
+
+    def match(self, path, is_dir=False):
+        """Return the deciding Rule for path (relative, '/'-separated) or None."""
+        name = path.rsplit("/", 1)[-1]
+        for group in self.groups:
+            rule = group.match(path, name, is_dir)
+            if rule is not None:
+                return rule
+        return None
+
+    def is_ignored(self, path, is_dir=False):
+        rule = self.match(path, is_dir)
+        return rule is not None and not rule.negated
+
+
+class IgnoreStack:
+    """The chain of .gitignore files that applies to one directory during a walk."""
+
+    def __init__(self, rulesets=()):
+        # Tuple of (base_prefix, CompiledRules) from the root downwards.
+        self.rulesets = tuple(rulesets)
+
+    @classmethod
+    def for_root(cls, root):
+        return cls().descend(root, "")
+
+    def descend(self, root, relative_dir):
+        """Return the stack for relative_dir, adding its .gitignore if it has one."""
+        gitignore = Path(root, relative_dir, ".gitignore")
+        try:
+            text = gitignore.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return self
+        compiled = CompiledRules.from_text(text)
+        if not compiled.rules:
+            return self
+        base = relative_dir + "/" if relative_dir else ""
+        return IgnoreStack(self.rulesets + ((base, compiled),))
+
+    def is_ignored(self, relative_path, is_dir=False):
+        """Apply git's last-match-wins rule across all applicable .gitignore files."""
+        for base, compiled in reversed(self.rulesets):
+            if not relative_path.startswith(base):
+                continue
+            rule = compiled.match(relative_path[len(base):], is_dir)
+            if rule is not None:
+                return not rule.negated
+        return False
+
+
+def tracked_files(root):
+    """Return the set of paths tracked by git, or None outside a git work tree."""
+    import subprocess
+
+    try:
+        with span("git.ls-files", "git", root=str(root)):
+            output = subprocess.run(["git", "ls-files", "-z"], cwd=root,
+                                    capture_output=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return set(output.decode("utf-8", errors="replace").split("\0")) - {""}
+
+
+@traced("gitignore.coverage", "walk")
+def coverage_report(root, gitignore_text, large_bytes=LARGE_ARTIFACT_BYTES):
+    """Evaluate one .gitignore against the whole working tree in a single walk.
+
+    Ignored directories count as one entry and are not descended, exactly
+    like git. Returns a dict with per-rule and per-section hit counts, dead
+    patterns and large untracked files the rules let through.
+    """
+    start = time.perf_counter()
+    compiled = CompiledRules.from_text(gitignore_text)
+    tracked = tracked_files(root)
+    hits = [0] * len(compiled.rules)
+    entries = ignored = 0
+    artifacts = []
+    root = os.fspath(root)
+    stack = [""]
+    while stack:
+        relative_dir = stack.pop()
+        try:
+            scanner = os.scandir(os.path.join(root, relative_dir))
+        except OSError:
+            continue
+        with scanner:
+            for entry in scanner:
+                relative = f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if is_dir and entry.name == ".git":
+                    continue
+                entries += 1
+                rule = compiled.match(relative, is_dir)
+                if rule is not None:
+                    hits[rule.index] += 1
+                    if not rule.negated:
+                        ignored += 1
+                        continue
+                if is_dir:
+                    stack.append(relative)
+                elif tracked is None or relative not in tracked:
+                    try:
+                        size = entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+                    if size >= large_bytes:
+                        artifacts.append((size, relative))
+
+    sections = {}
+    for rule, count in zip(compiled.rules, hits):
+        if not rule.negated:
+            sections[rule.section] = sections.get(rule.section, 0) + count
+    seconds = time.perf_counter() - start
+    return {
+        "entries": entries,
+        "ignored": ignored,
+        "seconds": seconds,
+        "sections": sections,
+        "rules": [(rule.pattern, rule.line, count) for rule, count in zip(compiled.rules, hits)],
+        "dead_patterns": [(rule.pattern, rule.line, rule.section)
+                          for rule, count in zip(compiled.rules, hits) if count == 0],
+        "large_artifacts": [(path, size) for size, path in sorted(artifacts, reverse=True)],
+    }
+
+
+def format_report(report, limit=20):
+    """Render a coverage report as text."""
+    rate = report["entries"] / report["seconds"] if report["seconds"] else 0
+    lines = [f"Evaluated {report['entries']} entries in {report['seconds'] * 1e3:.1f}ms "
+             f"({rate:,.0f} paths/s); {report['ignored']} ignored",
+             "", "Ignored entries per section:"]
+    for section, count in report["sections"].items():
+        lines.append(f"  {count:>8}  {section}")
+    dead = report["dead_patterns"]
+    lines += ["", f"Dead patterns (match nothing in this tree): {len(dead)}"]
+    for pattern, line, section in dead[:limit]:
+        lines.append(f"  line {line:<4} {pattern:<30} [{section}]")
+    if len(dead) > limit:
+        lines.append(f"  ... and {len(dead) - limit} more")
+    artifacts = report["large_artifacts"]
+    lines += ["", f"Large untracked files not ignored: {len(artifacts)}"]
+    for path, size in artifacts[:limit]:
+        lines.append(f"  {size / 1e6:>8.1f} MB  {path}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report what a .gitignore matches in a tree.")
+    parser.add_argument("project", nargs="?", default=".", help="project directory")
+    parser.add_argument("--gitignore", help="rules to evaluate (default: PROJECT/.gitignore)")
+    parser.add_argument("--large", type=float, default=LARGE_ARTIFACT_BYTES / 1e6,
+                        metavar="MB", help="size that makes an untracked file an artifact")
+    args = parser.parse_args(argv)
+
+    gitignore = Path(args.gitignore or Path(args.project) / ".gitignore")
+    if not gitignore.exists():
+        print(f"❌ Error: .gitignore not found at {gitignore}")
+        return 1
+
+    report = coverage_report(args.project, gitignore.read_text(encoding="utf-8"),
+                             int(args.large * 1e6))
+    print(f"🚫 .gitignore coverage for {gitignore}")
+    print("=" * 50)
+    print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,710 @@
+#!/usr/bin/env python3
+"""
+License Compatibility Scanner
+Stream-parses lockfiles, resolves dependency licenses from local installs and reports conflicts.
+"""
+
+import argparse
+import functools
+import glob
+import json
+import os
+import re
+import time
+from collections import Counter, namedtuple
+from pathlib import Path
+
+from project_index import PRUNE_DIRS, cache_dir
+from tracing import span
+
+CACHE_FILE_NAME = "licenses.sqlite"
+CACHE_WRITE_BATCH = 500
+LICENSE_FILE_HEAD = 4096
+MAX_REPORTED = 50
+
+Dependency = namedtuple("Dependency", "ecosystem name version license location")
+Finding = namedtuple("Finding", "dependency license verdict reason")
+
+PERMISSIVE = frozenset({
+    "MIT", "MIT-0", "ISC", "0BSD", "BSD-2-Clause", "BSD-3-Clause", "Apache-2.0",
+    "Unlicense", "Zlib", "BSL-1.0", "CC0-1.0", "Python-2.0", "PSF-2.0", "CC-BY-4.0",
+    "BlueOak-1.0.0", "WTFPL", "X11", "Artistic-2.0",
+})
+WEAK_COPYLEFT = frozenset({
+    "LGPL-2.1-only", "LGPL-2.1-or-later", "LGPL-3.0-only", "LGPL-3.0-or-later",
+    "MPL-2.0", "EPL-1.0", "EPL-2.0", "CDDL-1.0",
+})
+STRONG_COPYLEFT = frozenset({
+    "GPL-2.0-only", "GPL-2.0-or-later", "GPL-3.0-only", "GPL-3.0-or-later",
+    "AGPL-3.0-only", "AGPL-3.0-or-later",
+})
+
+# Lowercased free-form names seen in package metadata -> SPDX identifier.
+LICENSE_ALIASES = {
+    "mit license": "MIT", "the mit license": "MIT", "expat": "MIT",
+    "apache": "Apache-2.0", "apache 2.0": "Apache-2.0", "apache-2": "Apache-2.0",
+    "apache license 2.0": "Apache-2.0", "apache software license": "Apache-2.0",
+    "apache license, version 2.0": "Apache-2.0", "apache2": "Apache-2.0",
+    "bsd": "BSD-3-Clause", "bsd license": "BSD-3-Clause", "new bsd license": "BSD-3-Clause",
+    "bsd-3": "BSD-3-Clause", "simplified bsd": "BSD-2-Clause", "bsd-2": "BSD-2-Clause",
+    "isc license": "ISC", "isc license (iscl)": "ISC",
+    "mozilla public license 2.0 (mpl 2.0)": "MPL-2.0", "mpl 2.0": "MPL-2.0",
+    "python software foundation license": "PSF-2.0", "psf": "PSF-2.0",
+    "the unlicense (unlicense)": "Unlicense", "public domain": "Unlicense",
+    "gpl": "GPL-2.0-or-later", "gplv2": "GPL-2.0-only", "gplv3": "GPL-3.0-only",
+    "gnu general public license v2 (gplv2)": "GPL-2.0-only",
+    "gnu general public license v3 (gplv3)": "GPL-3.0-only",
+    "gnu general public license v2 or later (gplv2+)": "GPL-2.0-or-later",
+    "gnu general public license v3 or later (gplv3+)": "GPL-3.0-or-later",
+    "gnu lesser general public license v2 or later (lgplv2+)": "LGPL-2.1-or-later",
+    "gnu lesser general public license v3 (lgplv3)": "LGPL-3.0-only",
+    "gnu lesser general public license v3 or later (lgplv3+)": "LGPL-3.0-or-later",
+    "gnu affero general public license v3": "AGPL-3.0-only",
+    "lgpl": "LGPL-2.1-or-later", "agpl-3.0": "AGPL-3.0-only",
+    "gpl-2.0": "GPL-2.0-only", "gpl-3.0": "GPL-3.0-only", "gpl-2.0+": "GPL-2.0-or-later",
+    "gpl-3.0+": "GPL-3.0-or-later", "lgpl-2.1": "LGPL-2.1-only", "lgpl-3.0": "LGPL-3.0-only",
+    "lgpl-2.1+": "LGPL-2.1-or-later", "lgpl-3.0+": "LGPL-3.0-or-later",
+    "proprietary": "Proprietary", "unlicensed": "Proprietary",
+}
+SPDX_IDS = {spdx.lower(): spdx for spdx in PERMISSIVE | WEAK_COPYLEFT | STRONG_COPYLEFT}
+
+# (all substrings that must appear in a license file's head, SPDX id); first match wins.
+LICENSE_TEXT_SIGNATURES = [
+    (("GNU AFFERO GENERAL PUBLIC LICENSE", "Version 3"), "AGPL-3.0-only"),
+    (("GNU LESSER GENERAL PUBLIC LICENSE", "Version 3"), "LGPL-3.0-only"),
+    (("GNU LESSER GENERAL PUBLIC LICENSE", "Version 2.1"), "LGPL-2.1-only"),
+    (("GNU GENERAL PUBLIC LICENSE", "Version 3"), "GPL-3.0-only"),
+    (("GNU GENERAL PUBLIC LICENSE", "Version 2"), "GPL-2.0-only"),
+    (("Mozilla Public License", "2.0"), "MPL-2.0"),
+    (("Apache License", "Version 2.0"), "Apache-2.0"),
+    (("Permission is hereby granted, free of charge",), "MIT"),
+    (("Permission to use, copy, modify, and/or distribute",), "ISC"),
+    (("Redistribution and use in source and binary forms", "Neither the name"), "BSD-3-Clause"),
+    (("Redistribution and use in source and binary forms",), "BSD-2-Clause"),
+    (("This is free and unencumbered software",), "Unlicense"),
+]
+
+# Lockfile name pattern -> parser name; requirements files come in many spellings.
+LOCKFILES = [
+    (re.compile(r"package-lock\.json$|npm-shrinkwrap\.json$"), "npm"),
+    (re.compile(r"poetry\.lock$"), "poetry"),
+    (re.compile(r"requirements[^/]*\.txt$"), "pip"),
+    (re.compile(r"Cargo\.lock$"), "cargo"),
+    (re.compile(r"go\.sum$"), "go"),
+]
+LOCKFILE_SEARCH_DEPTH = 3
+
+
+# -- Lockfile parsers: each yields Dependency tuples while reading line by line.
+
+NPM_KEY = re.compile(r'^(\s*)"([^"]*)": \{\s*$')
+NPM_FIELD = re.compile(r'^(\s*)"(version|license)": "([^"]*)"')
+NPM_CLOSE = re.compile(r"^(\s*)\},?\s*$")
+
+
+def parse_package_lock(path):
+    """npm lockfiles (v1-v3) as written by npm, one key per line.
+
+    Every object with a direct "version" string is a package; "packages"
+    keys give the install path (node_modules/a/node_modules/b). Files that
+    are not pretty-printed fall back to a full json parse.
+    """
+    with open(path, encoding="utf-8") as handle:
+        first = handle.readline()
+        if len(first) > 2:  # not pretty-printed: the whole document on one line
+            handle.seek(0)
+            yield from _package_lock_document(json.load(handle))
+            return
+        stack = []  # [indent, key, {field: value}]
+        for line in handle:
+            # Cheap shape tests first: most lines are fields nobody needs.
+            tail = line.rstrip()
+            if tail.endswith("{"):
+                match = NPM_KEY.match(line)
+                if match:
+                    stack.append([len(match.group(1)), match.group(2), {}])
+                continue
+            if '"version"' in line or '"license"' in line:
+                match = NPM_FIELD.match(line)
+                if match and stack and len(match.group(1)) == stack[-1][0] + 2:
+                    stack[-1][2][match.group(2)] = match.group(3)
+                continue
+            if not tail.endswith(("}", "},")):
+                continue
+            match = NPM_CLOSE.match(line)
+            if match and stack and len(match.group(1)) == stack[-1][0]:
+                _indent, key, fields = stack.pop()
+                if key and "version" in fields:
+                    yield _npm_dependency(key, fields)
+
+
+def _npm_dependency(key, fields):
+    location = key if key.startswith("node_modules/") else None
+    name = key.rsplit("node_modules/", 1)[-1]
+    return Dependency("npm", name, fields["version"], fields.get("license"), location)
+
+
+def _package_lock_document(data):
+    for key, fields in data.get("packages", {}).items():
+        if key and isinstance(fields, dict) and "version" in fields:
+            yield _npm_dependency(key, fields)
+    pending = list(data.get("dependencies", {}).items())
+    while pending:
+        key, fields = pending.pop()
+        if isinstance(fields, dict) and "version" in fields:
+            yield _npm_dependency(key, fields)
+            pending.extend(fields.get("dependencies", {}).items())
+
+
+TOML_STRING = re.compile(r'^(name|version|license)\s*=\s*"([^"]*)"')
+
+
+def parse_package_tables(path, ecosystem):
+    """[[package]] tables with name/version keys (poetry.lock, Cargo.lock)."""
+    fields = None
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if line.startswith("["):
+                if fields and "name" in fields and "version" in fields:
+                    yield Dependency(ecosystem, fields["name"], fields["version"],
+                                     fields.get("license"), None)
+                fields = {} if line.strip() == "[[package]]" else None
+                continue
+            if fields is not None:
+                match = TOML_STRING.match(line)
+                if match:
+                    fields[match.group(1)] = match.group(2)
+    if fields and "name" in fields and "version" in fields:
+        yield Dependency(ecosystem, fields["name"], fields["version"],
+                         fields.get("license"), None)
+
+
+REQUIREMENT = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._-]*)(?:\[[^\]]*\])?\s*(?:===?\s*([^\s;#,]+))?")
+DIRECT_REFERENCE = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._-]*)(?:\[[^\]]*\])?\s*@\s*\S")
+EGG_FRAGMENT = re.compile(r"[#&]egg=([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+
+def parse_requirements(path):
+    """Pinned (name==version) and unpinned requirement lines; options and includes are skipped.
+
+    VCS, URL and path requirements carry no version. They are reported by the
+    name from "name @ url" or "#egg=name", and skipped when they have neither.
+    """
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        for line in handle:
+            line = line.strip()
+            for option in ("-e ", "--editable "):
+                if line.startswith(option):
+                    line = line[len(option):].strip()
+            if not line or line.startswith(("#", "-")):
+                continue
+            match = DIRECT_REFERENCE.match(line)
+            if match:
+                yield Dependency("pypi", match.group(1), None, None, None)
+                continue
+            if "://" in line or line.startswith((".", "/", "~", "file:")) or "/" in line.split()[0]:
+                match = EGG_FRAGMENT.search(line)
+                if match:
+                    yield Dependency("pypi", match.group(1), None, None, None)
+                continue
+            match = REQUIREMENT.match(line)
+            if match:
+                yield Dependency("pypi", match.group(1), match.group(2), None, None)
+
+
+def parse_go_sum(path):
+    seen = set()
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            parts = line.split()
+            if len(parts) < 2 or parts[1].endswith("/go.mod"):
+                continue
+            if (parts[0], parts[1]) not in seen:
+                seen.add((parts[0], parts[1]))
+                yield Dependency("go", parts[0], parts[1], None, None)
+
+
+PARSERS = {
+    "npm": parse_package_lock,
+    "poetry": lambda path: parse_package_tables(path, "pypi"),
+    "pip": parse_requirements,
+    "cargo": lambda path: parse_package_tables(path, "cargo"),
+    "go": parse_go_sum,
+}
+
+
+def find_lockfiles(root, depth=LOCKFILE_SEARCH_DEPTH):
+    """Return [(path, parser)] for lockfiles in the top `depth` directory levels."""
+    root = os.fspath(root)
+    found = []
+    stack = [(root, 0)]
+    while stack:
+        directory, level = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if level + 1 < depth and entry.name not in PRUNE_DIRS:
+                    stack.append((entry.path, level + 1))
+                continue
+            for pattern, parser in LOCKFILES:
+                if pattern.match(entry.name):
+                    found.append((entry.path, parser))
+                    break
+    return sorted(found)
+
+
+def iter_dependencies(root):
+    """Stream unique dependencies from every lockfile in root."""
+    seen = set()
+    for path, parser in find_lockfiles(root):
+        with span("lockfile.parse", "license", file=os.path.basename(path)):
+            for dependency in PARSERS[parser](path):
+                key = (dependency.ecosystem, dependency.name.lower(), dependency.version)
+                if key not in seen:
+                    seen.add(key)
+                    yield dependency
+
+
+# -- License metadata from locally installed packages.
+
+def _split_top_level(expression, operators):
+    """Split expression at operators that are not inside parentheses."""
+    parts = []
+    depth = start = index = 0
+    while index < len(expression):
+        char = expression[index]
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth == 0:
+            operator = next((op for op in operators if expression.startswith(op, index)), None)
+            if operator:
+                parts.append(expression[start:index])
+                index = start = index + len(operator)
+                continue
+        index += 1
+    parts.append(expression[start:])
+    return parts
+
+
+def _unwrap(expression):
+    """Remove parentheses that enclose the whole expression."""
+    while expression.startswith("(") and expression.endswith(")"):
+        depth = 0
+        for index, char in enumerate(expression):
+            depth += char == "("
+            depth -= char == ")"
+            if depth == 0 and index < len(expression) - 1:
+                return expression  # "(A) AND (B)": the first group closes early
+        expression = expression[1:-1].strip()
+    return expression
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_license(value):
+    """Map a free-form license string or SPDX expression to a normalized expression.
+
+    Parentheses group first, then AND binds tighter than OR, as in SPDX.
+    """
+    if not value:
+        return None
+    value = _unwrap(value.strip())
+    lowered = value.lower()
+    if lowered in SPDX_IDS:
+        return SPDX_IDS[lowered]
+    if lowered in LICENSE_ALIASES:
+        return LICENSE_ALIASES[lowered]
+    alternatives = _split_top_level(value, (" OR ", " or ", "/"))
+    if len(alternatives) > 1:
+        return " OR ".join(filter(None, map(normalize_license, alternatives)))
+    terms = _split_top_level(value, (" AND ", " and "))
+    if len(terms) > 1:
+        terms = filter(None, map(normalize_license, terms))
+        return " AND ".join(f"({term})" if len(_split_top_level(term, (" OR ",))) > 1 else term
+                            for term in terms)
+    if lowered.endswith("+") and lowered[:-1] + "-only" in SPDX_IDS:
+        return SPDX_IDS[lowered[:-1] + "-or-later"]
+    if lowered + "-only" in SPDX_IDS:  # deprecated bare GPL-3.0 style ids
+        return SPDX_IDS[lowered + "-only"]
+    return value.strip("()")
+
+
+def classify_license_text(text):
+    for needles, spdx in LICENSE_TEXT_SIGNATURES:
+        if all(needle in text for needle in needles):
+            return spdx
+    return None
+
+
+def _license_from_files(directory):
+    for pattern in ("LICENSE*", "LICENCE*", "COPYING*", "license*"):
+        for path in sorted(glob.glob(os.path.join(glob.escape(directory), pattern))):
+            try:
+                with open(path, encoding="utf-8", errors="replace") as handle:
+                    spdx = classify_license_text(handle.read(LICENSE_FILE_HEAD))
+            except OSError:
+                continue
+            if spdx:
+                return spdx
+    return None
+
+
+def _pep503(name):
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+class LocalResolver:
+    """Looks dependencies up in the project's installed packages and tool caches.
+
+    Directory listings are built lazily, once per ecosystem.
+    """
+
+    def __init__(self, root):
+        self.root = os.fspath(root)
+        self._python = None
+        self._cargo = None
+
+    def resolve(self, dependency):
+        """Return (license, source) or (None, None)."""
+        handler = getattr(self, "_resolve_" + dependency.ecosystem, None)
+        return handler(dependency) if handler else (None, None)
+
+    def _resolve_npm(self, dependency):
+        location = dependency.location or f"node_modules/{dependency.name}"
+        try:
+            with open(os.path.join(self.root, location, "package.json"), encoding="utf-8") as handle:
+                manifest = json.load(handle)
+        except (OSError, ValueError):
+            return None, None
+        license = manifest.get("license")
+        if isinstance(license, dict):
+            license = license.get("type")
+        if not license and isinstance(manifest.get("licenses"), list):
+            license = " OR ".join(entry.get("type", "") for entry in manifest["licenses"]
+                                  if isinstance(entry, dict))
+        if manifest.get("version") != dependency.version:
+            return license or None, "node_modules (other version)"
+        return license or None, "node_modules"
+
+    def site_packages(self):
+        candidates = []
+        for venv in (".venv", "venv", "env"):
+            candidates += glob.glob(os.path.join(self.root, venv, "lib", "python*", "site-packages"))
+            candidates += glob.glob(os.path.join(self.root, venv, "Lib", "site-packages"))
+        if os.environ.get("VIRTUAL_ENV"):
+            candidates += glob.glob(os.path.join(os.environ["VIRTUAL_ENV"], "lib", "python*",
+                                                 "site-packages"))
+        import site
+        candidates += [path for path in site.getsitepackages() if os.path.isdir(path)]
+        return candidates
+
+    def _resolve_pypi(self, dependency):
+        if self._python is None:
+            self._python = {}
+            for directory in reversed(self.site_packages()):  # project venvs win
+                try:
+                    entries = os.listdir(directory)
+                except OSError:
+                    continue
+                for entry in entries:
+                    if entry.endswith(".dist-info"):
+                        name, _, version = entry[:-len(".dist-info")].partition("-")
+                        self._python[_pep503(name)] = (version, os.path.join(directory, entry))
+        installed = self._python.get(_pep503(dependency.name))
+        if installed is None:
+            return None, None
+        version, path = installed
+        license = _license_from_metadata(os.path.join(path, "METADATA")) or \
+            _license_from_files(os.path.join(path, "licenses")) or _license_from_files(path)
+        same = dependency.version is None or version == dependency.version
+        return license, "site-packages" if same else "site-packages (other version)"
+
+    def _resolve_cargo(self, dependency):
+        if self._cargo is None:
+            self._cargo = {}
+            home = os.environ.get("CARGO_HOME", os.path.expanduser("~/.cargo"))
+            for registry in glob.glob(os.path.join(home, "registry", "src", "*")):
+                try:
+                    for entry in os.listdir(registry):
+                        self._cargo[entry] = os.path.join(registry, entry)
+                except OSError:
+                    continue
+        path = self._cargo.get(f"{dependency.name}-{dependency.version}")
+        if path is None:
+            return None, None
+        try:
+            with open(os.path.join(path, "Cargo.toml"), encoding="utf-8") as handle:
+                for line in handle:
+                    match = TOML_STRING.match(line)
+                    if match and match.group(1) == "license":
+                        return match.group(2), "cargo registry"
+        except OSError:
+            pass
+        return _license_from_files(path), "cargo registry"
+
+    def _resolve_go(self, dependency):
+        cache = os.environ.get("GOMODCACHE") or os.path.join(
+            os.environ.get("GOPATH", os.path.expanduser("~/go")), "pkg", "mod")
+        # The module cache escapes upper-case letters as "!" + lower-case.
+        escaped = re.sub(r"[A-Z]", lambda match: "!" + match.group(0).lower(), dependency.name)
+        path = os.path.join(cache, f"{escaped}@{dependency.version}")
+        if not os.path.isdir(path):
+            return None, None
+        return _license_from_files(path), "go module cache"
+
+
+def _license_from_metadata(path):
+    """License-Expression, License or a License classifier from a dist-info METADATA header."""
+    found = {}
+    try:
+        with open(path, encoding="utf-8", errors="replace") as handle:
+            for line in handle:
+                if not line.strip():
+                    break
+                key, _, value = line.partition(":")
+                value = value.strip()
+                if key == "License-Expression":
+                    return value
+                if key == "License" and value and value != "UNKNOWN" and len(value) < 100:
+                    found.setdefault("license", value)
+                elif key == "Classifier" and value.startswith("License ::"):
+                    name = value.rsplit("::", 1)[-1].strip()
+                    if name not in ("OSI Approved", "Other/Proprietary License"):
+                        found.setdefault("classifier", name)
+    except OSError:
+        return None
+    return found.get("license") or found.get("classifier")
+
+
+class LicenseCache:
+    """package@version -> license, in <project>/.toolkit/licenses.sqlite."""
+
+    def __init__(self, root):
+        import sqlite3
+
+        self.conn = sqlite3.connect(cache_dir(root) / CACHE_FILE_NAME, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS licenses (
+                ecosystem TEXT NOT NULL, name TEXT NOT NULL, version TEXT NOT NULL,
+                license TEXT NOT NULL, source TEXT NOT NULL,
+                PRIMARY KEY (ecosystem, name, version))""")
+        # One row per locked package of this project: small enough to preload.
+        self.known = {(ecosystem, name, version): (license, source) for
+                      ecosystem, name, version, license, source
+                      in self.conn.execute("SELECT * FROM licenses")}
+        self.pending = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+        self.conn.close()
+
+    def get(self, dependency):
+        key = (dependency.ecosystem, dependency.name, dependency.version or "")
+        return self.known.get(key, (None, None))
+
+    def put(self, dependency, license, source):
+        key = (dependency.ecosystem, dependency.name, dependency.version or "")
+        self.known[key] = (license, source)
+        self.pending.append(key + (license, source))
+        if len(self.pending) >= CACHE_WRITE_BATCH:
+            self.flush()
+
+    def flush(self):
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO licenses VALUES (?, ?, ?, ?, ?)",
+                                  self.pending)
+        self.pending = []
+
+
+def resolve_licenses(root, dependencies):
+    """Yield (Dependency, normalized license or None, source), using and filling the cache.
+
+    Licenses stated in the lockfile are used directly. Of the ones looked up
+    locally, only those found for the exact locked version are cached;
+    anything else is looked up again next time, since it may be installed
+    by then.
+    """
+    resolver = LocalResolver(root)
+    with LicenseCache(root) as cache:
+        for dependency in dependencies:
+            if dependency.license:
+                yield dependency, normalize_license(dependency.license), "lockfile"
+                continue
+            license, source = cache.get(dependency)
+            if license is not None:
+                yield dependency, license, "cache"
+                continue
+            license, source = resolver.resolve(dependency)
+            license = normalize_license(license)
+            if license and dependency.version and "other version" not in (source or ""):
+                cache.put(dependency, license, source)
+            yield dependency, license, source
+
+
+# -- Compatibility.
+
+def license_category(spdx):
+    if spdx in PERMISSIVE:
+        return "permissive"
+    if spdx in WEAK_COPYLEFT:
+        return "weak copyleft"
+    if spdx in STRONG_COPYLEFT:
+        return "strong copyleft"
+    if spdx == "Proprietary":
+        return "proprietary"
+    return None
+
+
+def check_single(project, dependency_license):
+    """Return (verdict, reason) for one SPDX id: "ok", "review", "conflict" or "unknown"."""
+    category = license_category(dependency_license)
+    if category is None:
+        return "unknown", f"unrecognized license {dependency_license!r}"
+    if category == "permissive":
+        # GPL-2.0-or-later code may be taken under GPL-3.0, which accepts Apache-2.0.
+        if dependency_license == "Apache-2.0" and project == "GPL-2.0-only":
+            return "conflict", "Apache-2.0 is incompatible with GPL-2.0-only"
+        return "ok", ""
+    if category == "proprietary":
+        return "conflict", "proprietary dependency"
+    project_category = license_category(project)
+    if category == "weak copyleft":
+        if project_category == "strong copyleft":
+            if dependency_license.startswith("LGPL-3.0") and project == "GPL-2.0-only":
+                return "conflict", "LGPL-3.0 cannot be combined with GPL-2.0-only"
+            return "ok", ""
+        return "review", f"{dependency_license} is file/library copyleft: keep it unmodified " \
+                         "and dynamically linked"
+    # Strong copyleft dependency.
+    if project_category != "strong copyleft":
+        return "conflict", f"{dependency_license} requires the whole work to be " \
+                           f"{dependency_license.split('-')[0]}, not {project}"
+    if dependency_license == "GPL-2.0-only" and not project.startswith("GPL-2.0"):
+        return "conflict", "GPL-2.0-only cannot be combined with (A)GPL-3.0"
+    if project == "GPL-2.0-only" and ("3.0" in dependency_license):
+        return "conflict", f"{dependency_license} cannot be combined with GPL-2.0-only"
+    if dependency_license.startswith("AGPL") and not project.startswith("AGPL"):
+        return "review", "AGPL network-use terms apply to the combined work"
+    return "ok", ""
+
+
+VERDICT_ORDER = {"ok": 0, "review": 1, "unknown": 2, "conflict": 3}
+
+
+@functools.lru_cache(maxsize=4096)
+def check_compatibility(project, expression):
+    """Evaluate an SPDX expression: OR takes the best alternative, AND the worst term."""
+    if not expression:
+        return "unknown", "no license metadata found"
+    expression = _unwrap(expression.strip())
+    alternatives = _split_top_level(expression, (" OR ",))
+    if len(alternatives) > 1:
+        return min((check_compatibility(project, alternative) for alternative in alternatives),
+                   key=lambda term: VERDICT_ORDER[term[0]])
+    terms = _split_top_level(expression, (" AND ",))
+    if len(terms) > 1:
+        return max((check_compatibility(project, term) for term in terms),
+                   key=lambda term: VERDICT_ORDER[term[0]])
+    return check_single(project, expression)
+
+
+def project_license(root):
+    """The project's own license, from its LICENSE file."""
+    return _license_from_files(os.fspath(root))
+
+
+def scan(root, license):
+    """Resolve every locked dependency and check it against license; returns a report dict."""
+    start = time.perf_counter()
+    license = normalize_license(license)
+    counts = Counter()
+    sources = Counter()
+    verdicts = Counter()
+    findings = {"conflict": [], "review": [], "unknown": []}
+    total = 0
+    with span("license.scan", "license"):
+        for dependency, resolved, source in resolve_licenses(root, iter_dependencies(root)):
+            total += 1
+            counts[resolved or "unknown"] += 1
+            sources[source or "unresolved"] += 1
+            verdict, reason = check_compatibility(license, resolved)
+            verdicts[verdict] += 1
+            if verdict in findings:
+                findings[verdict].append(Finding(dependency, resolved, verdict, reason))
+    return {
+        "license": license,
+        "dependencies": total,
+        "licenses": dict(counts.most_common()),
+        "sources": dict(sources.most_common()),
+        "verdicts": dict(verdicts),
+        "findings": findings,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def format_report(report, limit=MAX_REPORTED):
+    lines = [f"  Project license: {report['license']}",
+             f"  Dependencies: {report['dependencies']} "
+             f"(resolved via {', '.join(f'{k} {v}' for k, v in report['sources'].items()) or '-'})",
+             "  Licenses: " + (", ".join(f"{name} ({count})" for name, count
+                                        in list(report["licenses"].items())[:10]) or "none")]
+    for verdict, label in (("conflict", "❌ Conflicts"), ("review", "⚠️  Needs review"),
+                           ("unknown", "❔ Unknown license")):
+        found = report["findings"][verdict]
+        if not found:
+            continue
+        lines.append(f"\n  {label} ({len(found)}):")
+        for finding in found[:limit]:
+            dependency = finding.dependency
+            lines.append(f"    {dependency.ecosystem}:{dependency.name}@{dependency.version or '*'}"
+                         f"  {finding.license or '-'}  {finding.reason}")
+        if len(found) > limit:
+            lines.append(f"    ... and {len(found) - limit} more")
+    lines.append(f"\n  Scanned in {report['seconds'] * 1e3:.1f}ms")
+    return "\n".join(lines)
+
+
+def report_to_dict(report):
+    data = dict(report)
+    data["findings"] = {verdict: [{"ecosystem": f.dependency.ecosystem, "name": f.dependency.name,
+                                   "version": f.dependency.version, "license": f.license,
+                                   "reason": f.reason} for f in found]
+                        for verdict, found in report["findings"].items()}
+    return data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check dependency licenses against the project's.")
+    parser.add_argument("project", nargs="?", default=".", help="project directory")
+    parser.add_argument("--license", help="project license as SPDX id (default: from LICENSE)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if not Path(args.project).is_dir():
+        print(f"❌ Error: Project directory not found at {args.project}")
+        return 1
+    license = args.license or project_license(args.project)
+    if not license:
+        print("❌ Error: No LICENSE file recognized; pass --license SPDX-ID")
+        return 1
+
+    report = scan(args.project, license)
+    if args.json:
+        print(json.dumps(report_to_dict(report), indent=2))
+    else:
+        print("⚖️  License Compatibility")
+        print("=" * 50)
+        print(format_report(report))
+    return 1 if report["findings"]["conflict"] else 0
+
+
+if __name__ == "__main__":
+    exit(main())
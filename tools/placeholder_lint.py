@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Placeholder Linter
+Finds {{PLACEHOLDER}} markers left unfilled in generated files across many repositories.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import time
+from pathlib import Path
+
+from template_renderer import TEMPLATES_DIR, load_template
+from tracing import span
+
+# Files the setup tools generate from the templates.
+TARGET_FILES = ("README.md", "CLAUDE.md", "CONTRIBUTING.md", ".env.example", ".gitignore")
+# Below this size a plain read is cheaper than setting up a mapping.
+MMAP_THRESHOLD = 64 * 1024
+PARALLEL_THRESHOLD = 200
+BATCH_SIZE = 50
+
+
+def vocabulary(templates_dir=TEMPLATES_DIR):
+    """Every placeholder name used by the templates, sorted."""
+    names = set()
+    for path in sorted(Path(templates_dir).glob("*_template.md")):
+        names.update(load_template(path).placeholders)
+    return sorted(names)
+
+
+class Automaton:
+    """Aho-Corasick automaton over byte patterns.
+
+    All placeholder patterns start with "{{", so the scan jumps between
+    occurrences of that common prefix with bytes.find (which runs in C) and
+    only steps the automaton byte by byte from there until it falls back to
+    the root.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = [pattern.encode("utf-8") if isinstance(pattern, str) else pattern
+                         for pattern in patterns]
+        self.goto = [{}]
+        self.output = [()]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for byte in pattern:
+                following = self.goto[state].get(byte)
+                if following is None:
+                    following = len(self.goto)
+                    self.goto[state][byte] = following
+                    self.goto.append({})
+                    self.output.append(())
+                state = following
+            self.output[state] += (index,)
+
+        self.fail = [0] * len(self.goto)
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for byte, following in self.goto[state].items():
+                queue.append(following)
+                fallback = self.fail[state]
+                while fallback and byte not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(byte, 0)
+                self.fail[following] = target if target != following else 0
+                self.output[following] += self.output[self.fail[following]]
+        self.anchor = os.path.commonprefix(self.patterns) if self.patterns else b""
+
+    def scan(self, buffer):
+        """Yield (offset, pattern index) for every match in buffer (bytes or mmap)."""
+        if not self.patterns:
+            return
+        goto, fail, output, patterns = self.goto, self.fail, self.output, self.patterns
+        anchor = self.anchor or None
+        size = len(buffer)
+        position = buffer.find(anchor) if anchor else 0
+        while 0 <= position < size:
+            state = 0
+            while position < size:
+                byte = buffer[position]
+                while state and byte not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(byte, 0)
+                position += 1
+                for index in output[state]:
+                    yield position - len(patterns[index]), index
+                if state == 0 and anchor:
+                    break
+            if anchor:
+                position = buffer.find(anchor, position)
+
+
+_AUTOMATA = {}
+
+
+def _automaton(patterns):
+    automaton = _AUTOMATA.get(patterns)
+    if automaton is None:
+        automaton = _AUTOMATA[patterns] = Automaton(patterns)
+    return automaton
+
+
+def scan_file(path, automaton):
+    """Return ([(line, column, pattern index)], bytes scanned) for one file."""
+    try:
+        with open(path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size == 0:
+                return [], 0
+            if size < MMAP_THRESHOLD:
+                buffer = handle.read()
+            else:
+                buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError:
+        return [], 0
+    try:
+        matches = []
+        line, counted = 1, 0
+        for offset, index in automaton.scan(buffer):
+            line += buffer[counted:offset].count(b"\n")
+            counted = offset
+            line_start = buffer.rfind(b"\n", 0, offset) + 1
+            matches.append((line, offset - line_start + 1, index))
+        return matches, size
+    finally:
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
+
+
+def _scan_batch(patterns, repos, files):
+    automaton = _automaton(patterns)
+    findings = []
+    scanned = total = 0
+    with span("placeholders.scan_batch", "scan", repos=len(repos)):
+        for repo in repos:
+            for name in files:
+                matches, size = scan_file(os.path.join(repo, name), automaton)
+                if size:
+                    scanned += 1
+                    total += size
+                for line, column, index in matches:
+                    findings.append((repo, name, line, column, index))
+    return findings, scanned, total
+
+
+def lint(repos, patterns=None, files=TARGET_FILES, workers=None):
+    """Scan files in every repo for unfilled placeholders; returns the report dictionary."""
+    names = tuple(patterns or vocabulary())
+    encoded = tuple(f"{{{{{name}}}}}".encode("utf-8") for name in names)
+    repos = [os.fspath(repo) for repo in repos]
+    workers = workers or os.cpu_count() or 1
+    batches = [repos[index:index + BATCH_SIZE] for index in range(0, len(repos), BATCH_SIZE)]
+    start = time.perf_counter()
+    if workers == 1 or len(repos) < PARALLEL_THRESHOLD:
+        results = [_scan_batch(encoded, batch, files) for batch in batches]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_scan_batch, [encoded] * len(batches), batches,
+                                    [files] * len(batches)))
+    seconds = time.perf_counter() - start
+
+    findings = []
+    counts = {}
+    scanned = total = 0
+    for batch_findings, batch_scanned, batch_bytes in results:
+        scanned += batch_scanned
+        total += batch_bytes
+        for repo, name, line, column, index in batch_findings:
+            placeholder = names[index]
+            counts[placeholder] = counts.get(placeholder, 0) + 1
+            findings.append({"repo": repo, "file": name, "line": line, "column": column,
+                             "placeholder": placeholder})
+    return {
+        "vocabulary": len(names),
+        "repos": len(repos),
+        "files": scanned,
+        "bytes": total,
+        "seconds": round(seconds, 4),
+        "repos_with_findings": len({finding["repo"] for finding in findings}),
+        "by_placeholder": dict(sorted(counts.items(), key=lambda item: (-item[1], item[0]))),
+        "findings": findings,
+    }
+
+
+def fleet_repos(directories):
+    """Immediate subdirectories of each directory, treated as one repository each."""
+    repos = []
+    for directory in directories:
+        with os.scandir(directory) as entries:
+            repos.extend(sorted(entry.path for entry in entries
+                                if entry.is_dir(follow_symlinks=False)
+                                and not entry.name.startswith(".")))
+    return repos
+
+
+def format_report(report, limit=20):
+    lines = [f"  {report['repos']} repositories, {report['files']} files, "
+             f"{report['bytes'] / 1e6:.1f} MB in {report['seconds'] * 1e3:.0f}ms "
+             f"({report['vocabulary']} known placeholders)"]
+    if not report["findings"]:
+        lines.append("✅ No unfilled placeholders")
+        return "\n".join(lines)
+    lines.append(f"⚠️  {len(report['findings'])} unfilled placeholders in "
+                 f"{report['repos_with_findings']} repositories")
+    for name, count in list(report["by_placeholder"].items())[:limit]:
+        lines.append(f"   {count:6d}  {{{{{name}}}}}")
+    for finding in report["findings"][:limit]:
+        lines.append(f"   {os.path.join(finding['repo'], finding['file'])}:"
+                     f"{finding['line']}:{finding['column']}  {{{{{finding['placeholder']}}}}}")
+    if len(report["findings"]) > limit:
+        lines.append(f"   ... and {len(report['findings']) - limit} more")
+    return "\n".join(lines)
+
+
+def generate_fleet(directory, count, leftover_every=10):
+    """Create count synthetic generated repositories; every leftover_every-th keeps placeholders."""
+    from template_renderer import render_template
+
+    names = vocabulary()
+    for number in range(count):
+        repo = Path(directory) / f"repo-{number:05d}"
+        repo.mkdir(parents=True, exist_ok=True)
+        values = {name: f"value {number} for {name.lower()}" for name in names}
+        if number % leftover_every == 0:
+            values.pop("BADGES", None)
+            values.pop("ROADMAP", None)
+        for template, output in (("README", "README.md"), ("CLAUDE", "CLAUDE.md"),
+                                 ("CONTRIBUTING", "CONTRIBUTING.md"), ("ENV", ".env.example"),
+                                 ("GITIGNORE", ".gitignore")):
+            (repo / output).write_text(render_template(template, values), encoding="utf-8")
+
+
+def run_benchmark(count, workers=None):
+    import shutil
+    import tempfile
+
+    workdir = tempfile.mkdtemp()
+    try:
+        generate_fleet(workdir, count)
+        report = lint(fleet_repos([workdir]), workers=workers)
+    finally:
+        shutil.rmtree(workdir)
+    seconds = report["seconds"]
+    print(f"📊 Benchmark: {report['repos']} repositories, {report['files']} files, "
+          f"{report['bytes'] / 1e6:.1f} MB")
+    print(f"   Sweep    : {seconds * 1e3:8.1f} ms ({report['files'] / seconds:,.0f} files/s, "
+          f"{report['bytes'] / 1e6 / seconds:,.1f} MB/s)")
+    print(f"   Findings : {len(report['findings'])} in {report['repos_with_findings']} repositories")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find unfilled template placeholders.")
+    parser.add_argument("repos", nargs="*", help="repository roots (default: cwd)")
+    parser.add_argument("--fleet", metavar="DIR", action="append", default=[],
+                        help="treat every subdirectory of DIR as a repository (repeatable)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--benchmark", type=int, metavar="N",
+                        help="sweep N synthetic generated repositories")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        run_benchmark(args.benchmark, args.workers)
+        return 0
+
+    repos = list(args.repos)
+    for directory in args.fleet:
+        if not Path(directory).is_dir():
+            print(f"❌ Error: Directory not found at {directory}")
+            return 1
+        repos.extend(fleet_repos([directory]))
+    if not repos and not args.fleet:
+        repos = ["."]
+
+    report = lint(repos, workers=args.workers)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print("🧩 Placeholder Linter")
+        print("=" * 50)
+        print(format_report(report))
+    return 1 if report["findings"] else 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Project Analysis Index
+Maintains an incremental SQLite index of project files and derived facts shared by all tools.
+"""
+
+import argparse
+import os
+import time
+from collections import Counter, namedtuple
+from pathlib import Path
+
+from tracing import span
+
+CACHE_DIR_NAME = ".toolkit"
+INDEX_FILE_NAME = "index.sqlite"
+SCHEMA_VERSION = "1"
+
+# Directories that are never part of the project's own sources.
+PRUNE_DIRS = frozenset({
+    ".git", ".hg", ".svn", CACHE_DIR_NAME,
+    "node_modules", "bower_components", "vendor",
+    "__pycache__", ".venv", "venv", ".tox", ".nox",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache",
+    "dist", "build", "target", ".next", ".gradle", ".idea",
+})
+
+LANGUAGE_BY_EXTENSION = {
+    ".py": "Python", ".pyi": "Python",
+    ".js": "JavaScript", ".mjs": "JavaScript", ".cjs": "JavaScript", ".jsx": "JavaScript",
+    ".ts": "TypeScript", ".tsx": "TypeScript",
+    ".go": "Go", ".rs": "Rust", ".java": "Java", ".kt": "Kotlin",
+    ".rb": "Ruby", ".php": "PHP", ".cs": "C#", ".swift": "Swift",
+    ".c": "C", ".h": "C", ".cpp": "C++", ".cc": "C++", ".hpp": "C++",
+    ".sh": "Shell", ".bash": "Shell", ".zsh": "Shell",
+    ".html": "HTML", ".css": "CSS", ".scss": "CSS", ".vue": "Vue", ".svelte": "Svelte",
+    ".md": "Markdown", ".rst": "reStructuredText",
+    ".json": "JSON", ".yml": "YAML", ".yaml": "YAML", ".toml": "TOML",
+    ".sql": "SQL",
+}
+
+MANIFEST_NAMES = frozenset({
+    "package.json", "pyproject.toml", "setup.py", "setup.cfg", "requirements.txt",
+    "Pipfile", "Cargo.toml", "go.mod", "pom.xml", "build.gradle", "build.gradle.kts",
+    "Gemfile", "composer.json", "Makefile", "justfile", "Dockerfile",
+    "docker-compose.yml", "tox.ini", "noxfile.py",
+})
+
+HASH_CHUNK = 1 << 20
+
+IndexStats = namedtuple("IndexStats", "files added changed removed seconds")
+
+
+def cache_dir(root):
+    """Return (and create) the per-project cache directory."""
+    path = Path(root) / CACHE_DIR_NAME
+    path.mkdir(exist_ok=True)
+    return path
+
+
+def iter_project_files(root, prune=PRUNE_DIRS, gitignore=False, symlinks=False):
+    """Yield (relative_path, os.stat_result) for every file, pruning PRUNE_DIRS.
+
+    With gitignore=True, paths matched by the project's .gitignore files are
+    skipped too and ignored directories are never entered. With
+    symlinks=True, symbolic links (to files or directories) are yielded as
+    well, with their lstat() result; they are never followed.
+    """
+    root = os.fspath(root)
+    if gitignore:
+        from gitignore_rules import IgnoreStack
+        stack = [("", IgnoreStack.for_root(root))]
+    else:
+        stack = [("", None)]
+    while stack:
+        relative_dir, ignores = stack.pop()
+        try:
+            with os.scandir(os.path.join(root, relative_dir)) as entries:
+                for entry in entries:
+                    relative = f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name in prune:
+                            continue
+                        if ignores is not None:
+                            if ignores.is_ignored(relative, True):
+                                continue
+                            stack.append((relative, ignores.descend(root, relative)))
+                        else:
+                            stack.append((relative, None))
+                    elif entry.is_file(follow_symlinks=False) or (symlinks and entry.is_symlink()):
+                        if ignores is not None and ignores.is_ignored(relative, False):
+                            continue
+                        yield relative, entry.stat(follow_symlinks=False)
+        except (PermissionError, FileNotFoundError):
+            continue
+
+
+def hash_file(path):
+    import hashlib  # deferred: only content hashing needs it, most imports never hash
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def classify(relative_path):
+    """Derive (language, kind) facts from a relative path."""
+    name = relative_path.rsplit("/", 1)[-1]
+    language = LANGUAGE_BY_EXTENSION.get(os.path.splitext(name)[1].lower())
+    lowered = relative_path.lower()
+    if name in MANIFEST_NAMES or name.startswith("requirements"):
+        kind = "manifest"
+    elif ("test" in name.lower() or lowered.startswith(("test/", "tests/"))
+          or "/tests/" in lowered or "/test/" in lowered or "__tests__" in lowered):
+        kind = "test"
+    elif lowered.startswith("docs/") or language in ("Markdown", "reStructuredText"):
+        kind = "doc"
+    elif language in ("JSON", "YAML", "TOML") or name.startswith("."):
+        kind = "config"
+    else:
+        kind = "source"
+    return language, kind
+
+
+class ProjectIndex:
+    """Incremental file index stored in <project>/.toolkit/index.sqlite."""
+
+    def __init__(self, root):
+        import sqlite3  # deferred so that walk-only users skip the import
+
+        self.root = Path(root).resolve()
+        self.path = cache_dir(self.root) / INDEX_FILE_NAME
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                hash TEXT NOT NULL,
+                language TEXT,
+                kind TEXT NOT NULL
+            );
+        """)
+        version = self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'schema'").fetchone()
+        if version is None or version[0] != SCHEMA_VERSION:
+            self.conn.execute("DELETE FROM files")
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('schema', ?)", (SCHEMA_VERSION,))
+            self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def update(self):
+        """Stat every file and re-hash only the ones whose mtime or size changed.
+
+        This is still one stat per file: editing a file in place does not
+        touch its directory's mtime, so no subtree can be skipped safely.
+        Callers that know what changed, like the daemon's watcher, should
+        use update_paths() instead.
+        """
+        start = time.perf_counter()
+        known = {path: (mtime, size) for path, mtime, size
+                 in self.conn.execute("SELECT path, mtime_ns, size FROM files")}
+        upserts = []
+        added = changed = seen = 0
+        with span("index.walk", "index", root=str(self.root)):
+            for relative, stat in iter_project_files(self.root):
+                seen += 1
+                previous = known.pop(relative, None)
+                if previous == (stat.st_mtime_ns, stat.st_size):
+                    continue
+                try:
+                    digest = hash_file(self.root / relative)
+                except OSError:
+                    continue
+                if previous is None:
+                    added += 1
+                else:
+                    changed += 1
+                upserts.append((relative, stat.st_mtime_ns, stat.st_size, digest)
+                               + classify(relative))
+
+        # Whatever is still in `known` was not seen on disk any more.
+        with span("index.write", "index", upserts=len(upserts)), self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)", upserts)
+            self.conn.executemany(
+                "DELETE FROM files WHERE path = ?", ((path,) for path in known))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('updated', ?)", (str(time.time()),))
+            if upserts or known:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('generation', ?)",
+                    (str(self.generation() + 1),))
+        return IndexStats(seen, added, changed, len(known), time.perf_counter() - start)
+
+    def update_paths(self, paths):
+        """Refresh only the given relative paths, e.g. those a file watcher reported.
+
+        A path may name a file or a directory; missing paths drop every
+        entry at or below them. Paths inside PRUNE_DIRS are ignored.
+        """
+        start = time.perf_counter()
+        upserts = []
+        removed = []
+        added = changed = seen = 0
+        for path in sorted(set(paths)):
+            if not path or any(part in PRUNE_DIRS for part in path.split("/")):
+                continue
+            full = self.root / path
+            if full.is_dir():
+                found = ((f"{path}/{relative}", stat) for relative, stat in iter_project_files(full))
+            elif full.is_file():
+                found = [(path, full.stat())]
+            else:
+                removed.append(path)
+                continue
+            for relative, stat in found:
+                seen += 1
+                previous = self.conn.execute("SELECT mtime_ns, size FROM files WHERE path = ?",
+                                             (relative,)).fetchone()
+                if previous == (stat.st_mtime_ns, stat.st_size):
+                    continue
+                try:
+                    digest = hash_file(self.root / relative)
+                except OSError:
+                    continue
+                if previous is None:
+                    added += 1
+                else:
+                    changed += 1
+                upserts.append((relative, stat.st_mtime_ns, stat.st_size, digest)
+                               + classify(relative))
+
+        with self.conn:
+            deleted = 0
+            for path in removed:
+                deleted += self.conn.execute(
+                    "DELETE FROM files WHERE path = ? OR substr(path, 1, ?) = ?",
+                    (path, len(path) + 1, path + "/")).rowcount
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)", upserts)
+            if upserts or deleted:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('generation', ?)",
+                    (str(self.generation() + 1),))
+        return IndexStats(seen, added, changed, deleted, time.perf_counter() - start)
+
+    def generation(self):
+        """Counter bumped by every update that changed the index; keys derived caches."""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return int(row[0]) if row else 0
+
+    def files(self, kind=None):
+        """Yield (path, size, hash, language, kind) rows, optionally filtered by kind."""
+        query = "SELECT path, size, hash, language, kind FROM files"
+        if kind:
+            yield from self.conn.execute(query + " WHERE kind = ? ORDER BY path", (kind,))
+        else:
+            yield from self.conn.execute(query + " ORDER BY path")
+
+    def summary(self):
+        """Return the derived project facts the setup tools ask for."""
+        languages = Counter()
+        kinds = Counter()
+        top_level = Counter()
+        total_bytes = 0
+        for path, size, language, kind in self.conn.execute(
+                "SELECT path, size, language, kind FROM files"):
+            total_bytes += size
+            kinds[kind] += 1
+            if language:
+                languages[language] += 1
+            if "/" in path:
+                top_level[path.split("/", 1)[0] + "/"] += 1
+        manifests = [row[0] for row in self.conn.execute(
+            "SELECT path FROM files WHERE kind = 'manifest' ORDER BY path")]
+        return {
+            "files": sum(kinds.values()),
+            "bytes": total_bytes,
+            "languages": dict(languages.most_common()),
+            "kinds": dict(kinds),
+            "manifests": manifests,
+            "top_level_dirs": dict(top_level.most_common()),
+        }
+
+
+def format_summary(summary, limit=10):
+    """Render a summary dict as indented text for tool output."""
+    lines = [f"  Files: {summary['files']} ({summary['bytes'] / 1e6:.1f} MB)"]
+    languages = ", ".join(f"{name} ({count})" for name, count
+                          in list(summary["languages"].items())[:limit])
+    lines.append(f"  Languages: {languages or 'none detected'}")
+    manifests = summary["manifests"]
+    shown = ", ".join(manifests[:limit]) + (" ..." if len(manifests) > limit else "")
+    lines.append(f"  Manifests: {shown or 'none'}")
+    lines.append(f"  Test files: {summary['kinds'].get('test', 0)}")
+    dirs = ", ".join(list(summary["top_level_dirs"])[:limit])
+    lines.append(f"  Top-level directories: {dirs or 'none'}")
+    return "\n".join(lines)
+
+
+def analyze_project(root="."):
+    """Update the index for root and return its summary text.
+
+    A running analysis daemon answers from its warm index instead.
+    """
+    from daemon_client import request
+
+    warm = request(root, "analyze")
+    if warm is not None:
+        return warm
+    with ProjectIndex(root) as index:
+        index.update()
+        return format_summary(index.summary())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Update and summarize the project index.")
+    parser.add_argument("project", nargs="?", default=".", help="project directory")
+    parser.add_argument("--rebuild", action="store_true", help="discard the index first")
+    args = parser.parse_args(argv)
+
+    if not Path(args.project).is_dir():
+        print(f"❌ Error: Project directory not found at {args.project}")
+        return 1
+
+    if args.rebuild:
+        (Path(args.project) / CACHE_DIR_NAME / INDEX_FILE_NAME).unlink(missing_ok=True)
+
+    print("🗂️  Project Analysis Index")
+    print("=" * 50)
+    with ProjectIndex(args.project) as index:
+        stats = index.update()
+        print(f"Indexed {stats.files} files in {stats.seconds * 1e3:.1f}ms "
+              f"({stats.added} added, {stats.changed} changed, {stats.removed} removed)")
+        print(f"Index location: {index.path}\n")
+        print(format_summary(index.summary()))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Secret Scanner
+Finds secret-bearing files with key-format patterns and an entropy check, and suggests ignores and env placeholders.
+"""
+
+import argparse
+import json
+import math
+import mmap
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+from pathlib import Path
+
+from project_index import iter_project_files
+from tracing import span
+
+SecretFinding = namedtuple("SecretFinding", "rule path line preview env_name")
+
+MAX_FILE_BYTES = 8 * 1024 * 1024
+# Credential keywords are searched in lowercased windows of this size, so that a
+# mapped file is never copied whole; windows overlap by more than the longest keyword.
+KEYWORD_WINDOW = 1024 * 1024
+KEYWORD_OVERLAP = 16
+# Below this size a plain read is cheaper than setting up a mapping.
+MMAP_THRESHOLD = 64 * 1024
+BINARY_SNIFF_BYTES = 8192
+BATCH_SIZE = 256
+ENTROPY_THRESHOLD = 3.5
+HIGH_ENTROPY_THRESHOLD = 4.5
+
+# Skipped without being opened: media, archives, fonts and compiled output.
+BINARY_EXTENSIONS = frozenset({
+    ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".ico", ".webp", ".tif", ".tiff", ".psd",
+    ".mp3", ".mp4", ".mov", ".avi", ".mkv", ".wav", ".flac", ".ogg", ".webm",
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".tar", ".jar", ".war", ".whl",
+    ".woff", ".woff2", ".ttf", ".otf", ".eot", ".pdf",
+    ".so", ".dll", ".dylib", ".exe", ".o", ".a", ".class", ".pyc", ".wasm", ".bin",
+    ".sqlite", ".db", ".parquet", ".npy", ".pt", ".onnx", ".h5",
+})
+
+# Lockfiles are full of integrity hashes that look random but are not secrets.
+LOCKFILE_NAMES = frozenset({
+    "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock", "uv.lock",
+    "Cargo.lock", "go.sum", "Gemfile.lock", "composer.lock", "Pipfile.lock",
+})
+
+# Files whose name alone marks them as credentials: (glob, file name pattern).
+SECRET_FILES = [
+    (".env", re.compile(r"^\.env(?:\.(?!example$|sample$|template$|dist$)[\w.-]+)?$")),
+    ("*.pem", re.compile(r"\.pem$")),
+    ("*.key", re.compile(r"\.key$")),
+    ("*.p12", re.compile(r"\.(?:p12|pfx)$")),
+    ("*.keystore", re.compile(r"\.(?:keystore|jks)$")),
+    ("id_rsa*", re.compile(r"^id_(?:rsa|dsa|ecdsa|ed25519)(?:\.pub)?$")),
+    ("credentials.json", re.compile(r"^credentials\.json$")),
+    ("service-account*.json", re.compile(r"^service[-_]account.*\.json$")),
+    (".npmrc", re.compile(r"^\.npmrc$")),
+    (".pypirc", re.compile(r"^\.pypirc$")),
+    ("*.tfvars", re.compile(r"\.tfvars$")),
+]
+# What a committed .env.example needs next to the .env rule.
+DOTENV_IGNORES = (".env", ".env.*", "!.env.example")
+
+# rule -> (literal that must occur in the file, pattern, env var the value belongs in)
+KEY_PATTERNS = {
+    "aws_access_key": (b"IA", re.compile(rb"\b(?:AKIA|ASIA)[0-9A-Z]{16}\b"), "AWS_ACCESS_KEY_ID"),
+    "github_token": (b"gh", re.compile(rb"\bgh[pousr]_[A-Za-z0-9]{36,}\b"), "GITHUB_TOKEN"),
+    "slack_token": (b"xox", re.compile(rb"\bxox[abprs]-[A-Za-z0-9-]{10,}"), "SLACK_TOKEN"),
+    "stripe_key": (b"_live_", re.compile(rb"\b[rs]k_live_[0-9A-Za-z]{24,}"), "STRIPE_SECRET_KEY"),
+    "google_api_key": (b"AIza", re.compile(rb"\bAIza[0-9A-Za-z_-]{35}"), "GOOGLE_API_KEY"),
+    "api_secret_key": (b"sk-", re.compile(rb"\bsk-(?:[a-z]+-)?[A-Za-z0-9_-]{32,}"), "API_SECRET_KEY"),
+    "private_key": (b"PRIVATE KEY",
+                    re.compile(rb"-----BEGIN (?:RSA |EC |DSA |OPENSSH |PGP |ENCRYPTED )?PRIVATE KEY"),
+                    None),
+    "jwt": (b"eyJ", re.compile(rb"\beyJ[A-Za-z0-9_-]{10,}\.eyJ[A-Za-z0-9_-]{10,}\.[A-Za-z0-9_-]{10,}"),
+            "JWT_TOKEN"),
+    "url_password": (b"://", re.compile(rb"\b[a-z][a-z0-9+.-]*://[^/\s:@'\"]+:([^/\s:@'\"]{6,})@"),
+                     "DATABASE_URL"),
+}
+
+# NAME = value where the name says credential; the value must also look random. The
+# keywords are searched in a lowercased copy: a case-insensitive pattern is ten times slower.
+CREDENTIAL_KEYWORD = re.compile(rb"secret|token|passw|api_?key|access_?key|private_?key|auth")
+ASSIGNED_VALUE = re.compile(rb"[A-Za-z0-9_]*['\"]?\s*[:=]\s*['\"]?([A-Za-z0-9+/=_.~-]{16,})")
+NAME_BYTES = frozenset(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_.-")
+# Long quoted strings in config files, reported on entropy alone.
+QUOTED = re.compile(rb"[:=]\s*['\"]([A-Za-z0-9+/=_-]{32,})['\"]")
+CONFIG_EXTENSIONS = frozenset({".json", ".yml", ".yaml", ".toml", ".ini", ".cfg", ".conf",
+                               ".properties", ".xml", ".tfvars"})
+PLACEHOLDER_VALUE = re.compile(
+    rb"(?i)example|change.?me|your[_-]|xxxx|dummy|placeholder|redacted|sample|\$\{|\{\{|<[^>]*>"
+    rb"|^(?:pass(?:word)?|passwd|pwd|secret|admin|root|test|postgres|mysql)$")
+
+
+def shannon_entropy(data):
+    """Bits per byte of data."""
+    if not data:
+        return 0.0
+    counts = {}
+    for byte in data:
+        counts[byte] = counts.get(byte, 0) + 1
+    length = len(data)
+    return -sum(count / length * math.log2(count / length) for count in counts.values())
+
+
+def secret_file_glob(relative):
+    """The ignore glob for a file whose name marks it as a credential, or None."""
+    name = relative.rsplit("/", 1)[-1]
+    for glob, pattern in SECRET_FILES:
+        if pattern.search(name):
+            return glob
+    return None
+
+
+def _looks_random(value, threshold=ENTROPY_THRESHOLD):
+    return (not PLACEHOLDER_VALUE.search(value)
+            and re.search(rb"[0-9]", value) is not None
+            and re.search(rb"[A-Za-z]", value) is not None
+            and shannon_entropy(value) >= threshold)
+
+
+def _preview(value):
+    text = value.decode("utf-8", errors="replace")
+    return f"{text[:4]}…({len(value)} chars)"
+
+
+def _env_name(name):
+    name = re.sub(r"[^A-Z0-9]+", "_", name.decode("utf-8", errors="replace").upper()).strip("_")
+    return name or None
+
+
+def _keyword_matches(buffer):
+    """Yield CREDENTIAL_KEYWORD matches as (start, end) offsets into buffer."""
+    for base in range(0, len(buffer), KEYWORD_WINDOW):
+        window = buffer[base:base + KEYWORD_WINDOW + KEYWORD_OVERLAP].lower()
+        for keyword in CREDENTIAL_KEYWORD.finditer(window):
+            if keyword.start() >= KEYWORD_WINDOW:
+                break
+            yield base + keyword.start(), base + keyword.end()
+
+
+def _rule_rank(rule):
+    """Lower is more specific: key formats, then credential assignments, then entropy."""
+    if rule in KEY_PATTERNS:
+        return 0
+    return 1 if rule == "credential_assignment" else 2
+
+
+def scan_buffer(buffer, relative):
+    """Return [(offset, rule, preview, env name)] for one file's bytes (bytes or mmap)."""
+    found = []
+    for rule, (required, pattern, env_name) in KEY_PATTERNS.items():
+        if buffer.find(required) == -1:
+            continue
+        for match in pattern.finditer(buffer):
+            value = match.group(match.lastindex or 0)
+            if rule == "url_password" and PLACEHOLDER_VALUE.search(value):
+                continue
+            found.append((match.start(), rule, _preview(value), env_name))
+    for keyword_start, keyword_end in _keyword_matches(buffer):
+        match = ASSIGNED_VALUE.match(buffer, keyword_end)
+        if match is None or not _looks_random(match.group(1)):
+            continue
+        start = keyword_start
+        while start and buffer[start - 1] in NAME_BYTES:
+            start -= 1
+        found.append((start, "credential_assignment", _preview(match.group(1)),
+                      _env_name(buffer[start:match.start(1)].split(b"=")[0].split(b":")[0])))
+    if os.path.splitext(relative)[1].lower() in CONFIG_EXTENSIONS:
+        for match in QUOTED.finditer(buffer):
+            value = match.group(1)
+            if _looks_random(value, HIGH_ENTROPY_THRESHOLD):
+                found.append((match.start(1), "high_entropy_string", _preview(value), None))
+    found.sort(key=lambda item: item[0])
+    return found
+
+
+def scan_file(root, relative, max_bytes=MAX_FILE_BYTES):
+    """Return ([SecretFinding], status, bytes scanned); status is scanned, binary or large."""
+    findings = []
+    glob = secret_file_glob(relative)
+    if glob:
+        findings.append(SecretFinding("secret_file", relative, 0, glob, None))
+    name = relative.rsplit("/", 1)[-1]
+    if os.path.splitext(name)[1].lower() in BINARY_EXTENSIONS:
+        return findings, "binary", 0
+    if name in LOCKFILE_NAMES:
+        return findings, "scanned", 0
+    try:
+        with open(os.path.join(root, relative), "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size > max_bytes:
+                return findings, "large", 0
+            if size == 0:
+                return findings, "scanned", 0
+            if size < MMAP_THRESHOLD:
+                buffer = handle.read()
+            else:
+                buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError:
+        return findings, "scanned", 0
+    try:
+        if buffer.find(b"\0", 0, BINARY_SNIFF_BYTES) != -1:
+            return findings, "binary", 0
+        # A credential assignment and a key pattern often hit the same line: keep the
+        # most specific rule, wherever on the line each one matched.
+        by_line = {}
+        line, counted = 1, 0
+        for offset, rule, preview, env_name in scan_buffer(buffer, relative):
+            line += buffer[counted:offset].count(b"\n")
+            counted = offset
+            kept = by_line.get(line)
+            if kept is None or _rule_rank(rule) < _rule_rank(kept.rule):
+                by_line[line] = SecretFinding(rule, relative, line, preview, env_name)
+        findings.extend(by_line.values())
+        return findings, "scanned", size
+    finally:
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
+
+
+def _scan_batch(root, batch, max_bytes):
+    findings = []
+    counts = {"scanned": 0, "binary": 0, "large": 0, "bytes": 0}
+    with span("secrets.scan_batch", "scan", files=len(batch)):
+        for relative in batch:
+            file_findings, status, size = scan_file(root, relative, max_bytes)
+            findings.extend(file_findings)
+            counts[status] += 1
+            counts["bytes"] += size
+    return findings, counts
+
+
+def _batches(root):
+    batch = []
+    for relative, _stat in iter_project_files(root, gitignore=True):
+        batch.append(relative)
+        if len(batch) == BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def scan_project(root=".", workers=None, max_bytes=MAX_FILE_BYTES):
+    """Return ([SecretFinding], counts) for the files .gitignore does not already exclude.
+
+    Batches run in a process pool with a few in flight per worker, as in
+    env_scanner.py.
+    """
+    root = os.fspath(root)
+    workers = workers or os.cpu_count() or 1
+    findings = []
+    counts = {"scanned": 0, "binary": 0, "large": 0, "bytes": 0}
+
+    def merge(result):
+        findings.extend(result[0])
+        for key, value in result[1].items():
+            counts[key] += value
+
+    batches = _batches(root)
+    if workers == 1:
+        for batch in batches:
+            merge(_scan_batch(root, batch, max_bytes))
+    else:
+        from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight = set()
+            exhausted = False
+            while True:
+                while not exhausted and len(in_flight) < workers * 2:
+                    batch = next(batches, None)
+                    if batch is None:
+                        exhausted = True
+                    else:
+                        in_flight.add(pool.submit(_scan_batch, root, batch, max_bytes))
+                if not in_flight:
+                    break
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    merge(future.result())
+    findings.sort(key=lambda finding: (finding.path, finding.line))
+    return findings, counts
+
+
+def suggestions(findings):
+    """Return (ignore patterns, {env name: [locations]}) for a list of findings.
+
+    Credential files get an ignore pattern. Secrets inside other files
+    belong in the environment, so they become .env.example entries instead.
+    """
+    ignores = []
+    env = {}
+    for finding in findings:
+        if finding.rule == "secret_file":
+            patterns = DOTENV_IGNORES if finding.preview == ".env" else (finding.preview,)
+            ignores.extend(pattern for pattern in patterns if pattern not in ignores)
+            continue
+        if secret_file_glob(finding.path):
+            continue
+        name = finding.env_name or "SECRET_VALUE"
+        env.setdefault(name, []).append(f"{finding.path}:{finding.line}")
+    return ignores, dict(sorted(env.items()))
+
+
+def template_values(findings):
+    """GITIGNORE_template.md's SECURITY_IGNORES value for template_renderer.py."""
+    ignores, _env = suggestions(findings)
+    return {"SECURITY_IGNORES": "\n".join(ignores) if ignores else "# None detected"}
+
+
+def format_report(findings, counts, seconds, limit=30):
+    megabytes = counts["bytes"] / 1e6
+    lines = [f"  {counts['scanned']} files scanned ({megabytes:.1f} MB in {seconds:.2f}s, "
+             f"{megabytes / max(seconds, 1e-9):.1f} MB/s); skipped {counts['binary']} binary "
+             f"and {counts['large']} over the size cap"]
+    if not findings:
+        lines.append("✅ No secrets found")
+        return "\n".join(lines)
+    lines.append(f"⚠️  {len(findings)} findings")
+    for finding in findings[:limit]:
+        where = finding.path if finding.rule == "secret_file" else f"{finding.path}:{finding.line}"
+        lines.append(f"   {finding.rule:<22} {where}  {finding.preview}")
+    if len(findings) > limit:
+        lines.append(f"   ... and {len(findings) - limit} more")
+    ignores, env = suggestions(findings)
+    if ignores:
+        lines.append("\nSuggested .gitignore security patterns:")
+        lines.extend(f"   {pattern}" for pattern in ignores)
+    if env:
+        lines.append("\nSuggested .env.example placeholders (move the values out of the code):")
+        for name, locations in env.items():
+            lines.append(f"   {name}=  # found in {', '.join(locations[:3])}")
+    return "\n".join(lines)
+
+
+def generate_tree(directory, megabytes):
+    """A synthetic tree of about megabytes MB: text sources, binary assets and a few secrets."""
+    import random
+
+    rng = random.Random(7)
+    directory = Path(directory)
+    (directory / "src").mkdir(parents=True, exist_ok=True)
+    (directory / "assets").mkdir(exist_ok=True)
+    # Planted values are generated so that this file does not trip its own scan.
+    alphabet = b"ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz23456789"
+    secret = bytes(rng.choice(alphabet) for _ in range(32))
+    line = b"def handler(request):\n    return render(request, 'page.html', {'items': items})\n"
+    target = megabytes * 1024 * 1024
+    written = number = 0
+    while written < target:
+        if number % 4 == 3:
+            data = bytes([0]) + rng.randbytes(1024 * 1024 - 1)
+            path = directory / "assets" / f"blob{number}.dat"
+        else:
+            data = line * (256 * 1024 // len(line))
+            if number % 50 == 0:
+                data += b"API_KEY = '" + secret + b"'\n"
+            path = directory / "src" / f"module{number}.py"
+        path.write_bytes(data)
+        written += len(data)
+        number += 1
+    (directory / ".env").write_bytes(b"DATABASE_URL=postgres://app:" + secret[:12] + b"@db/app\n")
+
+
+def run_benchmark(megabytes, workers=None, max_bytes=MAX_FILE_BYTES):
+    import shutil
+    import tempfile
+
+    workdir = tempfile.mkdtemp()
+    try:
+        generate_tree(workdir, megabytes)
+        results = []
+        for count in sorted({1, workers or os.cpu_count() or 1}):
+            start = time.perf_counter()
+            findings, counts = scan_project(workdir, count, max_bytes)
+            results.append((count, time.perf_counter() - start, findings, counts))
+    finally:
+        shutil.rmtree(workdir)
+    print(f"📊 Benchmark: {megabytes} MB synthetic tree "
+          f"({results[0][3]['scanned']} text files, {results[0][3]['binary']} binary)")
+    for count, seconds, findings, counts in results:
+        print(f"   {count} worker{'s' if count > 1 else ' '}: {seconds * 1e3:8.1f} ms "
+              f"({megabytes / seconds:,.1f} MB/s on disk, "
+              f"{counts['bytes'] / 1e6 / seconds:,.1f} MB/s of text), {len(findings)} findings")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find secrets in a project before they are committed.")
+    parser.add_argument("project", nargs="?", default=".", help="project directory")
+    parser.add_argument("--workers", type=int, default=None, help="scanner processes")
+    parser.add_argument("--max-bytes", type=int, default=MAX_FILE_BYTES,
+                        help=f"skip files larger than this (default: {MAX_FILE_BYTES})")
+    parser.add_argument("--json", action="store_true", help="print findings as JSON")
+    parser.add_argument("--values", metavar="FILE",
+                        help="write the SECURITY_IGNORES value for template_renderer.py")
+    parser.add_argument("--benchmark", type=int, metavar="MB",
+                        help="measure throughput on a synthetic tree of MB megabytes")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        run_benchmark(args.benchmark, args.workers, args.max_bytes)
+        return 0
+    if not Path(args.project).is_dir():
+        print(f"❌ Error: Project directory not found at {args.project}")
+        return 1
+
+    start = time.perf_counter()
+    findings, counts = scan_project(args.project, args.workers, args.max_bytes)
+    seconds = time.perf_counter() - start
+    if args.values:
+        Path(args.values).write_text(json.dumps(template_values(findings), indent=2),
+                                     encoding="utf-8")
+        print(f"✅ Wrote SECURITY_IGNORES for {len(findings)} findings to {args.values}",
+              file=sys.stderr)
+    if args.json:
+        ignores, env = suggestions(findings)
+        print(json.dumps({"findings": [finding._asdict() for finding in findings],
+                          "counts": counts, "ignores": ignores, "env": env}, indent=2))
+        return 1 if findings else 0
+
+    print("🕵️  Secret Scanner")
+    print("=" * 50)
+    print(format_report(findings, counts, seconds))
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -4,6 +4,7 @@ CI/CD Setup Tool
 Provides instructions for Claude AI to generate CI/CD pipeline configurations.
 """
 
+import argparse
 from pathlib import Path
 
 CI_PROMPT = """
@@ -42,11 +43,48 @@ Make sure to:
 - Set up proper security scanning
 - Configure appropriate triggers
 - Document required secrets and permissions
+- Split slow test suites into a matrix balanced by measured runtime
+  (`setup_ci.py --shard <junit.xml|durations>` prints a ready-made test job)
+- Cache dependencies keyed on lockfile hashes, with restore-keys fallbacks
+  (`setup_ci.py --cache` prints the cache steps for every detected lockfile)
 
 The goal is a complete CI/CD setup that ensures code quality and reliable deployments.
 """
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CI/CD Pipeline Generator")
+    parser.add_argument("--analyze", metavar="DIR", nargs="?", const=".",
+                        help="include the cached project analysis for DIR (default: cwd)")
+    parser.add_argument("--detect", metavar="DIR", nargs="?", const=".",
+                        help="include the detected languages, frameworks and tools of DIR")
+    parser.add_argument("--shard", metavar="REPORT", nargs="+",
+                        help="plan a sharded test matrix from JUnit XML or pytest durations")
+    parser.add_argument("--target-minutes", type=float,
+                        help="with --shard, wall-clock target for the slowest shard")
+    parser.add_argument("--tests", metavar="DIR",
+                        help="with --shard, also schedule DIR's test files without history")
+    parser.add_argument("--cache", metavar="DIR", nargs="?", const=".",
+                        help="plan dependency cache steps from DIR's lockfiles")
+    parser.add_argument("--history", type=int,
+                        help="with --cache, recent commits used to estimate hit rates")
+    args = parser.parse_args(argv)
+
+    if args.cache:
+        from ci_cache import main as cache_main
+        options = [args.cache]
+        if args.history:
+            options += ["--history", str(args.history)]
+        return cache_main(options)
+
+    if args.shard:
+        from test_sharding import main as sharding_main
+        options = list(args.shard)
+        if args.target_minutes:
+            options += ["--target-minutes", str(args.target_minutes)]
+        if args.tests:
+            options += ["--tests", args.tests]
+        return sharding_main(options)
+
     template_path = Path(__file__).parent.parent / "templates" / "CI_template.md"
     
     if not template_path.exists():
@@ -58,6 +96,14 @@ def main():
     print("\nTo generate CI/CD configuration, provide this prompt to Claude:\n")
     print(CI_PROMPT)
     print("\nTemplate location:", template_path)
+    if args.analyze:
+        from project_index import analyze_project
+        print("\nProject analysis (incremental index):")
+        print(analyze_project(args.analyze))
+    if args.detect:
+        from stack_detect import detect_stack, format_profile
+        print("\nDetected stack (single-pass scan):")
+        print(format_profile(detect_stack(args.detect)))
     print("\n" + "=" * 50)
     print("This tool helps create robust CI/CD pipelines.")
     
@@ -4,6 +4,7 @@ CLAUDE.md Setup Tool
 Provides instructions for Claude AI to generate a project-specific CLAUDE.md file.
 """
 
+import argparse
 from pathlib import Path
 
 CLAUDE_PROMPT = """
@@ -34,18 +35,49 @@ Make sure to:
 The goal is a CLAUDE.md that helps AI assistants understand and work with this specific project effectively.
 """
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CLAUDE.md Generator")
+    parser.add_argument("--analyze", metavar="DIR", nargs="?", const=".",
+                        help="include the cached project analysis for DIR (default: cwd)")
+    parser.add_argument("--context", metavar="TOKENS", type=int,
+                        help="list the most relevant files that fit in TOKENS")
+    parser.add_argument("--commands", metavar="DIR", nargs="?", const=".",
+                        help="list the commands DIR's manifests define, by category")
+    parser.add_argument("--cached", metavar="DIR", nargs="?", const=".",
+                        help="reuse the cached document when DIR's inputs are unchanged")
+    args = parser.parse_args(argv)
+
     template_path = Path(__file__).parent.parent / "templates" / "CLAUDE_template.md"
     
     if not template_path.exists():
         print(f"❌ Error: Template not found at {template_path}")
         return 1
+
+    if args.cached:
+        from doc_cache import report_cached
+        if report_cached("claude_md", args.cached):
+            return 0
     
     print("🤖 CLAUDE.md Generator")
     print("=" * 50)
     print("\nTo generate CLAUDE.md for your project, provide this prompt to Claude:\n")
     print(CLAUDE_PROMPT)
     print("\nTemplate location:", template_path)
+    if args.analyze:
+        from project_index import analyze_project
+        print("\nProject analysis (incremental index):")
+        print(analyze_project(args.analyze))
+    if args.context:
+        from context_packer import format_selection, ranked_for_project, select
+        selection, total = select(ranked_for_project(args.analyze or ".", "claude_md"), args.context)
+        print(f"\nRead these files first ({args.context} token budget):")
+        print(format_selection(selection, total, args.context))
+    if args.commands:
+        from command_catalog import build_catalog, template_values
+        print("\nEssential commands (from the project's manifests):")
+        for slot, value in template_values(build_catalog(args.commands)).items():
+            value = value.replace("\n", "; ")
+            print(f"  {slot}: {value}")
     print("\n" + "=" * 50)
     print("This tool provides instructions for AI-assisted CLAUDE.md generation.")
     
@@ -4,6 +4,7 @@ Contributing Guide Generator
 Provides instructions for Claude AI to create CONTRIBUTING.md files.
 """
 
+import argparse
 from pathlib import Path
 
 CONTRIBUTING_PROMPT = """
@@ -44,18 +45,34 @@ Make sure to:
 The goal is to make contributing as easy as possible.
 """
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Contributing Guide Generator")
+    parser.add_argument("--commands", metavar="DIR", nargs="?", const=".",
+                        help="list the commands DIR's manifests define, by category")
+    parser.add_argument("--cached", metavar="DIR", nargs="?", const=".",
+                        help="reuse the cached document when DIR's inputs are unchanged")
+    args = parser.parse_args(argv)
+
     template_path = Path(__file__).parent.parent / "templates" / "CONTRIBUTING_template.md"
     
     if not template_path.exists():
         print(f"❌ Error: Template not found at {template_path}")
         return 1
+
+    if args.cached:
+        from doc_cache import report_cached
+        if report_cached("contributing", args.cached):
+            return 0
     
     print("🤝 Contributing Guide Generator")
     print("=" * 50)
     print("\nTo generate CONTRIBUTING.md, provide this prompt to Claude:\n")
     print(CONTRIBUTING_PROMPT)
     print("\nTemplate location:", template_path)
+    if args.commands:
+        from command_catalog import build_catalog, format_catalog
+        print("\nCommands contributors will run (from the project's manifests):")
+        print(format_catalog(build_catalog(args.commands)))
     print("\n" + "=" * 50)
     print("This tool helps create welcoming contribution guidelines.")
     
@@ -4,6 +4,7 @@
 Provides instructions for Claude AI to generate project-specific .gitignore files.
 """
 
+import argparse
 from pathlib import Path
 
 GITIGNORE_PROMPT = """
@@ -42,7 +43,50 @@ Make sure to:
 The goal is a .gitignore that prevents accidental commits of unwanted files.
 """
 
-def main():
+# Patterns worth suggesting for each detected language or tool.
+STACK_IGNORES = {
+    "Python": ["__pycache__/", "*.py[cod]", ".venv/", "*.egg-info/", ".pytest_cache/"],
+    "JavaScript": ["node_modules/", "dist/", ".npm/", "*.log"],
+    "TypeScript": ["node_modules/", "dist/", "*.tsbuildinfo"],
+    "Go": ["/bin/", "*.test", "*.out"],
+    "Rust": ["/target/", "**/*.rs.bk"],
+    "Java": ["*.class", "/build/", ".gradle/", "target/"],
+    "Next.js": [".next/", "out/"],
+    "Vite": ["dist/", ".vite/"],
+    "docker": [".docker/"],
+    "pytest": [".pytest_cache/", ".coverage", "htmlcov/"],
+    "jest": ["coverage/"],
+}
+
+
+def suggested_ignores(profile):
+    """Return {source: patterns} for the languages and tools in a StackProfile."""
+    detected = list(profile.languages) + sorted(profile.frameworks | profile.containers
+                                                | profile.test_frameworks)
+    return {name: STACK_IGNORES[name] for name in detected if name in STACK_IGNORES}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=".gitignore Generator")
+    parser.add_argument("--detect", metavar="DIR", nargs="?", const=".",
+                        help="include the detected languages, frameworks and tools of DIR")
+    parser.add_argument("--check", metavar="DIR", nargs="?", const=".",
+                        help="report what DIR/.gitignore matches in the working tree")
+    parser.add_argument("--secrets", metavar="DIR", nargs="?", const=".",
+                        help="suggest security patterns for secret-bearing files found in DIR")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        from gitignore_rules import coverage_report, format_report
+        gitignore = Path(args.check) / ".gitignore"
+        if not gitignore.exists():
+            print(f"❌ Error: .gitignore not found at {gitignore}")
+            return 1
+        print("🚫 .gitignore Coverage Report")
+        print("=" * 50)
+        print(format_report(coverage_report(args.check, gitignore.read_text(encoding="utf-8"))))
+        return 0
+
     template_path = Path(__file__).parent.parent / "templates" / "GITIGNORE_template.md"
     
     if not template_path.exists():
@@ -54,6 +98,20 @@ def main():
     print("\nTo generate .gitignore for your project, provide this prompt to Claude:\n")
     print(GITIGNORE_PROMPT)
     print("\nTemplate location:", template_path)
+    if args.detect:
+        from stack_detect import detect_stack, format_profile
+        profile = detect_stack(args.detect)
+        print("\nDetected stack (single-pass scan):")
+        print(format_profile(profile))
+        print("\nSuggested patterns for the detected stack:")
+        for source, patterns in suggested_ignores(profile).items():
+            print(f"  {source}: {' '.join(patterns)}")
+    if args.secrets:
+        from secret_scan import scan_project, suggestions
+        findings, _counts = scan_project(args.secrets)
+        ignores, _env = suggestions(findings)
+        print(f"\nSecurity patterns for secret-bearing files ({len(findings)} findings):")
+        print(f"  {' '.join(ignores)}" if ignores else "  None detected")
     print("\n" + "=" * 50)
     print("This tool helps create comprehensive .gitignore files.")
     
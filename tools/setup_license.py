@@ -4,6 +4,7 @@ License Selector Tool
 Provides instructions for Claude AI to help select and generate appropriate licenses.
 """
 
+import argparse
 from pathlib import Path
 
 LICENSE_PROMPT = """
@@ -38,14 +39,26 @@ Common recommendations:
 
 Make sure to:
 - Explain the implications of the chosen license
-- Check compatibility with project dependencies
+- Check compatibility with project dependencies (`setup_license.py --check
+  --license <SPDX id>` lists locked dependencies whose licenses conflict)
 - Include the full legal text
 - Update package.json/setup.py with license field
 
 The goal is appropriate legal protection while meeting project goals.
 """
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="License Selector Tool")
+    parser.add_argument("--check", metavar="DIR", nargs="?", const=".",
+                        help="check DIR's locked dependencies against the license")
+    parser.add_argument("--license", metavar="SPDX",
+                        help="license to check against (default: DIR's LICENSE file)")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        from license_scan import main as scan_main
+        return scan_main([args.check] + (["--license", args.license] if args.license else []))
+
     template_path = Path(__file__).parent.parent / "templates" / "LICENSE_template.md"
     
     if not template_path.exists():
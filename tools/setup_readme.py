@@ -4,6 +4,7 @@ README.md Setup Tool
 Provides instructions for Claude AI to generate a project-specific README.md file.
 """
 
+import argparse
 from pathlib import Path
 
 README_PROMPT = """
@@ -40,18 +41,50 @@ Make sure to:
 The goal is a README that helps users understand, install, and use the project effectively.
 """
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="README.md Generator")
+    parser.add_argument("--analyze", metavar="DIR", nargs="?", const=".",
+                        help="include the cached project analysis for DIR (default: cwd)")
+    parser.add_argument("--context", metavar="TOKENS", type=int,
+                        help="list the most relevant files that fit in TOKENS")
+    parser.add_argument("--tree", metavar="DIR", nargs="?", const=".",
+                        help="include a summarized directory tree of DIR")
+    parser.add_argument("--cached", metavar="DIR", nargs="?", const=".",
+                        help="reuse the cached document when DIR's inputs are unchanged")
+    args = parser.parse_args(argv)
+
     template_path = Path(__file__).parent.parent / "templates" / "README_template.md"
     
     if not template_path.exists():
         print(f"❌ Error: Template not found at {template_path}")
         return 1
+
+    if args.cached:
+        from doc_cache import report_cached
+        if report_cached("readme", args.cached):
+            return 0
     
     print("📘 README.md Generator")
     print("=" * 50)
     print("\nTo generate README.md for your project, provide this prompt to Claude:\n")
     print(README_PROMPT)
     print("\nTemplate location:", template_path)
+    if args.analyze:
+        from project_index import analyze_project
+        print("\nProject analysis (incremental index):")
+        print(analyze_project(args.analyze))
+        from command_runner import format_facts, readme_metadata
+        print("\nRepository and toolchain (commands run concurrently):")
+        print(format_facts(*readme_metadata(args.analyze)))
+    if args.context:
+        from context_packer import format_selection, ranked_for_project, select
+        selection, total = select(ranked_for_project(args.analyze or ".", "readme"), args.context)
+        print(f"\nRead these files first ({args.context} token budget):")
+        print(format_selection(selection, total, args.context))
+    if args.tree:
+        from tree_summary import project_structure
+        print("\nPROJECT_STRUCTURE (summarized tree):")
+        print(project_structure(args.tree))
     print("\n" + "=" * 50)
     print("This tool provides instructions for AI-assisted README.md generation.")
     
@@ -4,6 +4,7 @@ Project Structure Generator
 Provides instructions for Claude AI to create project directory structures.
 """
 
+import argparse
 from pathlib import Path
 
 STRUCTURE_PROMPT = """
@@ -32,6 +33,12 @@ Please create a project directory structure by:
    - Basic configuration files
    - Initial test files
 
+   Rather than creating them one by one, write the layout as a plan (the
+   DIRECTORY_TREE diagram, or JSON {"directories": [...], "files": {path: content}})
+   and run `setup_structure.py --plan PLAN --dry-run` to review the changes,
+   then `setup_structure.py --plan PLAN` to create everything in one batch.
+   Empty leaf directories get a .gitkeep automatically.
+
 5. Generating a structure.md documenting:
    - Directory purposes
    - File organization rules
@@ -48,7 +55,29 @@ Make sure to:
 The goal is a well-organized project structure that scales with growth.
 """
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Project Structure Generator")
+    parser.add_argument("--analyze", metavar="DIR", nargs="?", const=".",
+                        help="include the cached project analysis for DIR (default: cwd)")
+    parser.add_argument("--detect", metavar="DIR", nargs="?", const=".",
+                        help="include the detected languages, frameworks and tools of DIR")
+    parser.add_argument("--tree", metavar="DIR", nargs="?", const=".",
+                        help="include a summarized directory tree of DIR")
+    parser.add_argument("--plan", metavar="FILE",
+                        help="create the structure described by FILE (JSON or tree diagram)")
+    parser.add_argument("--into", default=".", help="project directory for --plan (default: cwd)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="with --plan, print the changes without touching disk")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="with --plan, replace existing files whose content differs")
+    args = parser.parse_args(argv)
+
+    if args.plan:
+        from structure_materializer import main as materialize_main
+        options = [args.plan, "--into", args.into]
+        options += ["--dry-run"] * args.dry_run + ["--overwrite"] * args.overwrite
+        return materialize_main(options)
+
     template_path = Path(__file__).parent.parent / "templates" / "STRUCTURE_template.md"
     
     if not template_path.exists():
@@ -60,6 +89,18 @@ def main():
     print("\nTo generate project structure, provide this prompt to Claude:\n")
     print(STRUCTURE_PROMPT)
     print("\nTemplate location:", template_path)
+    if args.analyze:
+        from project_index import analyze_project
+        print("\nProject analysis (incremental index):")
+        print(analyze_project(args.analyze))
+    if args.detect:
+        from stack_detect import detect_stack, format_profile
+        print("\nDetected stack (single-pass scan):")
+        print(format_profile(detect_stack(args.detect)))
+    if args.tree:
+        from tree_summary import TreeSummary
+        print("\nExisting layout for structure.md (summarized tree):")
+        print(TreeSummary(args.tree).render())
     print("\n" + "=" * 50)
     print("This tool helps create organized project directory structures.")
     
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Stack Detection Engine
+Detects languages, frameworks, build systems and test frameworks in one pruned directory walk.
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from collections import Counter
+from pathlib import Path
+
+from project_index import LANGUAGE_BY_EXTENSION, PRUNE_DIRS
+from tracing import traced
+
+CATEGORY_LABELS = {
+    "frameworks": "Frameworks",
+    "build_systems": "Build systems",
+    "test_frameworks": "Test frameworks",
+    "package_managers": "Package managers",
+    "ci": "CI",
+    "containers": "Containers",
+}
+CATEGORIES = tuple(CATEGORY_LABELS)
+NON_CODE_LANGUAGES = frozenset({"Markdown", "reStructuredText", "JSON", "YAML", "TOML"})
+MAX_MANIFEST_BYTES = 1024 * 1024
+REGEX_CHARS = frozenset("\\()[]?*+")
+
+# (file name or name regex, category, value). Plain names are looked up in a
+# dict; regexes are compiled into one alternation.
+FILE_SIGNATURES = [
+    ("package.json", "package_managers", "npm"),
+    ("package-lock.json", "package_managers", "npm"),
+    ("yarn.lock", "package_managers", "yarn"),
+    ("pnpm-lock.yaml", "package_managers", "pnpm"),
+    ("bun.lockb", "package_managers", "bun"),
+    ("pyproject.toml", "build_systems", "pyproject"),
+    ("setup.py", "build_systems", "setuptools"),
+    ("requirements.txt", "package_managers", "pip"),
+    ("poetry.lock", "package_managers", "poetry"),
+    ("Pipfile", "package_managers", "pipenv"),
+    ("uv.lock", "package_managers", "uv"),
+    ("Cargo.toml", "build_systems", "cargo"),
+    ("go.mod", "build_systems", "go modules"),
+    ("pom.xml", "build_systems", "maven"),
+    (r"build\.gradle(?:\.kts)?", "build_systems", "gradle"),
+    ("Makefile", "build_systems", "make"),
+    ("CMakeLists.txt", "build_systems", "cmake"),
+    ("justfile", "build_systems", "just"),
+    ("Gemfile", "package_managers", "bundler"),
+    ("composer.json", "package_managers", "composer"),
+    (r"Dockerfile(?:\..+)?", "containers", "docker"),
+    (r"(?:docker-)?compose\.ya?ml", "containers", "docker compose"),
+    ("pytest.ini", "test_frameworks", "pytest"),
+    ("conftest.py", "test_frameworks", "pytest"),
+    ("tox.ini", "test_frameworks", "tox"),
+    ("noxfile.py", "test_frameworks", "nox"),
+    (r"jest\.config\.[cm]?[jt]s", "test_frameworks", "jest"),
+    (r"vitest\.config\.[cm]?[jt]s", "test_frameworks", "vitest"),
+    (r"playwright\.config\.[cm]?[jt]s", "test_frameworks", "playwright"),
+    (r"cypress\.config\.[cm]?[jt]s", "test_frameworks", "cypress"),
+    (r"\.mocharc(?:\.[a-z]+)?", "test_frameworks", "mocha"),
+    ("manage.py", "frameworks", "Django"),
+    (r"next\.config\.[cm]?[jt]s", "frameworks", "Next.js"),
+    (r"nuxt\.config\.[cm]?[jt]s", "frameworks", "Nuxt"),
+    (r"vite\.config\.[cm]?[jt]s", "frameworks", "Vite"),
+    ("angular.json", "frameworks", "Angular"),
+    (r"svelte\.config\.[cm]?js", "frameworks", "SvelteKit"),
+    (r"astro\.config\.[cm]?[jt]s", "frameworks", "Astro"),
+    (".gitlab-ci.yml", "ci", "GitLab CI"),
+    (".travis.yml", "ci", "Travis CI"),
+    ("Jenkinsfile", "ci", "Jenkins"),
+    ("azure-pipelines.yml", "ci", "Azure Pipelines"),
+]
+
+# Directory paths relative to the project root.
+DIR_SIGNATURES = {
+    ".github/workflows": ("ci", "GitHub Actions"),
+    ".circleci": ("ci", "CircleCI"),
+}
+
+# manifest name -> [(regex over its text, category, value)]
+CONTENT_SIGNATURES = {
+    "package.json": [
+        (r'"react"\s*:', "frameworks", "React"),
+        (r'"vue"\s*:', "frameworks", "Vue"),
+        (r'"express"\s*:', "frameworks", "Express"),
+        (r'"@nestjs/core"\s*:', "frameworks", "NestJS"),
+        (r'"fastify"\s*:', "frameworks", "Fastify"),
+        (r'"next"\s*:', "frameworks", "Next.js"),
+        (r'"jest"\s*:', "test_frameworks", "jest"),
+        (r'"vitest"\s*:', "test_frameworks", "vitest"),
+        (r'"mocha"\s*:', "test_frameworks", "mocha"),
+        (r'"typescript"\s*:', "build_systems", "tsc"),
+        (r'"webpack"\s*:', "build_systems", "webpack"),
+    ],
+    "pyproject.toml": [
+        (r"(?i)\bdjango\b", "frameworks", "Django"),
+        (r"(?i)\bflask\b", "frameworks", "Flask"),
+        (r"(?i)\bfastapi\b", "frameworks", "FastAPI"),
+        (r"\bpytest\b", "test_frameworks", "pytest"),
+        (r"\[tool\.poetry\]", "package_managers", "poetry"),
+        (r"hatchling", "build_systems", "hatch"),
+    ],
+    "requirements.txt": [
+        (r"(?im)^django\b", "frameworks", "Django"),
+        (r"(?im)^flask\b", "frameworks", "Flask"),
+        (r"(?im)^fastapi\b", "frameworks", "FastAPI"),
+        (r"(?im)^pytest\b", "test_frameworks", "pytest"),
+    ],
+    "Cargo.toml": [
+        (r"\bactix-web\b", "frameworks", "Actix"),
+        (r"\baxum\b", "frameworks", "Axum"),
+        (r"\btokio\b", "frameworks", "Tokio"),
+    ],
+    "go.mod": [
+        (r"github\.com/gin-gonic/gin", "frameworks", "Gin"),
+        (r"github\.com/labstack/echo", "frameworks", "Echo"),
+        (r"github\.com/spf13/cobra", "frameworks", "Cobra"),
+    ],
+    "Gemfile": [
+        (r"['\"]rails['\"]", "frameworks", "Rails"),
+        (r"['\"]rspec", "test_frameworks", "rspec"),
+    ],
+}
+
+
+_SIGNATURES = None
+
+
+def _compiled_signatures():
+    """Compile the signature tables on first use; importing the module stays cheap."""
+    global _SIGNATURES
+    if _SIGNATURES is None:
+        _SIGNATURES = _compile_signatures()
+    return _SIGNATURES
+
+
+def _compile_signatures():
+    exact = {}
+    patterns = []
+    for name, category, value in FILE_SIGNATURES:
+        if REGEX_CHARS & set(name):
+            patterns.append((name, category, value))
+        else:
+            exact.setdefault(name, []).append((category, value))
+    alternation = "|".join(f"({name})" for name, _category, _value in patterns)
+    combined = re.compile(rf"(?:{alternation})\Z")
+    content = {name: [(re.compile(regex), category, value) for regex, category, value in rules]
+               for name, rules in CONTENT_SIGNATURES.items()}
+    return exact, combined, [(category, value) for _name, category, value in patterns], content
+
+
+class StackProfile:
+    """Everything the structure, gitignore and CI tools need to know about a stack."""
+
+    def __init__(self, languages=None, frameworks=(), build_systems=(), test_frameworks=(),
+                 package_managers=(), ci=(), containers=(), manifests=(), files_visited=0,
+                 dirs_visited=0, dirs_pruned=0, seconds=0.0):
+        self.languages = dict(languages or {})
+        self.frameworks = set(frameworks)
+        self.build_systems = set(build_systems)
+        self.test_frameworks = set(test_frameworks)
+        self.package_managers = set(package_managers)
+        self.ci = set(ci)
+        self.containers = set(containers)
+        self.manifests = list(manifests)
+        self.files_visited = files_visited
+        self.dirs_visited = dirs_visited
+        self.dirs_pruned = dirs_pruned
+        self.seconds = seconds
+
+    @property
+    def primary_language(self):
+        for language, _count in Counter(self.languages).most_common():
+            if language not in NON_CODE_LANGUAGES:
+                return language
+        return None
+
+    def to_dict(self):
+        data = dict(vars(self))
+        data["languages"] = dict(self.languages)
+        data["manifests"] = list(self.manifests)
+        for category in CATEGORIES:
+            data[category] = sorted(data[category])
+        data["primary_language"] = self.primary_language
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{key: value for key, value in data.items() if key != "primary_language"})
+
+
+def _add(profile, category, value):
+    getattr(profile, category).add(value)
+
+
+@traced("stack.detect", "walk")
+def detect_stack(root=".", prune=PRUNE_DIRS):
+    """Walk root once with os.scandir and return a StackProfile.
+
+    A running analysis daemon answers from its warm profile instead.
+    """
+    if prune is PRUNE_DIRS:
+        from daemon_client import request
+        warm = request(root, "detect")
+        if warm is not None:
+            return StackProfile.from_dict(warm)
+    start = time.perf_counter()
+    exact_signatures, pattern_signatures, pattern_facts, content_patterns = _compiled_signatures()
+    profile = StackProfile()
+    languages = Counter()
+    root = os.fspath(root)
+    stack = [""]
+    while stack:
+        relative_dir = stack.pop()
+        try:
+            scanner = os.scandir(os.path.join(root, relative_dir))
+        except OSError:
+            continue
+        profile.dirs_visited += 1
+        with scanner:
+            for entry in scanner:
+                name = entry.name
+                relative = f"{relative_dir}/{name}" if relative_dir else name
+                if entry.is_dir(follow_symlinks=False):
+                    if name in prune:
+                        profile.dirs_pruned += 1
+                        continue
+                    signature = DIR_SIGNATURES.get(relative)
+                    if signature:
+                        _add(profile, *signature)
+                    stack.append(relative)
+                    continue
+                profile.files_visited += 1
+                extension = os.path.splitext(name)[1].lower()
+                language = LANGUAGE_BY_EXTENSION.get(extension)
+                if language:
+                    languages[language] += 1
+                facts = exact_signatures.get(name)
+                if facts is None:
+                    match = pattern_signatures.match(name)
+                    facts = [pattern_facts[match.lastindex - 1]] if match else None
+                if facts:
+                    profile.manifests.append(relative)
+                    for category, value in facts:
+                        _add(profile, category, value)
+                rules = content_patterns.get(name)
+                if rules:
+                    _scan_manifest(profile, entry.path, rules)
+
+    profile.languages = dict(languages.most_common())
+    profile.manifests.sort()
+    profile.seconds = time.perf_counter() - start
+    return profile
+
+
+def _scan_manifest(profile, path, rules):
+    try:
+        if os.path.getsize(path) > MAX_MANIFEST_BYTES:
+            return
+        with open(path, encoding="utf-8", errors="replace") as handle:
+            text = handle.read()
+    except OSError:
+        return
+    for regex, category, value in rules:
+        if regex.search(text):
+            _add(profile, category, value)
+
+
+def format_profile(profile, limit=8):
+    """Render a StackProfile as indented text for tool output."""
+    languages = ", ".join(f"{name} ({count})" for name, count
+                          in list(profile.languages.items())[:limit])
+    lines = [f"  Primary language: {profile.primary_language or 'unknown'}",
+             f"  Languages: {languages or 'none detected'}"]
+    for category in CATEGORIES:
+        values = ", ".join(sorted(getattr(profile, category))) or "none detected"
+        lines.append(f"  {CATEGORY_LABELS[category]}: {values}")
+    lines.append(f"  Scanned {profile.files_visited} files in {profile.dirs_visited} "
+                 f"directories ({profile.dirs_pruned} pruned) in {profile.seconds * 1e3:.1f}ms")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Detect a project's technology stack.")
+    parser.add_argument("project", nargs="?", default=".", help="project directory")
+    parser.add_argument("--json", action="store_true", help="print the profile as JSON")
+    args = parser.parse_args(argv)
+
+    if not Path(args.project).is_dir():
+        print(f"❌ Error: Project directory not found at {args.project}")
+        return 1
+
+    profile = detect_stack(args.project)
+    if args.json:
+        print(json.dumps(profile.to_dict(), indent=2))
+    else:
+        print("🔎 Detected Stack")
+        print("=" * 50)
+        print(format_profile(profile))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
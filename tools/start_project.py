@@ -6,10 +6,19 @@ Coordinates all setup tools to create a complete project foundation.
 
 import os
 import sys
+import json
+import time
+import argparse
 import subprocess
+from collections import namedtuple
 from pathlib import Path
 from datetime import datetime
 
+import tracing
+from tracing import span
+
+TOOLS_DIR = Path(__file__).parent
+
 PROJECT_STARTER_PROMPT = """
 Please set up a new project by running through these steps:
 
@@ -49,6 +58,10 @@ Please set up a new project by running through these steps:
    - Initialize package manager if needed
    - Final commit with message: "chore: complete initial project setup"
 
+Steps 2, 3, 4 and 6 only depend on the project structure, and step 7 only
+on CLAUDE.md, so independent steps may be worked on in parallel. README
+creation waits for the license and environment steps it documents.
+
 For each step:
 - Run the tool's prompt
 - Execute the necessary actions
@@ -62,7 +75,352 @@ The goal is a fully configured project ready for development with:
 - Version control history
 """
 
-def main():
+Step = namedtuple("Step", "name emoji tool description depends commit_message")
+
+STEPS = [
+    Step("structure", "📁", "setup_structure.py", "Create project structure",
+         (), "chore: initial project structure"),
+    Step("license", "⚖️", "setup_license.py", "Select and add license",
+         ("structure",), "chore: add LICENSE"),
+    Step("gitignore", "🚫", "setup_gitignore.py", "Generate .gitignore",
+         ("structure",), "chore: add comprehensive .gitignore"),
+    Step("env", "🔐", "setup_env.py", "Create environment template",
+         ("structure",), "chore: add environment variable template"),
+    Step("readme", "📘", "setup_readme.py", "Generate README.md",
+         ("structure", "license", "env"), "docs: add comprehensive README"),
+    Step("claude_md", "🤖", "setup_claude_md.py", "Create CLAUDE.md",
+         ("structure",), "docs: add AI assistant guidelines (CLAUDE.md)"),
+    Step("feature", "🚀", "create_feature_prompt.py", "Optional: First feature",
+         ("claude_md",), None),
+    Step("final", "✅", None, "Final setup",
+         ("license", "gitignore", "env", "readme", "claude_md", "feature"),
+         "chore: complete initial project setup"),
+]
+
+StepResult = namedtuple("StepResult", "name status seconds output")
+
+
+def execution_waves(steps):
+    """Group steps into waves whose members only depend on earlier waves.
+
+    Raises ValueError for unknown dependencies or cycles.
+    """
+    names = {step.name for step in steps}
+    for step in steps:
+        unknown = set(step.depends) - names
+        if unknown:
+            raise ValueError(f"Step {step.name!r} depends on unknown steps: {sorted(unknown)}")
+
+    remaining = {step.name: set(step.depends) for step in steps}
+    done = set()
+    waves = []
+    while remaining:
+        ready = [name for name, deps in remaining.items() if deps <= done]
+        if not ready:
+            raise ValueError(f"Dependency cycle between steps: {sorted(remaining)}")
+        waves.append(ready)
+        done.update(ready)
+        for name in ready:
+            del remaining[name]
+    return waves
+
+
+def run_tool(step, project_dir):
+    """Default step action: run the step's tool script in the project directory."""
+    if step.tool is None:
+        return ""
+    with span(step.tool, "subprocess", cwd=str(project_dir)):
+        completed = subprocess.run(
+            [sys.executable, str(TOOLS_DIR / step.tool)],
+            cwd=project_dir, capture_output=True, text=True, check=True,
+        )
+    return completed.stdout
+
+
+def run_dag(steps, action, workers=None):
+    """Run action(step) for every step, starting each as soon as its dependencies finish.
+
+    Independent steps run concurrently on a thread pool of `workers` threads.
+    Steps whose dependencies failed are skipped. Returns StepResults in
+    completion order.
+    """
+    from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+    execution_waves(steps)  # validate before starting anything
+    by_name = {step.name: step for step in steps}
+    pending = {step.name: set(step.depends) for step in steps}
+    dependents = {step.name: [] for step in steps}
+    for step in steps:
+        for dep in step.depends:
+            dependents[dep].append(step.name)
+
+    results = []
+    failed = set()
+
+    def timed(step):
+        start = time.perf_counter()
+        with span(f"step:{step.name}", "step"):
+            output = action(step)
+        return output, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=workers or len(steps)) as pool:
+        running = {}
+
+        def release(name):
+            for child in dependents[name]:
+                if child in pending:
+                    pending[child].discard(name)
+
+        def submit_ready():
+            for name in [n for n, deps in pending.items() if not deps]:
+                del pending[name]
+                running[pool.submit(timed, by_name[name])] = name
+
+        submit_ready()
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    output, seconds = future.result()
+                    results.append(StepResult(name, "ok", seconds, output))
+                except Exception as error:
+                    results.append(StepResult(name, "failed", 0.0, str(error)))
+                    failed.add(name)
+                release(name)
+
+            # Propagate failures before scheduling: a step whose dependency
+            # failed is recorded as skipped and never submitted.
+            blocked = [n for n in pending if set(by_name[n].depends) & failed]
+            while blocked:
+                for name in blocked:
+                    del pending[name]
+                    results.append(StepResult(name, "skipped", 0.0, ""))
+                    failed.add(name)
+                    release(name)
+                blocked = [n for n in pending if set(by_name[n].depends) & failed]
+            submit_ready()
+    return results
+
+
+def run_pipeline(project_dir, workers=None, steps=STEPS):
+    """Run every step's tool for project_dir through the dependency graph."""
+    return run_dag(steps, lambda step: run_tool(step, project_dir), workers)
+
+
+def load_manifest(path):
+    """Read a fleet manifest (JSON, or YAML when PyYAML is installed).
+
+    The manifest is either a list of projects or an object with "projects"
+    and optional "defaults" merged into every project. A project is a path
+    string or an object with "path" plus answers such as "project_type",
+    "language" or "license". The steps' tools only print prompts, so answers
+    are recorded in answers.json for whoever completes them; they do not
+    change what the steps run. Relative paths are resolved against the
+    manifest's directory. Raises ValueError for a malformed manifest.
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in (".yml", ".yaml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("YAML manifests need PyYAML (pip install pyyaml); use JSON instead")
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+
+    if isinstance(data, list):
+        data = {"projects": data}
+    if not isinstance(data, dict):
+        raise ValueError("Manifest must be a list of projects or an object with \"projects\"")
+    defaults = data.get("defaults") or {}
+    items = data.get("projects") or []
+    if not isinstance(defaults, dict):
+        raise ValueError("Manifest \"defaults\" must be an object")
+    if not isinstance(items, list):
+        raise ValueError("Manifest \"projects\" must be a list")
+    projects = []
+    for item in items:
+        if not isinstance(item, (str, dict)):
+            raise ValueError(f"Manifest entry is neither a path nor an object: {item!r}")
+        entry = dict(defaults)
+        entry.update({"path": item} if isinstance(item, str) else item)
+        if not isinstance(entry.get("path"), str):
+            raise ValueError(f"Manifest entry without a path: {item!r}")
+        entry["path"] = str((path.parent / entry["path"]).resolve())
+        projects.append(entry)
+    return projects
+
+
+def setup_project(entry, step_workers=None, commit=False):
+    """Fleet worker: analyze one project and run its pipeline, isolated in its own process.
+
+    Everything is written to <project>/.toolkit/setup/. With commit (or a
+    "commit" key in the entry) the project's new files are recorded as the
+    setup commit series. Errors are caught and reported in the result so one
+    broken project cannot stop the fleet.
+    """
+    start = time.perf_counter()
+    target = Path(entry["path"])
+    result = {"path": str(target), "status": "ok", "error": None, "steps": {}}
+    try:
+        if not target.is_dir():
+            raise FileNotFoundError(f"Project directory not found: {target}")
+        from project_index import analyze_project, cache_dir
+        from env_scanner import collect, scan_project
+
+        output_dir = cache_dir(target) / "setup"
+        output_dir.mkdir(exist_ok=True)
+
+        def write(name, text):
+            with span("write", "io", file=name):
+                (output_dir / name).write_text(text, encoding="utf-8")
+
+        answers = {key: value for key, value in entry.items() if key not in ("path", "commit")}
+        write("answers.json", json.dumps(answers, indent=2))
+        with span("analyze", "index", project=str(target)):
+            write("analysis.txt", analyze_project(target))
+        with span("env.scan", "scan", project=str(target)):
+            variables = collect(scan_project(target, workers=1))
+        write("env_vars.json", json.dumps(variables, indent=2))
+
+        for step_result in run_pipeline(target, step_workers):
+            result["steps"][step_result.name] = (step_result.status, step_result.seconds)
+            if step_result.output:
+                write(f"{step_result.name}.txt", step_result.output)
+            if step_result.status != "ok":
+                result["status"] = "failed"
+                result["error"] = result["error"] or f"{step_result.name}: {step_result.output}"
+        if entry.get("commit", commit) and result["status"] == "ok":
+            from git_backend import commit_setup
+            result["commits"] = commit_setup(target, STEPS).commits
+    except Exception as error:
+        result["status"] = "failed"
+        result["error"] = f"{type(error).__name__}: {error}"
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def run_fleet(projects, jobs=None, step_workers=None, commit=False):
+    """Set up every project on a process pool, printing progress as each finishes."""
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        futures = {pool.submit(setup_project, entry, step_workers, commit): entry
+                   for entry in projects}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                result = future.result()
+            except Exception as error:  # the worker process itself died
+                result = {"path": futures[future]["path"], "status": "failed",
+                          "error": f"{type(error).__name__}: {error}", "steps": {},
+                          "seconds": 0.0}
+            results.append(result)
+            mark = "✅" if result["status"] == "ok" else "❌"
+            print(f"[{done}/{len(projects)}] {mark} {result['path']} "
+                  f"({result['seconds']:.2f}s)", flush=True)
+    return results
+
+
+def print_fleet_summary(results, wall_seconds):
+    failed = [result for result in results if result["status"] != "ok"]
+    times = sorted(result["seconds"] for result in results)
+    print("\n" + "=" * 50)
+    print(f"Projects: {len(results)}  succeeded: {len(results) - len(failed)}  "
+          f"failed: {len(failed)}")
+    if times:
+        print(f"Per project: min {times[0]:.2f}s  median {times[len(times) // 2]:.2f}s  "
+              f"max {times[-1]:.2f}s")
+        print(f"Wall clock {wall_seconds:.2f}s (sum of projects {sum(times):.2f}s)")
+    for result in failed:
+        print(f"❌ {result['path']}: {result['error']}")
+
+
+def print_plan(steps):
+    print("\nExecution plan (steps in the same wave run in parallel):")
+    for number, wave in enumerate(execution_waves(steps), 1):
+        print(f"  Wave {number}: {', '.join(wave)}")
+
+
+def print_results(results, steps, wall_seconds):
+    order = [step.name for step in steps]
+    by_name = {result.name: result for result in results}
+    print(f"\n{'Step':<12} {'Status':<8} {'Time':>9}")
+    print("-" * 31)
+    for name in order:
+        result = by_name[name]
+        print(f"{name:<12} {result.status:<8} {result.seconds * 1e3:>7.1f}ms")
+    serial = sum(result.seconds for result in results)
+    print("-" * 31)
+    print(f"Wall clock {wall_seconds * 1e3:.1f}ms (sum of steps {serial * 1e3:.1f}ms)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Project Starter - Master Orchestrator")
+    parser.add_argument("--run", action="store_true",
+                        help="run every tool through the dependency graph")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="maximum number of steps to run concurrently")
+    parser.add_argument("--project", default=".", help="project directory (default: cwd)")
+    parser.add_argument("--manifest", help="set up every project listed in this JSON/YAML file")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="projects to set up in parallel with --manifest (default: CPUs)")
+    parser.add_argument("--commit", action="store_true",
+                        help="with --run or --manifest, commit each step's new files as the "
+                             "semantic history in one git fast-import stream")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="record timing spans to FILE (.json: Chrome trace, .jsonl: JSON "
+                             f"lines) and print a summary; also enabled by ${tracing.ENV_VAR}")
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        tracing.start(args.trace)
+    try:
+        return _run(args)
+    finally:
+        if args.trace:
+            tracing.stop()
+
+
+def _run(args):
+    if args.manifest:
+        try:
+            projects = load_manifest(args.manifest)
+        except (OSError, ValueError) as error:
+            print(f"❌ Error: {error}")
+            return 1
+        print(f"🚀 Setting up {len(projects)} projects")
+        start = time.perf_counter()
+        results = run_fleet(projects, args.jobs, args.workers, args.commit)
+        print_fleet_summary(results, time.perf_counter() - start)
+        return 0 if all(result["status"] == "ok" for result in results) else 1
+
+    if args.run:
+        start = time.perf_counter()
+        results = run_pipeline(args.project, args.workers)
+        wall = time.perf_counter() - start
+        by_name = {result.name: result for result in results}
+        for step in STEPS:
+            result = by_name[step.name]
+            if result.output:
+                print(f"\n{step.emoji} {step.name}\n" + "=" * 50)
+                print(result.output)
+        print_results(results, STEPS, wall)
+        if not all(result.status == "ok" for result in results):
+            return 1
+        if args.commit:
+            from git_backend import GitError, commit_setup
+            try:
+                committed = commit_setup(args.project, STEPS)
+            except GitError as error:
+                print(f"❌ Error: {error}")
+                return 1
+            print(f"\n✅ Wrote {committed.commits} commits with {committed.spawns} git processes "
+                  f"in {committed.seconds * 1e3:.1f}ms")
+        return 0
+
     print("🚀 Project Starter - Master Orchestrator")
     print("=" * 50)
     print("\nThis tool coordinates all setup tools to create a complete project.")
@@ -70,24 +428,16 @@ def main():
     print(PROJECT_STARTER_PROMPT)
     print("\n" + "=" * 50)
     print("\nTools that will be used:")
-    
-    tools = [
-        ("📁", "setup_structure.py", "Create project structure"),
-        ("⚖️", "setup_license.py", "Select and add license"),
-        ("🚫", "setup_gitignore.py", "Generate .gitignore"),
-        ("🔐", "setup_env.py", "Create environment template"),
-        ("📘", "setup_readme.py", "Generate README.md"),
-        ("🤖", "setup_claude_md.py", "Create CLAUDE.md"),
-        ("🚀", "create_feature_prompt.py", "Optional: First feature")
-    ]
-    
-    for emoji, tool, desc in tools:
-        print(f"{emoji} {tool:<25} - {desc}")
-    
+
+    for step in STEPS:
+        if step.tool:
+            print(f"{step.emoji} {step.tool:<25} - {step.description}")
+
+    print_plan(STEPS)
     print("\n" + "=" * 50)
     print("Ready to create a professional project foundation!")
-    
+
     return 0
 
 if __name__ == "__main__":
-    exit(main())
\ No newline at end of file
+    exit(main())
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Structure Materializer
+Diffs a structure plan against the existing tree and creates it with batched, parallel filesystem operations.
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from collections import namedtuple
+from itertools import groupby
+from pathlib import Path
+
+from tracing import span
+
+KEEP_FILE = ".gitkeep"
+TREE_PREFIX = re.compile(r"^[\s│├└─|`+\\-]*")
+TREE_COMMENT = re.compile(r"\s+(?:#|//|←|<-).*$")
+FILE_CHUNKS_PER_WORKER = 4
+
+Changes = namedtuple("Changes", "mkdirs creates updates kept conflicts")
+
+
+class Plan:
+    """Directories and files (path -> bytes) to exist under a project root.
+
+    Paths are relative and use "/". Directories that end up without any
+    planned file get a .gitkeep so that git records them.
+    """
+
+    def __init__(self, directories=(), files=None):
+        self.directories = set()
+        self.files = {}
+        for directory in directories:
+            self.add_directory(directory)
+        for path, content in (files or {}).items():
+            self.add_file(path, content)
+
+    def add_directory(self, path):
+        path = _normalize(path)
+        if path:
+            self.directories.add(path)
+
+    def add_file(self, path, content=b""):
+        path = _normalize(path)
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        self.files[path] = content
+        parent = path.rpartition("/")[0]
+        if parent:
+            self.directories.add(parent)
+
+    def with_keep_files(self):
+        """Return the file map plus a .gitkeep in every otherwise empty leaf directory."""
+        occupied = _ancestors(path.rpartition("/")[0] for path in self.files)
+        occupied |= _ancestors(directory.rpartition("/")[0] for directory in self.directories)
+        files = dict(self.files)
+        for directory in self.directories - occupied:
+            files[f"{directory}/{KEEP_FILE}"] = b""
+        return files
+
+    @classmethod
+    def from_json(cls, data):
+        """Build a plan from {"directories": [...], "files": {path: text}}.
+
+        A plain list of paths is accepted too; entries ending in "/" are
+        directories and the rest are empty files.
+        """
+        if isinstance(data, list):
+            data = {"directories": [p for p in data if p.endswith("/")],
+                    "files": {p: "" for p in data if not p.endswith("/")}}
+        return cls(data.get("directories", ()), data.get("files", {}))
+
+    @classmethod
+    def from_tree(cls, text):
+        """Parse a directory tree diagram as written in STRUCTURE_template.md.
+
+        Understands box-drawing (├── └── │) and plain indented trees. Names
+        ending in "/", or followed by deeper-indented lines, are directories.
+        Trailing comments are ignored, and a single top-level directory
+        holding everything is taken as the project root itself.
+        """
+        lines = []  # (indent, name, marked as a directory)
+        for line in text.splitlines():
+            if not line.strip() or line.strip().startswith("```"):
+                continue
+            indent = TREE_PREFIX.match(line).end()
+            name = TREE_COMMENT.sub("", line[indent:]).strip()
+            if not name or name in (".", "..."):
+                continue
+            lines.append((indent, name.rstrip("/"), name.endswith("/")))
+
+        entries = []
+        stack = []  # (indent, path) of open directories
+        for index, (indent, name, is_dir) in enumerate(lines):
+            while stack and stack[-1][0] >= indent:
+                stack.pop()
+            if index + 1 < len(lines) and lines[index + 1][0] > indent:
+                is_dir = True
+            path = f"{stack[-1][1]}/{name}" if stack else name
+            entries.append((path, is_dir, not stack))
+            if is_dir:
+                stack.append((indent, path))
+
+        top_level = [(path, is_dir) for path, is_dir, top in entries if top]
+        if len(top_level) == 1 and top_level[0][1] and len(entries) > 1:
+            prefix = top_level[0][0] + "/"
+            entries = [(path[len(prefix):], is_dir, top) for path, is_dir, top in entries
+                       if path.startswith(prefix)]
+        plan = cls()
+        for path, is_dir, _top in entries:
+            if is_dir:
+                plan.add_directory(path)
+            else:
+                plan.add_file(path)
+        return plan
+
+
+def _ancestors(paths):
+    """Return every directory in paths together with all of its parents."""
+    seen = set()
+    for path in paths:
+        while path and path not in seen:
+            seen.add(path)
+            path = path.rpartition("/")[0]
+    return seen
+
+
+def _normalize(path):
+    path = path.replace("\\", "/").strip().strip("/")
+    parts = [part for part in path.split("/") if part not in ("", ".")]
+    if ".." in parts:
+        raise ValueError(f"Plan path escapes the project root: {path}")
+    return "/".join(parts)
+
+
+def load_plan(path):
+    """Read a plan file: JSON, or a tree diagram (any Markdown code block is used)."""
+    text = Path(path).read_text(encoding="utf-8")
+    if Path(path).suffix == ".json":
+        return Plan.from_json(json.loads(text))
+    blocks = re.findall(r"```[^\n]*\n(.*?)```", text, re.DOTALL)
+    return Plan.from_tree(blocks[0] if blocks else text)
+
+
+def diff_plan(root, plan, overwrite=False):
+    """Compare a plan with the tree at root; returns Changes without touching disk.
+
+    mkdirs lists every missing directory, parents before children, so each
+    can be created with a single mkdir. Existing files with other content
+    are kept unless overwrite is set. A path that exists as the wrong type
+    is a conflict.
+    """
+    root = os.fspath(root)
+    files = plan.with_keep_files()
+    missing = set()
+    present = set()
+    conflicts = []
+    for directory in plan.directories:
+        path = directory
+        while path and path not in missing and path not in present:
+            full = os.path.join(root, path)
+            if os.path.isdir(full):
+                present.add(path)
+                break
+            if os.path.lexists(full):
+                conflicts.append(path)
+                break
+            missing.add(path)
+            path = path.rpartition("/")[0]
+    mkdirs = sorted(missing, key=lambda path: (path.count("/"), path))
+
+    creates, updates, kept = [], [], []
+    for path, content in files.items():
+        full = os.path.join(root, path)
+        try:
+            stat = os.stat(full)
+        except FileNotFoundError:
+            creates.append(path)
+            continue
+        except NotADirectoryError:
+            conflicts.append(path)
+            continue
+        if not os.path.isfile(full):
+            conflicts.append(path)
+        elif stat.st_size == len(content) and Path(full).read_bytes() == content:
+            continue
+        elif overwrite:
+            updates.append(path)
+        else:
+            kept.append(path)
+    return Changes(mkdirs, sorted(creates), sorted(updates), sorted(kept), sorted(set(conflicts)))
+
+
+def _make_dirs(root, paths):
+    for path in paths:
+        os.mkdir(os.path.join(root, path))
+
+
+def _write_batch(root, files, paths, durable):
+    """Create empty files directly; stage files with content as temporaries."""
+    staged = []
+    suffix = f".tmp-{os.getpid()}"
+    for path in paths:
+        full = os.path.join(root, path)
+        content = files[path]
+        if not content and not os.path.exists(full):
+            with open(full, "xb"):
+                pass
+            continue
+        temporary = full + suffix
+        with open(temporary, "wb") as handle:
+            handle.write(content)
+            if durable:
+                handle.flush()
+                os.fsync(handle.fileno())
+        staged.append((temporary, full))
+    return staged
+
+
+def _sync_directories(root, paths):
+    for path in paths:
+        descriptor = os.open(os.path.join(root, path) if path else root, os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+
+def _chunks(items, count):
+    size = max(1, -(-len(items) // count))
+    return [items[index:index + size] for index in range(0, len(items), size)]
+
+
+def materialize(root, plan, overwrite=False, workers=None, durable=True):
+    """Apply a plan to root and return (Changes, seconds).
+
+    Directories are created level by level and files are written in
+    parallel. Files with content go to temporaries that are fsynced and only
+    then renamed into place, so a crash never leaves a half-written
+    generated file; the directories holding them are fsynced last so that
+    the renames are durable too.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    start = time.perf_counter()
+    root = os.fspath(root)
+    changes = diff_plan(root, plan, overwrite)
+    if changes.conflicts:
+        raise FileExistsError("Plan conflicts with existing paths: "
+                              + ", ".join(changes.conflicts[:10]))
+    files = plan.with_keep_files()
+    workers = workers or min(32, 4 * (os.cpu_count() or 1))
+    chunks = workers * FILE_CHUNKS_PER_WORKER
+    to_write = changes.creates + changes.updates
+    staged = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        with span("structure.mkdir", "io", count=len(changes.mkdirs)):
+            # A level only depends on the one above it, so each is one parallel batch.
+            for _depth, level in groupby(changes.mkdirs, key=lambda path: path.count("/")):
+                list(pool.map(lambda paths: _make_dirs(root, paths), _chunks(list(level), chunks)))
+        with span("structure.write", "io", count=len(to_write)):
+            for batch in pool.map(lambda paths: _write_batch(root, files, paths, durable),
+                                  _chunks(to_write, chunks)):
+                staged.extend(batch)
+        with span("structure.rename", "io", count=len(staged)):
+            list(pool.map(lambda pair: os.replace(*pair), staged))
+        if durable and staged:
+            parents = sorted({path.rpartition("/")[0] for path in to_write})
+            with span("structure.sync", "io", count=len(parents)):
+                list(pool.map(lambda paths: _sync_directories(root, paths),
+                              _chunks(parents, chunks)))
+    return changes, time.perf_counter() - start
+
+
+def format_changes(changes, limit=20):
+    lines = []
+    for label, paths in (("create directory", changes.mkdirs), ("create", changes.creates),
+                         ("overwrite", changes.updates), ("keep existing", changes.kept),
+                         ("conflict", changes.conflicts)):
+        for path in paths[:limit]:
+            lines.append(f"  {label:<16} {path}")
+        if len(paths) > limit:
+            lines.append(f"  {label:<16} ... and {len(paths) - limit} more")
+    if not lines:
+        lines.append("  Nothing to do: the tree already matches the plan")
+    return "\n".join(lines)
+
+
+def monorepo_plan(packages):
+    """A synthetic skeleton with `packages` Python packages, used by the benchmark."""
+    plan = Plan()
+    for index in range(packages):
+        base = f"packages/pkg{index}"
+        plan.add_file(f"{base}/pyproject.toml", f'[project]\nname = "pkg{index}"\n')
+        plan.add_file(f"{base}/README.md", f"# pkg{index}\n")
+        plan.add_file(f"{base}/src/pkg{index}/__init__.py")
+        plan.add_file(f"{base}/tests/test_pkg{index}.py", f"import pkg{index}\n")
+        plan.add_directory(f"{base}/docs")
+    return plan
+
+
+def run_benchmark(packages):
+    import shutil
+    import tempfile
+
+    plan = monorepo_plan(packages)
+    workdir = tempfile.mkdtemp()
+    try:
+        changes, seconds = materialize(workdir, plan)
+        start = time.perf_counter()
+        diff_plan(workdir, plan)
+        rediff = time.perf_counter() - start
+    finally:
+        shutil.rmtree(workdir)
+    created = len(changes.creates)
+    print(f"📊 Benchmark: {packages} packages, {created} files, {len(changes.mkdirs)} directories")
+    print(f"   Materialize : {seconds * 1e3:8.1f} ms ({created / seconds:,.0f} files/s)")
+    print(f"   Re-diff     : {rediff * 1e3:8.1f} ms (nothing left to do)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create a project structure from a plan.")
+    parser.add_argument("plan", nargs="?", help="plan file: JSON or a directory tree diagram")
+    parser.add_argument("--into", default=".", help="project directory (default: cwd)")
+    parser.add_argument("--dry-run", action="store_true", help="print the changes only")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="replace existing files whose content differs from the plan")
+    parser.add_argument("--benchmark", type=int, metavar="N",
+                        help="materialize a synthetic monorepo with N packages")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        run_benchmark(args.benchmark)
+        return 0
+    if not args.plan:
+        parser.error("a plan file is required")
+    try:
+        plan = load_plan(args.plan)
+    except (OSError, ValueError) as error:
+        print(f"❌ Error: {error}")
+        return 1
+
+    print("🏗️  Structure Materializer")
+    print("=" * 50)
+    if args.dry_run:
+        print(format_changes(diff_plan(args.into, plan, args.overwrite)))
+        return 0
+    Path(args.into).mkdir(parents=True, exist_ok=True)
+    try:
+        changes, seconds = materialize(args.into, plan, args.overwrite)
+    except (OSError, ValueError) as error:
+        print(f"❌ Error: {error}")
+        return 1
+    print(format_changes(changes))
+    print(f"\n✅ Created {len(changes.creates)} files and {len(changes.mkdirs)} directories "
+          f"in {seconds * 1e3:.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
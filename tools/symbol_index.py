@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""
+Symbol Index
+Keeps an incremental on-disk index of definitions, imports and references for "where is X" queries.
+"""
+
+import argparse
+import ast
+import builtins
+import os
+import re
+import time
+from collections import namedtuple
+from pathlib import Path
+
+from project_index import ProjectIndex, cache_dir
+from tracing import span
+
+SYMBOLS_FILE_NAME = "symbols.sqlite"
+SCHEMA_VERSION = "1"
+MAX_FILE_BYTES = 1024 * 1024
+BATCH_SIZE = 128
+# Below this many files to parse, starting worker processes costs more than it saves.
+PARALLEL_THRESHOLD = 256
+
+# Term weights for "files related to these keywords".
+DEFINITION_WEIGHT = 3
+PATH_WEIGHT = 2
+IMPORT_WEIGHT = 1
+
+Symbol = namedtuple("Symbol", "name kind path line qualname")
+Reference = namedtuple("Reference", "name path line kind")
+UpdateStats = namedtuple("UpdateStats", "files parsed removed seconds")
+
+CALL = re.compile(r"\b([A-Za-z_]\w*)\s*\(")
+# Words that look like calls in the regex-parsed languages.
+KEYWORDS = frozenset({
+    "if", "for", "while", "switch", "catch", "return", "function", "func", "fn", "new",
+    "typeof", "sizeof", "await", "match", "elif", "else", "super", "this", "self", "def",
+    "class", "import", "require", "defined", "unless", "until", "when", "with", "assert",
+})
+
+# language -> ([(kind, definition pattern)], import pattern). Group 1 is the name.
+PATTERNS = {
+    "JavaScript": ([
+        ("function", r"^\s*(?:export\s+(?:default\s+)?)?(?:async\s+)?function\s*\*?\s*([A-Za-z_$][\w$]*)"),
+        ("class", r"^\s*(?:export\s+(?:default\s+)?)?(?:abstract\s+)?class\s+([A-Za-z_$][\w$]*)"),
+        ("function", r"^\s*(?:export\s+)?(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*"
+                     r"(?:async\s+)?(?:function|\([^)]*\)\s*=>|[A-Za-z_$][\w$]*\s*=>)"),
+        ("variable", r"^\s*export\s+(?:const|let|var)\s+([A-Za-z_$][\w$]*)"),
+        ("type", r"^\s*(?:export\s+)?(?:interface|type|enum)\s+([A-Za-z_$][\w$]*)"),
+    ], r"(?:^\s*import\s[^'\"]*?from\s*|^\s*import\s*|\brequire\s*\(\s*|\bimport\s*\(\s*)['\"]([^'\"]+)['\"]"),
+    "Go": ([
+        ("function", r"^func\s+(?:\([^)]*\)\s*)?([A-Za-z_]\w*)"),
+        ("type", r"^type\s+([A-Za-z_]\w*)"),
+        ("variable", r"^(?:var|const)\s+([A-Za-z_]\w*)"),
+    ], r"^\s*(?:import\s+)?(?:[\w.]+\s+)?\"([^\"]+)\"\s*$"),
+    "Rust": ([
+        ("function", r"^\s*(?:pub(?:\([^)]*\))?\s+)?(?:async\s+)?(?:unsafe\s+)?fn\s+([A-Za-z_]\w*)"),
+        ("type", r"^\s*(?:pub(?:\([^)]*\))?\s+)?(?:struct|enum|trait|type|union)\s+([A-Za-z_]\w*)"),
+        ("module", r"^\s*(?:pub(?:\([^)]*\))?\s+)?mod\s+([A-Za-z_]\w*)"),
+    ], r"^\s*(?:pub\s+)?use\s+([\w:]+)"),
+    "Java": ([
+        ("class", r"^\s*(?:(?:public|private|protected|static|final|abstract|sealed|data|open|internal)\s+)*"
+                  r"(?:class|interface|enum|record|object)\s+([A-Za-z_]\w*)"),
+        ("function", r"^\s*(?:(?:public|private|protected|static|final|abstract|synchronized|override|suspend)\s+)+"
+                     r"(?:fun\s+)?(?:<[^>]*>\s*)?(?:[\w<>\[\],.?]+\s+)?([A-Za-z_]\w*)\s*\("),
+        ("function", r"^\s*fun\s+(?:<[^>]*>\s*)?(?:[\w.]+\.)?([A-Za-z_]\w*)\s*\("),
+    ], r"^\s*import\s+(?:static\s+)?([\w.]+)"),
+    "Ruby": ([
+        ("function", r"^\s*def\s+(?:self\.)?([A-Za-z_]\w*[?!=]?)"),
+        ("class", r"^\s*(?:class|module)\s+([A-Z]\w*)"),
+    ], r"^\s*require(?:_relative)?\s*\(?\s*['\"]([^'\"]+)['\"]"),
+    "PHP": ([
+        ("function", r"^\s*(?:(?:public|private|protected|static|abstract|final)\s+)*function\s+&?([A-Za-z_]\w*)"),
+        ("class", r"^\s*(?:(?:abstract|final)\s+)?(?:class|interface|trait|enum)\s+([A-Za-z_]\w*)"),
+    ], r"^\s*use\s+([\w\\]+)"),
+}
+PATTERNS["TypeScript"] = PATTERNS["JavaScript"]
+PATTERNS["Kotlin"] = PATTERNS["C#"] = PATTERNS["Java"]
+LANGUAGES = frozenset(PATTERNS) | {"Python"}
+DEFINITION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+# Python builtins are referenced everywhere and defined nowhere in the project.
+BUILTINS = frozenset(dir(builtins))
+TABLES = ("files", "symbols", "refs", "imports", "terms")
+_COMPILED = {}
+
+
+def _compiled(language):
+    if language not in _COMPILED:
+        definitions, imports = PATTERNS[language]
+        _COMPILED[language] = ([(kind, re.compile(pattern, re.MULTILINE))
+                                for kind, pattern in definitions],
+                               re.compile(imports, re.MULTILINE))
+    return _COMPILED[language]
+
+
+def terms(text):
+    """Split identifiers and paths into lower-case search terms (camelCase and snake_case aware)."""
+    found = []
+    for word in re.findall(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+", text):
+        word = word.lower()
+        if len(word) < 3:
+            continue
+        if word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+            word = word[:-1]
+        found.append(word)
+    return found
+
+
+def _module_name(relative):
+    """Dotted module name of a Python file, e.g. src/pkg/mod.py -> pkg.mod."""
+    parts = relative[:-len(os.path.splitext(relative)[1])].split("/")
+    if parts[-1] == "__init__":
+        parts.pop()
+    if len(parts) > 1 and parts[0] in ("src", "lib"):
+        parts = parts[1:]
+    return ".".join(parts)
+
+
+def parse_python(source, relative):
+    """Return (symbols, references, imports) of a Python module using the ast module.
+
+    The tree is walked through each node's fields directly, which is several
+    times faster than ast.iter_child_nodes on large modules.
+    """
+    tree = ast.parse(source)
+    module = _module_name(relative)
+    symbols = [Symbol(module.rpartition(".")[2] or module, "module", relative, 1, module)]
+    calls = set()
+    names = set()
+    imported = set()
+    imports = []
+    stack = [(tree, "", False)]
+    while stack:
+        node, scope, in_class = stack.pop()
+        kind = type(node)
+        if kind is ast.Name:
+            if type(node.ctx) is ast.Load and node.id not in BUILTINS:
+                names.add((node.id, node.lineno))
+            continue
+        if kind is ast.Attribute and type(node.ctx) is ast.Load:
+            names.add((node.attr, node.lineno))
+        elif kind is ast.Call:
+            function = node.func
+            name = getattr(function, "id", None) or getattr(function, "attr", None)
+            if name and name not in BUILTINS:
+                calls.add((name, node.lineno))
+        elif kind in DEFINITION_NODES:
+            qualname = f"{scope}.{node.name}" if scope else node.name
+            is_class = kind is ast.ClassDef
+            label = "class" if is_class else "method" if in_class else "function"
+            symbols.append(Symbol(node.name, label, relative, node.lineno, qualname))
+            scope, in_class = qualname, is_class
+        elif kind is ast.Import:
+            imports.extend((alias.name, node.lineno) for alias in node.names)
+            continue
+        elif kind is ast.ImportFrom:
+            imports.append(("." * node.level + (node.module or ""), node.lineno))
+            imported.update((alias.name, node.lineno) for alias in node.names)
+            continue
+        elif kind is ast.Module:
+            for statement in node.body:
+                if type(statement) is ast.Assign:
+                    targets = statement.targets
+                elif type(statement) is ast.AnnAssign:
+                    targets = [statement.target]
+                else:
+                    continue
+                symbols.extend(Symbol(target.id, "variable", relative, statement.lineno, target.id)
+                               for target in targets if type(target) is ast.Name)
+        for field in node._fields:
+            value = getattr(node, field)
+            if type(value) is list:
+                stack.extend((item, scope, in_class) for item in value if isinstance(item, ast.AST))
+            elif isinstance(value, ast.AST) and not isinstance(value, ast.expr_context):
+                stack.append((value, scope, in_class))
+    # A call is also a name load; keep the more specific kind only.
+    references = [Reference(name, relative, line, "import") for name, line in imported]
+    references += [Reference(name, relative, line, "call") for name, line in calls]
+    references += [Reference(name, relative, line, "name") for name, line in names - calls]
+    return symbols, references, imports
+
+
+def parse_with_patterns(source, relative, language):
+    """Return (symbols, references, imports) found by the language's line patterns."""
+    definitions, import_pattern = _compiled(language)
+    line_starts = [0]
+    line_starts.extend(match.end() for match in re.finditer("\n", source))
+
+    from bisect import bisect_right
+
+    def line_of(offset):
+        return bisect_right(line_starts, offset)
+
+    symbols = []
+    defined_at = set()
+    for kind, pattern in definitions:
+        for match in pattern.finditer(source):
+            line = line_of(match.start(1))
+            if (match.group(1), line) in defined_at:
+                continue
+            defined_at.add((match.group(1), line))
+            symbols.append(Symbol(match.group(1), kind, relative, line, match.group(1)))
+    imports = [(match.group(1), line_of(match.start(1)))
+               for match in import_pattern.finditer(source)]
+    references = []
+    seen = set()
+    for match in CALL.finditer(source):
+        name = match.group(1)
+        line = line_of(match.start(1))
+        if name in KEYWORDS or (name, line) in defined_at or (name, line) in seen:
+            continue
+        seen.add((name, line))
+        references.append(Reference(name, relative, line, "call"))
+    return symbols, references, imports
+
+
+def parse_file(root, relative, language):
+    """Parse one file; returns (symbols, references, imports), empty for unreadable files."""
+    path = os.path.join(root, relative)
+    try:
+        if os.path.getsize(path) > MAX_FILE_BYTES:
+            return [], [], []
+        with open(path, "rb") as handle:
+            data = handle.read()
+    except OSError:
+        return [], [], []
+    if b"\0" in data[:8192]:
+        return [], [], []
+    source = data.decode("utf-8", errors="replace")
+    if language == "Python":
+        try:
+            return parse_python(source, relative)
+        except (SyntaxError, ValueError, RecursionError):
+            return [], [], []
+    return parse_with_patterns(source, relative, language)
+
+
+def file_terms(relative, symbols, imports):
+    """Weighted search terms of a file: its path, what it defines and what it imports."""
+    weights = {}
+    for term in terms(relative.rsplit(".", 1)[0]):
+        weights[term] = weights.get(term, 0) + PATH_WEIGHT
+    for symbol in symbols:
+        for term in terms(symbol.name):
+            weights[term] = weights.get(term, 0) + DEFINITION_WEIGHT
+    for module, _line in imports:
+        for term in terms(module):
+            weights[term] = weights.get(term, 0) + IMPORT_WEIGHT
+    return weights
+
+
+def _parse_batch(root, batch):
+    results = []
+    with span("symbols.parse_batch", "scan", files=len(batch)):
+        for relative, digest, language in batch:
+            symbols, references, imports = parse_file(root, relative, language)
+            results.append((relative, digest, symbols, references, imports,
+                            file_terms(relative, symbols, imports)))
+    return results
+
+
+def _parse_all(root, pending, workers):
+    """Yield parse results for pending (path, hash, language) items, in parallel when it pays."""
+    batches = [pending[index:index + BATCH_SIZE] for index in range(0, len(pending), BATCH_SIZE)]
+    if workers == 1 or len(pending) < PARALLEL_THRESHOLD:
+        for batch in batches:
+            yield from _parse_batch(root, batch)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for results in pool.map(_parse_batch, [root] * len(batches), batches):
+            yield from results
+
+
+class SymbolIndex:
+    """Definitions, references and imports stored in <project>/.toolkit/symbols.sqlite.
+
+    Files are re-parsed only when their content hash in the project index
+    changes.
+    """
+
+    def __init__(self, root):
+        import sqlite3
+
+        self.root = Path(root).resolve()
+        self.path = cache_dir(self.root) / SYMBOLS_FILE_NAME
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # Rows point at files by integer id: smaller rows and indexes than repeating paths.
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, hash TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS symbols (
+                name TEXT NOT NULL, kind TEXT NOT NULL, file INTEGER NOT NULL,
+                line INTEGER NOT NULL, qualname TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS refs (
+                name TEXT NOT NULL, file INTEGER NOT NULL, line INTEGER NOT NULL,
+                kind TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS imports (
+                module TEXT NOT NULL, file INTEGER NOT NULL, line INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS terms (
+                term TEXT NOT NULL, file INTEGER NOT NULL, weight INTEGER NOT NULL);
+            CREATE INDEX IF NOT EXISTS symbols_name ON symbols (name);
+            CREATE INDEX IF NOT EXISTS symbols_qualname ON symbols (qualname);
+            CREATE INDEX IF NOT EXISTS symbols_file ON symbols (file);
+            CREATE INDEX IF NOT EXISTS refs_name ON refs (name);
+            CREATE INDEX IF NOT EXISTS refs_file ON refs (file);
+            CREATE INDEX IF NOT EXISTS imports_module ON imports (module);
+            CREATE INDEX IF NOT EXISTS imports_file ON imports (file);
+            CREATE INDEX IF NOT EXISTS terms_term ON terms (term);
+            CREATE INDEX IF NOT EXISTS terms_file ON terms (file);
+        """)
+        version = self.conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+        if version is None or version[0] != SCHEMA_VERSION:
+            with self.conn:
+                for table in TABLES:
+                    self.conn.execute(f"DELETE FROM {table}")
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema', ?)",
+                                  (SCHEMA_VERSION,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def _forget(self, file_ids):
+        rows = [(file_id,) for file_id in file_ids]
+        for table in TABLES[1:]:
+            self.conn.executemany(f"DELETE FROM {table} WHERE file = ?", rows)
+        self.conn.executemany("DELETE FROM files WHERE id = ?", rows)
+
+    def update(self, workers=None):
+        """Bring the index in line with the project index, re-parsing changed files only."""
+        start = time.perf_counter()
+        with ProjectIndex(self.root) as index:
+            index.update()
+            current = {path: (digest, language) for path, _size, digest, language, kind
+                       in index.files() if language in LANGUAGES}
+        known = {path: (file_id, digest) for file_id, path, digest
+                 in self.conn.execute("SELECT id, path, hash FROM files")}
+        pending = sorted((path, digest, language) for path, (digest, language) in current.items()
+                         if known.get(path, (None, None))[1] != digest)
+        removed = [path for path in known if path not in current]
+        workers = workers or os.cpu_count() or 1
+
+        with span("symbols.write", "index", files=len(pending)), self.conn:
+            stale = removed + [path for path, _digest, _language in pending if path in known]
+            self._forget(known[path][0] for path in stale)
+            for relative, digest, symbols, references, imports, weights in \
+                    _parse_all(str(self.root), pending, workers):
+                file_id = self.conn.execute("INSERT INTO files (path, hash) VALUES (?, ?)",
+                                            (relative, digest)).lastrowid
+                self.conn.executemany("INSERT INTO symbols VALUES (?, ?, ?, ?, ?)",
+                                      ((symbol.name, symbol.kind, file_id, symbol.line,
+                                        symbol.qualname) for symbol in symbols))
+                self.conn.executemany("INSERT INTO refs VALUES (?, ?, ?, ?)",
+                                      ((reference.name, file_id, reference.line, reference.kind)
+                                       for reference in references))
+                self.conn.executemany("INSERT INTO imports VALUES (?, ?, ?)",
+                                      ((module, file_id, line) for module, line in imports))
+                self.conn.executemany("INSERT INTO terms VALUES (?, ?, ?)",
+                                      ((term, file_id, weight)
+                                       for term, weight in weights.items()))
+        return UpdateStats(len(current), len(pending), len(removed), time.perf_counter() - start)
+
+    def definitions(self, name):
+        """Symbols named name, or whose qualified name is name (e.g. Class.method)."""
+        rows = self.conn.execute(
+            "SELECT name, kind, path, line, qualname FROM symbols JOIN files ON files.id = file "
+            "WHERE name = ? OR qualname = ? ORDER BY path, line", (name.rpartition(".")[2], name))
+        return [Symbol(*row) for row in rows if "." not in name or row[4] == name]
+
+    def references(self, name, limit=None):
+        """References to name (calls, loads and imported names), by file and line."""
+        query = ("SELECT name, path, line, kind FROM refs JOIN files ON files.id = file "
+                 "WHERE name = ? ORDER BY path, line")
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        return [Reference(*row) for row in self.conn.execute(query, (name.rpartition(".")[2],))]
+
+    def importers(self, module):
+        """Files importing module or one of its submodules."""
+        return [row[0] for row in self.conn.execute(
+            "SELECT DISTINCT path FROM imports JOIN files ON files.id = file "
+            "WHERE module = ? OR module LIKE ? ORDER BY path", (module, module + ".%"))]
+
+    def related(self, keywords, limit=10):
+        """Files most related to the keywords, as [(path, score, [matching definitions])]."""
+        wanted = sorted({term for keyword in keywords for term in terms(keyword)})
+        if not wanted:
+            return []
+        marks = ", ".join("?" * len(wanted))
+        ranked = self.conn.execute(
+            f"SELECT file, path, SUM(weight) AS score, COUNT(*) AS matched "
+            f"FROM terms JOIN files ON files.id = file WHERE term IN ({marks}) "
+            f"GROUP BY file ORDER BY matched DESC, score DESC, path LIMIT ?",
+            (*wanted, limit)).fetchall()
+        results = []
+        for file_id, path, score, _matched in ranked:
+            names = [qualname for name, qualname in self.conn.execute(
+                "SELECT name, qualname FROM symbols WHERE file = ? AND kind != 'module' "
+                "ORDER BY line", (file_id,)) if set(terms(name)) & set(wanted)]
+            results.append((path, score, names))
+        return results
+
+
+def format_related(results, limit=5):
+    lines = []
+    for path, score, names in results:
+        shown = ", ".join(names[:limit]) + (" ..." if len(names) > limit else "")
+        lines.append(f"  {path} (score {score})" + (f": {shown}" if shown else ""))
+    return "\n".join(lines) or "  No related files found"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the incremental symbol index.")
+    parser.add_argument("project", nargs="?", default=".", help="project directory")
+    parser.add_argument("--define", metavar="NAME", help="where NAME is defined")
+    parser.add_argument("--uses", metavar="NAME", help="where NAME is used")
+    parser.add_argument("--importers", metavar="MODULE", help="files importing MODULE")
+    parser.add_argument("--related", metavar="KEYWORD", nargs="+",
+                        help="files most related to the keywords")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--workers", type=int, help="parser processes (default: CPU count)")
+    parser.add_argument("--rebuild", action="store_true", help="discard the index first")
+    args = parser.parse_args(argv)
+
+    if not Path(args.project).is_dir():
+        print(f"❌ Error: Project directory not found at {args.project}")
+        return 1
+    if args.rebuild:
+        (cache_dir(args.project) / SYMBOLS_FILE_NAME).unlink(missing_ok=True)
+
+    print("🔎 Symbol Index")
+    print("=" * 50)
+    with SymbolIndex(args.project) as index:
+        stats = index.update(args.workers)
+        print(f"Indexed {stats.files} source files in {stats.seconds * 1e3:.1f}ms "
+              f"({stats.parsed} parsed, {stats.removed} removed)")
+        if args.define:
+            print(f"\nDefinitions of {args.define}:")
+            for symbol in index.definitions(args.define)[:args.limit]:
+                print(f"  {symbol.path}:{symbol.line}  {symbol.kind} {symbol.qualname}")
+        if args.uses:
+            print(f"\nUses of {args.uses}:")
+            for reference in index.references(args.uses, args.limit):
+                print(f"  {reference.path}:{reference.line}  {reference.kind}")
+        if args.importers:
+            print(f"\nFiles importing {args.importers}:")
+            for path in index.importers(args.importers)[:args.limit]:
+                print(f"  {path}")
+        if args.related:
+            print(f"\nFiles related to {' '.join(args.related)}:")
+            print(format_related(index.related(args.related, args.limit)))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Template Renderer
+Compiles {{PLACEHOLDER}} templates once and renders them from dictionaries of values.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+from tracing import span
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*([A-Z_][A-Z0-9_]*)\s*\}\}")
+
+# path -> (mtime_ns, size, sha256, CompiledTemplate)
+_CACHE = {}
+
+
+class MissingValuesError(KeyError):
+    """Raised by strict rendering when placeholders have no value."""
+
+    def __init__(self, template, missing):
+        super().__init__(f"{template}: missing values for {', '.join(missing)}")
+        self.template = template
+        self.missing = missing
+
+
+class _KeepMissing(dict):
+    """Leaves unknown placeholders in the output so they stay visible."""
+
+    def __missing__(self, key):
+        return "{{" + key + "}}"
+
+
+class CompiledTemplate:
+    """A template parsed into alternating literal and placeholder segments."""
+
+    def __init__(self, source, name="<string>"):
+        self.name = name
+        self.literals = []
+        self.keys = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            self.literals.append(source[position:match.start()])
+            self.keys.append(match.group(1))
+            position = match.end()
+        self.literals.append(source[position:])
+        self.placeholders = tuple(dict.fromkeys(self.keys))
+
+        # The segment list is flattened into a single str.format pattern so
+        # that rendering runs in C instead of a Python-level join loop.
+        parts = []
+        for literal, key in zip(self.literals, self.keys):
+            parts.append(literal.replace("{", "{{").replace("}", "}}"))
+            parts.append("{" + key + "}")
+        parts.append(self.literals[-1].replace("{", "{{").replace("}", "}}"))
+        self._pattern = "".join(parts)
+
+    def missing(self, values):
+        """Return placeholders (in template order) that have no value."""
+        return [key for key in self.placeholders if key not in values]
+
+    def render(self, values, strict=False):
+        """Render with values; unknown placeholders are kept unless strict."""
+        if strict:
+            missing = self.missing(values)
+            if missing:
+                raise MissingValuesError(self.name, missing)
+        return self._pattern.format_map(_KeepMissing(values))
+
+    def render_many(self, value_sets):
+        """Yield (text, missing) for each value dictionary in value_sets."""
+        pattern = self._pattern
+        placeholders = self.placeholders
+        for values in value_sets:
+            missing = [key for key in placeholders if key not in values]
+            yield pattern.format_map(_KeepMissing(values)), missing
+
+
+def resolve_template(name):
+    """Accept a path or a short name such as 'README' or 'README_template.md'."""
+    path = Path(name)
+    if path.exists():
+        return path
+    stem = name.upper().replace(".MD", "").replace("_TEMPLATE", "")
+    return TEMPLATES_DIR / f"{stem}_template.md"
+
+
+def load_template(name):
+    """Return a compiled template, reusing the cache while the file is unchanged."""
+    path = resolve_template(name).resolve()
+    stat = path.stat()
+    cached = _CACHE.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[3]
+
+    with span("template.load", "template", name=path.name):
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        if cached and cached[2] == digest:
+            # Touched but not modified: keep the compiled form, refresh the key.
+            compiled = cached[3]
+        else:
+            compiled = CompiledTemplate(data.decode("utf-8"), name=path.name)
+    _CACHE[path] = (stat.st_mtime_ns, stat.st_size, digest, compiled)
+    return compiled
+
+
+def render_template(name, values, strict=False):
+    """Load (cached) and render a template in one call."""
+    template = load_template(name)
+    with span("template.render", "template", name=template.name):
+        return template.render(values, strict=strict)
+
+
+def clear_cache():
+    _CACHE.clear()
+
+
+def run_benchmark(name, count):
+    """Time cold compile, cached lookup and batch rendering for one template."""
+    clear_cache()
+    start = time.perf_counter()
+    template = load_template(name)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        load_template(name)
+    cached = (time.perf_counter() - start) / 1000
+
+    value_sets = [
+        {key: f"{key.lower()} value {i}" for key in template.placeholders}
+        for i in range(count)
+    ]
+    start = time.perf_counter()
+    output_bytes = 0
+    for text, _missing in template.render_many(value_sets):
+        output_bytes += len(text)
+    elapsed = time.perf_counter() - start
+
+    print(f"📊 Benchmark: {template.name} ({len(template.placeholders)} placeholders)")
+    print(f"   Cold load + compile : {cold * 1e3:.3f} ms")
+    print(f"   Cached load         : {cached * 1e6:.2f} µs")
+    print(f"   Batch render        : {count} value sets in {elapsed * 1e3:.1f} ms")
+    print(f"   Throughput          : {count / elapsed:,.0f} renders/s, "
+          f"{output_bytes / elapsed / 1e6:.1f} MB/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a {{PLACEHOLDER}} template.")
+    parser.add_argument("template", help="template path or short name (e.g. README)")
+    parser.add_argument("--values", help="JSON file with a value object or a list of them")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="set a single placeholder value")
+    parser.add_argument("--output", help="write the rendered result to this file; with a list "
+                        "of value sets, value set N goes to <stem>-N<suffix>")
+    parser.add_argument("--strict", action="store_true",
+                        help="fail if any placeholder has no value")
+    parser.add_argument("--list", action="store_true", help="list the template placeholders")
+    parser.add_argument("--benchmark", type=int, metavar="N",
+                        help="benchmark rendering N value sets")
+    args = parser.parse_args(argv)
+
+    if not resolve_template(args.template).exists():
+        print(f"❌ Error: Template not found at {resolve_template(args.template)}")
+        return 1
+
+    if args.benchmark:
+        run_benchmark(args.template, args.benchmark)
+        return 0
+
+    template = load_template(args.template)
+    if args.list:
+        for key in template.placeholders:
+            print(key)
+        return 0
+
+    value_sets = [{}]
+    if args.values:
+        loaded = json.loads(Path(args.values).read_text(encoding="utf-8"))
+        value_sets = loaded if isinstance(loaded, list) else [loaded]
+    for assignment in args.set:
+        key, _, value = assignment.partition("=")
+        for values in value_sets:
+            values[key] = value
+
+    outputs = []
+    status = 0
+    for index, (text, missing) in enumerate(template.render_many(value_sets)):
+        if missing:
+            print(f"⚠️  Value set {index}: missing {', '.join(missing)}", file=sys.stderr)
+            if args.strict:
+                status = 1
+        outputs.append(text)
+
+    if status:
+        return status
+    if len(outputs) == 1:
+        if args.output:
+            Path(args.output).write_text(outputs[0], encoding="utf-8")
+            print(f"✅ Wrote {args.output}")
+        else:
+            print(outputs[0])
+        return 0
+    if args.output:
+        target = Path(args.output)
+        for index, text in enumerate(outputs):
+            path = target.with_name(f"{target.stem}-{index}{target.suffix}")
+            path.write_text(text, encoding="utf-8")
+        print(f"✅ Wrote {len(outputs)} documents to "
+              f"{target.with_name(f'{target.stem}-N{target.suffix}')}")
+    else:
+        # Rendered documents can contain anything but NUL: split the stream on it.
+        sys.stdout.write("\0".join(outputs))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Test Sharding Planner
+Splits tests into CI shards balanced by measured runtime and emits a GitHub Actions matrix.
+"""
+
+import argparse
+import heapq
+import json
+import math
+import os
+import re
+import time
+from pathlib import Path
+
+from tracing import span
+
+DEFAULT_TARGET_MINUTES = 10.0
+DEFAULT_OVERHEAD_SECONDS = 30.0
+DEFAULT_MAX_SHARDS = 32
+IMPROVEMENT_ROUNDS = 200
+# Used for tests with no history when nothing at all was measured.
+FALLBACK_SECONDS = 1.0
+
+DURATION_LINE = re.compile(r"^\s*([\d.]+)s\s+(?:call|setup|teardown)\s+(\S+)")
+TEST_FILE = re.compile(r"(?:^|/)(?:test_[^/]*\.py|[^/]*_test\.(?:py|go)|[^/]*\.(?:test|spec)\.[cm]?[jt]sx?)$")
+
+
+def _unit(test_id, file=None):
+    """The schedulable unit of a test: its file when known, else its class or id."""
+    if file:
+        return file.replace(os.sep, "/")
+    if "::" in test_id:
+        return test_id.split("::", 1)[0]
+    return test_id
+
+
+def _classname_to_path(classname):
+    """Guess a Python test file from a JUnit classname like tests.test_api.TestUser."""
+    parts = classname.split(".")
+    while len(parts) > 1 and parts[-1][:1].isupper():
+        parts.pop()
+    return "/".join(parts) + ".py" if parts and parts[-1].startswith("test") else classname
+
+
+def parse_junit(path):
+    """Yield (unit, seconds) for every testcase of a JUnit XML report, in constant memory."""
+    import xml.etree.ElementTree as ElementTree
+
+    parents = []
+    for event, element in ElementTree.iterparse(path, events=("start", "end")):
+        if event == "start":
+            parents.append(element)
+            continue
+        parents.pop()
+        if element.tag == "testcase":
+            seconds = float(element.get("time") or 0.0)
+            file = element.get("file")
+            classname = element.get("classname") or ""
+            if not file and classname:
+                file = _classname_to_path(classname)
+            yield _unit(element.get("name", ""), file), seconds
+        elif element.tag != "testsuite":
+            continue
+        # Detach finished testcases and suites so the tree never grows with the report.
+        element.clear()
+        if parents:
+            parents[-1].remove(element)
+
+
+def parse_durations_text(path):
+    """Yield (unit, seconds) from `pytest --durations=0` output (setup, call and teardown add up)."""
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        for line in handle:
+            match = DURATION_LINE.match(line)
+            if match:
+                yield _unit(match.group(2)), float(match.group(1))
+
+
+def parse_durations_json(path):
+    """Yield (unit, seconds) from a pytest-split style {test id: seconds} file."""
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    for test_id, seconds in data.items():
+        yield _unit(test_id), float(seconds)
+
+
+def parse_report(path):
+    path = os.fspath(path)
+    with open(path, "rb") as handle:
+        head = handle.read(512).lstrip()
+    if head.startswith(b"<"):
+        return parse_junit(path)
+    if head.startswith(b"{"):
+        return parse_durations_json(path)
+    return parse_durations_text(path)
+
+
+def load_durations(reports):
+    """Return {unit: seconds}. A unit's time is summed within a report and averaged across reports."""
+    totals = {}
+    runs = {}
+    for report in reports:
+        per_report = {}
+        with span("report.parse", "tests", file=os.path.basename(os.fspath(report))):
+            for unit, seconds in parse_report(report):
+                per_report[unit] = per_report.get(unit, 0.0) + seconds
+        for unit, seconds in per_report.items():
+            totals[unit] = totals.get(unit, 0.0) + seconds
+            runs[unit] = runs.get(unit, 0) + 1
+    return {unit: totals[unit] / runs[unit] for unit in totals}
+
+
+def discover_tests(root):
+    """Relative paths of test files in a project, by naming convention."""
+    from project_index import iter_project_files
+
+    return sorted(relative for relative, _stat in iter_project_files(root, gitignore=True)
+                  if TEST_FILE.search(relative))
+
+
+def with_unmeasured(durations, root, tests):
+    """Add tests without history at the median measured time.
+
+    Measured units that name a file which no longer exists are dropped;
+    units that are not paths (a JUnit class name, say) are kept.
+    """
+    known = sorted(durations.values())
+    default = known[len(known) // 2] if known else FALLBACK_SECONDS
+    present = set(tests)
+    merged = {unit: seconds for unit, seconds in durations.items()
+              if unit in present or not os.path.splitext(unit)[1]
+              or os.path.exists(os.path.join(root, unit))}
+    for test in tests:
+        merged.setdefault(test, default)
+    return merged
+
+
+def pack(durations, shards):
+    """Longest-processing-time-first bin packing followed by a local improvement pass.
+
+    Returns a list of (seconds, [units]) sorted by shard load, heaviest first.
+    """
+    bins = [[0.0, index, []] for index in range(shards)]
+    heap = [(0.0, index) for index in range(shards)]
+    for unit, seconds in sorted(durations.items(), key=lambda item: (-item[1], item[0])):
+        load, index = heapq.heappop(heap)
+        bins[index][0] += seconds
+        bins[index][2].append(unit)
+        heapq.heappush(heap, (bins[index][0], index))
+    _improve(bins, durations)
+    return sorted(((load, sorted(units)) for load, _index, units in bins), key=lambda b: -b[0])
+
+
+def _improve(bins, durations):
+    """Move or swap single units between the heaviest and lightest shard while that helps.
+
+    The ideal exchange shifts half the gap; for each unit of the heavy shard
+    the best partner is found by bisecting the light shard's sorted times.
+    """
+    from bisect import bisect_left
+
+    for _ in range(IMPROVEMENT_ROUNDS):
+        heavy = max(bins, key=lambda b: b[0])
+        light = min(bins, key=lambda b: b[0])
+        gap = heavy[0] - light[0]
+        partners = sorted((durations[other], other) for other in light[2])
+        times = [seconds for seconds, _other in partners]
+        best = None  # (new max of the pair, heavy unit, light unit or None)
+        for unit in heavy[2]:
+            moved = durations[unit]
+            options = [(moved, None)]
+            position = bisect_left(times, moved - gap / 2)
+            options += [(moved - times[i], partners[i][1])
+                        for i in (position - 1, position) if 0 <= i < len(times)]
+            for delta, other in options:
+                if 0 < delta < gap:
+                    candidate = max(heavy[0] - delta, light[0] + delta)
+                    if best is None or candidate < best[0]:
+                        best = (candidate, unit, other)
+        if best is None or best[0] >= heavy[0]:
+            return
+        _candidate, unit, other = best
+        heavy[2].remove(unit)
+        light[2].append(unit)
+        delta = durations[unit]
+        if other is not None:
+            light[2].remove(other)
+            heavy[2].append(other)
+            delta -= durations[other]
+        heavy[0] -= delta
+        light[0] += delta
+
+
+def plan_shards(durations, target_seconds, overhead=DEFAULT_OVERHEAD_SECONDS,
+                max_shards=DEFAULT_MAX_SHARDS):
+    """Choose the fewest shards whose slowest job (plus per-job overhead) meets the target.
+
+    Returns (shards, met_target). When one test file alone is slower than
+    the target, that file's time becomes the goal for the other shards;
+    max_shards caps the count either way.
+    """
+    if not durations:
+        return [], True
+    budget = target_seconds - overhead
+    total = sum(durations.values())
+    longest = max(durations.values())
+    count = max(1, math.ceil(total / budget)) if budget > 0 else max_shards
+    count = min(count, max_shards, len(durations))
+    shards = pack(durations, count)
+    goal = max(budget, longest)  # more shards cannot beat the slowest single unit
+    while shards[0][0] > goal and count < min(max_shards, len(durations)):
+        count += 1
+        shards = pack(durations, count)
+    return shards, shards[0][0] <= budget
+
+
+def matrix(shards):
+    return {"include": [{"shard": number, "tests": " ".join(units),
+                         "estimated_seconds": round(load, 1)}
+                        for number, (load, units) in enumerate(shards, 1)]}
+
+
+def workflow_job(shards, command):
+    """A GitHub Actions test job running one matrix entry per shard."""
+    lines = [
+        "test:",
+        "  runs-on: ubuntu-latest",
+        "  strategy:",
+        "    fail-fast: false",
+        "    matrix:",
+        "      include:",
+    ]
+    for number, (load, units) in enumerate(shards, 1):
+        lines.append(f"        - shard: {number}  # ~{load:.0f}s of tests")
+        lines.append(f"          tests: {json.dumps(' '.join(units))}")
+    lines += [
+        "  name: test (shard ${{ matrix.shard }})",
+        "  steps:",
+        "    - uses: actions/checkout@v4",
+        f"    - run: {command} ${{{{ matrix.tests }}}}",
+    ]
+    return "\n".join(lines)
+
+
+def format_plan(shards, met, target_seconds, overhead):
+    lines = [f"  {'shard':<6} {'tests':>6} {'estimate':>10}"]
+    for number, (load, units) in enumerate(shards, 1):
+        lines.append(f"  {number:<6} {len(units):>6} {load + overhead:>9.0f}s")
+    total = sum(load for load, _units in shards)
+    lines.append(f"  Total test time {total:.0f}s; slowest job {shards[0][0] + overhead:.0f}s "
+                 f"including {overhead:.0f}s overhead (target {target_seconds:.0f}s)")
+    if not met:
+        lines.append("  ⚠️  Target not reachable: a single test file or the shard limit "
+                     "sets the floor")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Split tests into CI shards balanced by runtime.")
+    parser.add_argument("reports", nargs="+",
+                        help="JUnit XML, `pytest --durations=0` output or {test: seconds} JSON")
+    parser.add_argument("--target-minutes", type=float, default=DEFAULT_TARGET_MINUTES,
+                        help="wall-clock target for the slowest shard")
+    parser.add_argument("--overhead", type=float, default=DEFAULT_OVERHEAD_SECONDS,
+                        help="per-job setup seconds (checkout, install)")
+    parser.add_argument("--max-shards", type=int, default=DEFAULT_MAX_SHARDS)
+    parser.add_argument("--tests", metavar="DIR",
+                        help="also schedule DIR's test files that have no history")
+    parser.add_argument("--command", default="pytest", help="test command in the workflow")
+    parser.add_argument("--json", action="store_true", help="print the matrix as JSON")
+    args = parser.parse_args(argv)
+
+    missing = [report for report in args.reports if not Path(report).is_file()]
+    if missing:
+        print(f"❌ Error: Report not found: {', '.join(missing)}")
+        return 1
+
+    start = time.perf_counter()
+    durations = load_durations(args.reports)
+    if args.tests:
+        durations = with_unmeasured(durations, args.tests, discover_tests(args.tests))
+    target = args.target_minutes * 60
+    shards, met = plan_shards(durations, target, args.overhead, args.max_shards)
+    if not shards:
+        print("❌ Error: No test timings found in the reports")
+        return 1
+    if args.json:
+        print(json.dumps(matrix(shards), indent=2))
+        return 0
+    print(f"🧩 Test Shards ({len(durations)} test files in "
+          f"{(time.perf_counter() - start) * 1e3:.0f}ms)")
+    print("=" * 50)
+    print(format_plan(shards, met, target, args.overhead))
+    print("\nGitHub Actions job:\n")
+    print(workflow_job(shards, args.command))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Toolkit Command Dispatcher
+Single entry point that imports only the selected tool's module, keeping per-call startup small.
+"""
+
+import sys
+import os
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# subcommand -> (module, description). Modules are imported on demand only.
+COMMANDS = {
+    "start": ("start_project", "Master orchestrator"),
+    "structure": ("setup_structure", "Create project structure"),
+    "license": ("setup_license", "Select and add license"),
+    "gitignore": ("setup_gitignore", "Generate .gitignore"),
+    "env": ("setup_env", "Create environment template"),
+    "readme": ("setup_readme", "Generate README.md"),
+    "claude-md": ("setup_claude_md", "Create CLAUDE.md"),
+    "contributing": ("setup_contributing", "Create contribution guidelines"),
+    "ci": ("setup_ci", "Generate CI/CD pipelines"),
+    "feature": ("create_feature_prompt", "Create a feature implementation prompt"),
+    "commit": ("generate_commit", "Generate a semantic commit message"),
+    "render": ("template_renderer", "Fill a template from JSON values"),
+    "index": ("project_index", "Update and summarize the project index"),
+    "placeholders": ("placeholder_lint", "Find unfilled template placeholders across repos"),
+    "licenses": ("license_scan", "Check dependency licenses for conflicts"),
+    "secrets": ("secret_scan", "Find secrets and suggest ignores and placeholders"),
+    "env-scan": ("env_scanner", "List referenced environment variables"),
+    "gitignore-check": ("gitignore_rules", "Report .gitignore coverage"),
+    "diff": ("diff_analyzer", "Summarize staged changes"),
+    "shards": ("test_sharding", "Plan CI test shards from measured runtimes"),
+    "cache": ("ci_cache", "Plan CI dependency caches from lockfiles"),
+    "docs": ("doc_cache", "Reuse generated documents whose inputs are unchanged"),
+    "commands": ("command_catalog", "List the commands a project's manifests define"),
+    "metadata": ("command_runner", "Gather git and toolchain facts concurrently"),
+    "history": ("git_backend", "Commit setup files as a semantic history"),
+    "symbols": ("symbol_index", "Find where symbols are defined and used"),
+    "context": ("context_packer", "Select files that fit a token budget"),
+    "tree": ("tree_summary", "Print a summarized directory tree"),
+    "detect": ("stack_detect", "Detect languages, frameworks and tools"),
+    "materialize": ("structure_materializer", "Create a structure plan in one batch"),
+    "daemon": ("toolkit_daemon", "Keep project analysis warm in a local daemon"),
+    "bench": ("benchmark", "Benchmark analysis paths on synthetic repos"),
+}
+
+# A command's import may take this many times as long as importing REFERENCE_IMPORT,
+# the stdlib modules every tool loads anyway, timed in the same process. The budget
+# then follows the machine's speed instead of being a fixed number of milliseconds.
+STARTUP_BUDGET_FACTOR = 2.5
+REFERENCE_IMPORT = "argparse, json, re, pathlib"
+
+def print_usage():
+    print("usage: toolkit <command> [options]\n")
+    print("Commands:")
+    for name, (_module, description) in COMMANDS.items():
+        print(f"  {name:<16} {description}")
+    print("\nOptions:")
+    print("  --startup-time [N]  measure process startup and per-command import cost")
+    print("\nRun 'toolkit <command> --help' for command options.")
+
+
+def load(command):
+    """Import and return the module implementing command."""
+    if TOOLS_DIR not in sys.path:
+        sys.path.insert(0, TOOLS_DIR)
+    import importlib
+    return importlib.import_module(COMMANDS[command][0])
+
+
+def _import_cost(module, runs):
+    """Best-of-runs (milliseconds, ratio to the reference) to import module in a fresh interpreter.
+
+    Each process imports REFERENCE_IMPORT first and times it as well, so
+    the ratio compares two imports made under the same machine load.
+    """
+    import subprocess
+
+    code = ("import sys, time; sys.path.insert(0, %r); t = time.perf_counter(); "
+            "import %s; r = time.perf_counter(); import %s; "
+            "print((r - t) * 1e3, (time.perf_counter() - t) * 1e3)"
+            % (TOOLS_DIR, REFERENCE_IMPORT, module))
+    reference, total = min(
+        (tuple(map(float, subprocess.run([sys.executable, "-c", code], check=True,
+                                         capture_output=True, text=True).stdout.split()))
+         for _ in range(runs)), key=lambda run: run[1])
+    return total, total / reference
+
+
+def import_times(runs=5):
+    """{command: (import milliseconds, ratio to the reference import)}, each in fresh processes."""
+    return {name: tuple(round(value, 2) for value in _import_cost(module, runs))
+            for name, (module, _description) in COMMANDS.items()}
+
+
+def over_budget(times):
+    """Commands whose import takes more than STARTUP_BUDGET_FACTOR times the reference import."""
+    return [name for name, (_cost, ratio) in times.items() if ratio > STARTUP_BUDGET_FACTOR]
+
+
+def startup_report(runs):
+    """Time bare interpreter launch, dispatcher launch and each command's import in fresh processes."""
+    import subprocess
+    import time
+
+    def best_of(argv):
+        best = float("inf")
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(argv, check=True, stdout=subprocess.DEVNULL)
+            best = min(best, time.perf_counter() - start)
+        return best * 1e3
+
+    interpreter = best_of([sys.executable, "-c", "pass"])
+    dispatcher = best_of([sys.executable, os.path.abspath(__file__), "--help"])
+    print(f"⏱️  Startup self-check (best of {runs})")
+    print("=" * 50)
+    print(f"{'python -c pass':<28} {interpreter:>8.1f} ms")
+    print(f"{'toolkit --help':<28} {dispatcher:>8.1f} ms")
+    print(f"\n{'Command import':<28} {'ms':>8} {'x ref':>7}")
+    times = import_times(runs)
+    over = over_budget(times)
+    for name, (cost, ratio) in times.items():
+        flag = "  ⚠️ over budget" if name in over else ""
+        print(f"{name:<28} {cost:>8.2f} {ratio:>7.2f}{flag}")
+    print(f"\nBudget: {STARTUP_BUDGET_FACTOR:g}x the time to import {REFERENCE_IMPORT} "
+          f"in the same process")
+    return 1 if over else 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help", "help"):
+        print_usage()
+        return 0
+    if argv[0] == "--startup-time":
+        runs = int(argv[1]) if len(argv) > 1 else 5
+        return startup_report(runs)
+
+    command = argv[0]
+    if command not in COMMANDS:
+        print(f"❌ Error: Unknown command '{command}'\n")
+        print_usage()
+        return 2
+    return load(command).main(argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Analysis Daemon
+Keeps the project index, stack detection and compiled templates warm behind a local Unix socket.
+"""
+
+import argparse
+import json
+import os
+import signal
+import struct
+import sys
+import time
+from pathlib import Path
+
+import daemon_client
+from daemon_client import request, socket_path
+from project_index import PRUNE_DIRS, ProjectIndex, cache_dir, format_summary
+from tracing import span
+
+# asyncio, stack detection and the template renderer are imported by the
+# serving process only, so that start/stop/status stay within the
+# dispatcher's startup budget.
+
+POLL_SECONDS = 2.0
+START_TIMEOUT_SECONDS = 10.0
+LOG_FILE_NAME = "daemon.log"
+
+# inotify(7) flags and event bits.
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+IN_MODIFY = 0x2
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ONLYDIR = 0x1000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_ONLYDIR)
+# Events that add or remove names, and so may change what stack detection sees.
+STRUCTURAL = IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class Inotify:
+    """Minimal inotify binding through ctypes with recursive, pruned directory watches."""
+
+    def __init__(self, root, prune=PRUNE_DIRS):
+        import ctypes
+        import ctypes.util
+
+        self._ctypes = ctypes
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = os.fspath(root)
+        self.prune = prune
+        self.dirs = {}  # watch descriptor -> relative directory
+
+    def watch_tree(self, relative=""):
+        """Watch relative and every directory below it that is not pruned."""
+        stack = [relative]
+        while stack:
+            current = stack.pop()
+            path = os.path.join(self.root, current) if current else self.root
+            descriptor = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+            if descriptor < 0:
+                error = self._ctypes.get_errno()
+                if error in (2, 20):  # ENOENT, ENOTDIR: gone before we got to it
+                    continue
+                raise OSError(error, f"inotify_add_watch failed for {path}")
+            self.dirs[descriptor] = current
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False) and entry.name not in self.prune:
+                            stack.append(f"{current}/{entry.name}" if current else entry.name)
+            except OSError:
+                continue
+
+    def read(self):
+        """Return [(relative path, mask)] for the queued events; path is None on overflow."""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                descriptor, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    events.append((None, mask))
+                    continue
+                if mask & IN_IGNORED:
+                    self.dirs.pop(descriptor, None)
+                    continue
+                directory = self.dirs.get(descriptor)
+                if directory is None or not name or name in self.prune:
+                    continue
+                events.append((f"{directory}/{name}" if directory else name, mask))
+
+    def close(self):
+        os.close(self.fd)
+
+
+class WarmState:
+    """The caches one daemon keeps for its project, invalidated by watcher events.
+
+    All access happens on the event loop thread, so requests are served one
+    at a time and never see a half-applied update.
+    """
+
+    def __init__(self, root, poll=False):
+        from stack_detect import CONTENT_SIGNATURES
+
+        self.root = Path(root).resolve()
+        self.manifests = CONTENT_SIGNATURES  # names whose content changes the stack profile
+        self.index = ProjectIndex(self.root)
+        self.index.update()
+        self.pending = set()  # paths reported changed since the last request
+        self.rescan = False  # the kernel dropped events: walk everything again
+        self.summary = (None, None)  # (index generation, text): local runs share the index
+        self.profile = None
+        self.requests = 0
+        self.started = time.time()
+        self.watcher = None
+        if not poll:
+            try:
+                self.watcher = Inotify(self.root)
+                self.watcher.watch_tree()
+            except (OSError, AttributeError) as error:  # AttributeError: no inotify in this libc
+                print(f"inotify unavailable ({error}); polling every {POLL_SECONDS:.0f}s",
+                      flush=True)
+                if self.watcher is not None:
+                    self.watcher.close()
+                self.watcher = None
+
+    def on_events(self):
+        for relative, mask in self.watcher.read():
+            if relative is None:
+                self.rescan = True
+                self.profile = None
+                continue
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self.watcher.watch_tree(relative)
+            self.pending.add(relative)
+            if mask & STRUCTURAL or relative.rpartition("/")[2] in self.manifests:
+                self.profile = None
+
+    def poll(self):
+        stats = self.index.update()
+        if stats.added or stats.changed or stats.removed:
+            self.profile = None
+
+    def refresh(self):
+        """Apply everything the watcher reported, including events not yet dispatched."""
+        if self.watcher is not None:
+            self.on_events()
+        if self.rescan:
+            self.index.update()
+            self.rescan = False
+            self.pending.clear()
+        elif self.pending:
+            self.index.update_paths(self.pending)
+            self.pending.clear()
+
+    def handle(self, op, args):
+        self.requests += 1
+        if op == "ping":
+            return {"pid": os.getpid(), "root": str(self.root),
+                    "watcher": "inotify" if self.watcher else "polling",
+                    "watched_dirs": len(self.watcher.dirs) if self.watcher else 0,
+                    "uptime": time.time() - self.started, "requests": self.requests}
+        if op == "analyze":
+            self.refresh()
+            generation = self.index.generation()
+            if self.summary[0] != generation:
+                self.summary = (generation, format_summary(self.index.summary()))
+            return self.summary[1]
+        if op == "detect":
+            if self.watcher is not None:
+                self.on_events()
+            if self.profile is None:
+                from stack_detect import detect_stack
+                self.profile = detect_stack(self.root).to_dict()
+            return self.profile
+        if op == "render":
+            from template_renderer import render_template
+            return render_template(args["template"], args.get("values") or {},
+                                   strict=args.get("strict", False))
+        raise ValueError(f"Unknown operation: {op}")
+
+    def close(self):
+        if self.watcher is not None:
+            self.watcher.close()
+        self.index.close()
+
+
+async def _poll(state):
+    import asyncio
+
+    while True:
+        await asyncio.sleep(POLL_SECONDS)
+        state.poll()
+
+
+def _accepts_connections(path):
+    """Whether a live process listens on the socket at path (whatever TOOLKIT_DAEMON says)."""
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+async def serve(root, poll=False):
+    """Run the daemon for root until a shutdown request or SIGTERM/SIGINT."""
+    import asyncio
+
+    path = socket_path(root)
+    if os.path.exists(path):
+        if _accepts_connections(path):
+            raise RuntimeError(f"A daemon already serves {root}")
+        os.unlink(path)  # left behind by a daemon that did not exit cleanly
+    daemon_client.DISABLED = True
+
+    state = WarmState(root, poll)
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+
+    async def client(reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                    if message.get("root") != str(state.root):
+                        raise ValueError(f"This daemon serves {state.root}")
+                    if message["op"] == "shutdown":
+                        stop.set()
+                        result = None
+                    else:
+                        with span(f"daemon.{message['op']}", "daemon"):
+                            result = state.handle(message["op"], message.get("args") or {})
+                    reply = {"ok": True, "result": result}
+                except Exception as error:  # reported to the client, which then works locally
+                    reply = {"ok": False, "error": f"{type(error).__name__}: {error}"}
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    if state.watcher is not None:
+        loop.add_reader(state.watcher.fd, state.on_events)
+    else:
+        poller = asyncio.create_task(_poll(state))
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stop.set)
+    server = await asyncio.start_unix_server(client, path)
+    print(f"Serving {state.root} on {path} (pid {os.getpid()}, "
+          f"{'inotify' if state.watcher else 'polling'})", flush=True)
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        if state.watcher is not None:
+            loop.remove_reader(state.watcher.fd)
+        else:
+            poller.cancel()
+        if os.path.exists(path):
+            os.unlink(path)
+        state.close()
+
+
+def start_background(root, poll=False):
+    """Launch a detached daemon for root and wait until it answers; returns its ping or None."""
+    import subprocess
+
+    log = open(cache_dir(root) / LOG_FILE_NAME, "ab")
+    command = [sys.executable, os.path.abspath(__file__), "start", os.fspath(root), "--foreground"]
+    if poll:
+        command.append("--poll")
+    with log:
+        process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=log,
+                                   stderr=subprocess.STDOUT, start_new_session=True)
+    deadline = time.monotonic() + START_TIMEOUT_SECONDS
+    while time.monotonic() < deadline and process.poll() is None:
+        status = request(root, "ping")
+        if status is not None:
+            return status
+        time.sleep(0.05)
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep project analysis warm in a local daemon.")
+    parser.add_argument("action", choices=("start", "stop", "status"))
+    parser.add_argument("project", nargs="?", default=".", help="project directory")
+    parser.add_argument("--foreground", action="store_true", help="serve in this process")
+    parser.add_argument("--poll", action="store_true",
+                        help=f"rescan every {POLL_SECONDS:.0f}s instead of using inotify")
+    args = parser.parse_args(argv)
+
+    if not Path(args.project).is_dir():
+        print(f"❌ Error: Project directory not found at {args.project}")
+        return 1
+    root = os.path.realpath(args.project)
+
+    if args.action == "start" and args.foreground:
+        import asyncio
+
+        try:
+            asyncio.run(serve(root, args.poll))
+        except RuntimeError as error:
+            print(f"❌ Error: {error}")
+            return 1
+        return 0
+
+    print("🛰️  Analysis Daemon")
+    print("=" * 50)
+    status = request(root, "ping")
+    if args.action == "start":
+        if status is None:
+            status = start_background(root, args.poll)
+        if status is None:
+            print(f"❌ Error: Daemon did not start; see {cache_dir(root) / LOG_FILE_NAME}")
+            return 1
+        print(f"✅ Serving {status['root']} (pid {status['pid']}, {status['watcher']})")
+        return 0
+    if status is None:
+        print(f"No daemon serves {root}; tools compute results locally")
+        return 1 if args.action == "status" else 0
+    if args.action == "stop":
+        request(root, "shutdown")
+        deadline = time.monotonic() + START_TIMEOUT_SECONDS
+        while os.path.exists(socket_path(root)) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        print(f"✅ Stopped daemon {status['pid']}")
+        return 0
+
+    timings = []
+    for op in ("analyze", "detect"):
+        start = time.perf_counter()
+        request(root, op)
+        timings.append(f"{op} {(time.perf_counter() - start) * 1e3:.1f}ms")
+    print(f"  Root: {status['root']}")
+    print(f"  Pid: {status['pid']}, up {status['uptime']:.0f}s, {status['requests']} requests")
+    print(f"  Watcher: {status['watcher']}"
+          + (f" ({status['watched_dirs']} directories)" if status["watcher"] == "inotify" else ""))
+    print(f"  Round trips: {', '.join(timings)}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Tracing Instrumentation
+Records timing spans as Chrome trace or JSON lines files, with near-zero overhead when disabled.
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+ENV_VAR = "TOOLKIT_TRACE"
+ROOT_ENV_VAR = "TOOLKIT_TRACE_ROOT"
+
+_tracer = None
+
+
+class _NullSpan:
+    """Shared do-nothing context returned by span() while tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        self.tracer.record(self.name, self.category, self.start, end - self.start, self.args)
+        return False
+
+
+class Tracer:
+    """Collects complete events; child processes append theirs to a parts directory."""
+
+    def __init__(self, path, root):
+        self.path = Path(path)
+        self.parts = Path(str(self.path) + ".parts")
+        self.root = root
+        self.pid = os.getpid()
+        self.events = []
+        self.lock = threading.Lock()
+        self.part_file = None
+        # perf_counter_ns has an arbitrary origin per process; anchor it to
+        # wall-clock time so events from different processes line up.
+        self.offset_ns = time.time_ns() - time.perf_counter_ns()
+
+    def record(self, name, category, start_ns, duration_ns, args):
+        event = {
+            "name": name, "cat": category, "ph": "X",
+            "ts": (start_ns + self.offset_ns) / 1000, "dur": duration_ns / 1000,
+            "pid": os.getpid(), "tid": threading.get_ident() % 100000,
+        }
+        if args:
+            event["args"] = args
+        with self.lock:
+            if os.getpid() != self.pid:
+                # Forked worker: pool workers may exit without running atexit,
+                # so write through instead of buffering.
+                self.pid = os.getpid()
+                self.root = False
+                self.events = []
+                self.part_file = None
+            if self.root:
+                self.events.append(event)
+            else:
+                if self.part_file is None:
+                    self.parts.mkdir(parents=True, exist_ok=True)
+                    self.part_file = open(self.parts / f"{self.pid}.jsonl", "a",
+                                          buffering=1, encoding="utf-8")
+                self.part_file.write(json.dumps(event) + "\n")
+
+    def collect(self):
+        """Return this process's events plus those written by child processes."""
+        events = list(self.events)
+        if self.parts.is_dir():
+            for part in sorted(self.parts.glob("*.jsonl")):
+                with open(part, encoding="utf-8") as handle:
+                    events.extend(json.loads(line) for line in handle if line.strip())
+                part.unlink()
+            self.parts.rmdir()
+        events.sort(key=lambda event: event["ts"])
+        return events
+
+    def finish(self):
+        """Write the merged trace (root process only) and return its events."""
+        if not self.root:
+            if self.part_file is not None:
+                self.part_file.close()
+            return []
+        events = self.collect()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as handle:
+            if self.path.suffix == ".jsonl":
+                for event in events:
+                    handle.write(json.dumps(event) + "\n")
+            else:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, handle)
+        return events
+
+
+def enabled():
+    return _tracer is not None
+
+
+def span(name, category="toolkit", /, **args):
+    """Context manager timing a block; a shared no-op object when tracing is off."""
+    if _tracer is None:
+        return _NULL_SPAN
+    return _Span(_tracer, name, category, args)
+
+
+def traced(name, category="toolkit"):
+    """Decorator form of span() for functions that are a sub-operation as a whole."""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return function(*args, **kwargs)
+            with _Span(_tracer, name, category, None):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def start(path):
+    """Enable tracing in this process as the root that writes the final file.
+
+    Child processes inherit the environment and report into the same trace.
+    """
+    global _tracer
+    path = os.path.abspath(path)
+    os.environ[ENV_VAR] = path
+    os.environ[ROOT_ENV_VAR] = str(os.getpid())
+    _tracer = Tracer(path, root=True)
+    return _tracer
+
+
+def stop(summary=True, stream=sys.stderr):
+    """Write the trace file and optionally print a summary table."""
+    global _tracer
+    if _tracer is None:
+        return []
+    tracer, _tracer = _tracer, None
+    events = tracer.finish()
+    if tracer.root:
+        os.environ.pop(ENV_VAR, None)
+        os.environ.pop(ROOT_ENV_VAR, None)
+        if summary and events:
+            print(format_summary(events), file=stream)
+            print(f"Trace written to {tracer.path}", file=stream)
+    return events
+
+
+def format_summary(events):
+    """Aggregate events by name into a table sorted by total time."""
+    totals = {}
+    for event in events:
+        entry = totals.setdefault(event["name"], [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += event["dur"]
+        entry[2] = max(entry[2], event["dur"])
+    lines = ["", f"{'Span':<32} {'Count':>6} {'Total':>11} {'Mean':>10} {'Max':>10}",
+             "-" * 73]
+    for name, (count, total, longest) in sorted(totals.items(), key=lambda item: -item[1][1]):
+        lines.append(f"{name[:32]:<32} {count:>6} {total / 1e3:>9.1f}ms "
+                     f"{total / count / 1e3:>8.2f}ms {longest / 1e3:>8.1f}ms")
+    return "\n".join(lines)
+
+
+def _auto_enable():
+    """Honour TOOLKIT_TRACE for standalone tools and for children of a traced run."""
+    global _tracer
+    path = os.environ.get(ENV_VAR)
+    if not path:
+        return
+    root_pid = os.environ.get(ROOT_ENV_VAR)
+    if root_pid and root_pid != str(os.getpid()):
+        _tracer = Tracer(path, root=False)
+        atexit.register(stop, summary=False)
+    elif not root_pid:
+        start(path)
+        atexit.register(stop)
+
+
+_auto_enable()
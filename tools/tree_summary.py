@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Tree Summary
+Streams a summarized directory tree for PROJECT_STRUCTURE, collapsing deep or wide directories within an output budget.
+"""
+
+import argparse
+import heapq
+import os
+import time
+from pathlib import Path
+
+from project_index import PRUNE_DIRS
+from tracing import span
+
+DEFAULT_DEPTH = 3
+DEFAULT_FAN_OUT = 25
+DEFAULT_BUDGET = 4000
+BUDGET_NOTE = "… (output budget reached)"
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1000:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1000
+    return f"{size:.1f} TB"
+
+
+class TreeSummary:
+    """A directory tree rendered lazily, one line at a time, in bounded memory.
+
+    Directories deeper than max_depth, or with more than fan_out entries,
+    are collapsed into one "N files, M MB" line. At most fan_out entries per
+    directory and one ignore stack per level are held at a time, so memory
+    does not grow with the size of the tree.
+    """
+
+    def __init__(self, root, max_depth=DEFAULT_DEPTH, fan_out=DEFAULT_FAN_OUT, gitignore=True,
+                 sizes=True, prune=PRUNE_DIRS):
+        self.root = os.fspath(root)
+        self.max_depth = max_depth
+        self.fan_out = fan_out
+        self.gitignore = gitignore
+        self.sizes = sizes
+        self.prune = prune
+        self.entries = 0  # directory entries examined, for throughput reporting
+
+    def _ignores(self):
+        if not self.gitignore:
+            return None
+        from gitignore_rules import IgnoreStack
+        return IgnoreStack.for_root(self.root)
+
+    def _entries(self, relative, ignores):
+        """Yield (is_file, name) for the visible entries of one directory."""
+        try:
+            iterator = os.scandir(os.path.join(self.root, relative) if relative else self.root)
+        except OSError:
+            return
+        with iterator:
+            for entry in iterator:
+                self.entries += 1
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if name in self.prune:
+                        continue
+                    if ignores is not None and ignores.is_ignored(
+                            f"{relative}/{name}" if relative else name, True):
+                        continue
+                    yield False, name
+                else:
+                    if ignores is not None and ignores.is_ignored(
+                            f"{relative}/{name}" if relative else name, False):
+                        continue
+                    yield True, name
+
+    def listing(self, relative, ignores, collapse=True):
+        """Return (sorted children, hidden count), directories first.
+
+        With collapse, a directory with more than fan_out entries returns
+        None as soon as that is known. Otherwise the first fan_out entries
+        are kept and the rest counted.
+        """
+        if collapse:
+            children = []
+            for child in self._entries(relative, ignores):
+                children.append(child)
+                if len(children) > self.fan_out:
+                    return None, 0
+            return sorted(children), 0
+        total = 0
+
+        def counted():
+            nonlocal total
+            for child in self._entries(relative, ignores):
+                total += 1
+                yield child
+
+        children = heapq.nsmallest(self.fan_out, counted())
+        return children, total - len(children)
+
+    def totals(self, relative, ignores):
+        """(files, bytes) below relative, walked with an explicit stack."""
+        files = size = 0
+        root = self.root
+        stack = [(relative, ignores)]
+        while stack:
+            current, current_ignores = stack.pop()
+            try:
+                iterator = os.scandir(os.path.join(root, current))
+            except OSError:
+                continue
+            with iterator:
+                for entry in iterator:
+                    self.entries += 1
+                    name = entry.name
+                    child = f"{current}/{name}"
+                    if entry.is_dir(follow_symlinks=False):
+                        if name in self.prune:
+                            continue
+                        if current_ignores is not None:
+                            if current_ignores.is_ignored(child, True):
+                                continue
+                            stack.append((child, current_ignores.descend(root, child)))
+                        else:
+                            stack.append((child, None))
+                    elif current_ignores is None or not current_ignores.is_ignored(child, False):
+                        files += 1
+                        if self.sizes:
+                            try:
+                                size += entry.stat(follow_symlinks=False).st_size
+                            except OSError:
+                                pass
+        return files, size
+
+    def _collapsed(self, relative, ignores):
+        files, size = self.totals(relative, ignores)
+        if not files:
+            return "(empty)"
+        return f"({files:,} files, {format_size(size)})" if self.sizes else f"({files:,} files)"
+
+    def lines(self):
+        """Yield the tree one line at a time; stop iterating to stop the walk."""
+        ignores = self._ignores()
+        yield f"{os.path.basename(os.path.abspath(self.root))}/"
+        children, hidden = self.listing("", ignores, collapse=False)
+        yield from self._render("", ignores, children, hidden, 1, "")
+
+    def _render(self, relative, ignores, children, hidden, depth, prefix):
+        for position, (is_file, name) in enumerate(children):
+            last = position == len(children) - 1 and not hidden
+            branch = prefix + ("└── " if last else "├── ")
+            if is_file:
+                yield branch + name
+                continue
+            child = f"{relative}/{name}" if relative else name
+            child_ignores = ignores.descend(self.root, child) if ignores is not None else None
+            listing = None
+            if depth < self.max_depth:
+                listing, _hidden = self.listing(child, child_ignores)
+            if listing is None:
+                yield f"{branch}{name}/  {self._collapsed(child, child_ignores)}"
+                continue
+            yield f"{branch}{name}/"
+            yield from self._render(child, child_ignores, listing, 0, depth + 1,
+                                    prefix + ("    " if last else "│   "))
+        if hidden:
+            yield f"{prefix}└── … {hidden:,} more entries"
+
+    def render(self, budget=DEFAULT_BUDGET):
+        """The tree as text of at most about budget characters; the walk stops there."""
+        output = []
+        used = 0
+        lines = self.lines()
+        with span("tree.render", "walk", root=self.root):
+            for line in lines:
+                if used + len(line) + 1 > budget:
+                    output.append(BUDGET_NOTE)
+                    lines.close()
+                    break
+                output.append(line)
+                used += len(line) + 1
+        return "\n".join(output)
+
+
+def project_structure(root=".", **options):
+    """PROJECT_STRUCTURE value for README_template.md: the summarized tree in a code block."""
+    budget = options.pop("budget", DEFAULT_BUDGET)
+    return "```\n" + TreeSummary(root, **options).render(budget) + "\n```"
+
+
+def run_benchmark(files):
+    from benchmark import DEFAULT_WORKDIR, generate_repo
+
+    repo = DEFAULT_WORKDIR / f"tree-{files}"
+    meta = generate_repo(repo, files, "mixed")
+    print(f"📊 Benchmark: {meta['files']:,} files at {repo}")
+    # The full tree renders every entry; summaries also stat the files of collapsed directories.
+    for label, options, budget in (
+            ("full tree", {"max_depth": 10 ** 6, "fan_out": 10 ** 9}, 10 ** 9),
+            ("summary", {}, DEFAULT_BUDGET),
+            ("summary, no sizes", {"sizes": False}, DEFAULT_BUDGET)):
+        best = None
+        for _ in range(3):
+            summary = TreeSummary(repo, **options)
+            start = time.perf_counter()
+            text = summary.render(budget)
+            seconds = time.perf_counter() - start
+            if best is None or seconds < best[0]:
+                best = (seconds, summary.entries, text.count("\n") + 1)
+        seconds, entries, lines = best
+        print(f"   {label:<20}: {seconds * 1e3:8.1f} ms, {entries:,} entries "
+              f"({entries / seconds:,.0f}/s), {lines:,} lines")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print a summarized directory tree.")
+    parser.add_argument("project", nargs="?", default=".", help="project directory")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH,
+                        help=f"collapse directories below this depth (default: {DEFAULT_DEPTH})")
+    parser.add_argument("--fan-out", type=int, default=DEFAULT_FAN_OUT,
+                        help="collapse directories with more entries than this "
+                             f"(default: {DEFAULT_FAN_OUT})")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET,
+                        help=f"stop after about this many characters (default: {DEFAULT_BUDGET})")
+    parser.add_argument("--all", action="store_true", help="include .gitignore'd paths")
+    parser.add_argument("--no-sizes", action="store_true",
+                        help="count files in collapsed directories without stat()ing them")
+    parser.add_argument("--benchmark", type=int, metavar="FILES",
+                        help="measure walk throughput on a synthetic repository of FILES files")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        run_benchmark(args.benchmark)
+        return 0
+    if not Path(args.project).is_dir():
+        print(f"❌ Error: Project directory not found at {args.project}")
+        return 1
+    summary = TreeSummary(args.project, args.depth, args.fan_out, not args.all, not args.no_sizes)
+    print(summary.render(args.budget))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())